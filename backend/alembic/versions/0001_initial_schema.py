@@ -0,0 +1,455 @@
+"""initial schema
+
+The schema Base.metadata.create_all built before migrations were
+introduced; app.core.migrations stamps databases created that way at
+this revision. Tables and columns added since live in their own
+revisions.
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-19 13:00:03.208523
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('crops',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('scientific_name', sa.String(length=100), nullable=True),
+    sa.Column('local_name_hindi', sa.String(length=100), nullable=True),
+    sa.Column('local_name_punjabi', sa.String(length=100), nullable=True),
+    sa.Column('crop_type', sa.String(length=50), nullable=False),
+    sa.Column('season', sa.String(length=20), nullable=False),
+    sa.Column('duration_days', sa.Integer(), nullable=True),
+    sa.Column('min_temperature', sa.Float(), nullable=True),
+    sa.Column('max_temperature', sa.Float(), nullable=True),
+    sa.Column('optimal_rainfall', sa.Float(), nullable=True),
+    sa.Column('soil_types', sa.Text(), nullable=True),
+    sa.Column('average_yield_per_acre', sa.Float(), nullable=True),
+    sa.Column('market_price_range', sa.Text(), nullable=True),
+    sa.Column('water_requirements', sa.Text(), nullable=True),
+    sa.Column('fertilizer_requirements', sa.Text(), nullable=True),
+    sa.Column('common_pests', sa.Text(), nullable=True),
+    sa.Column('common_diseases', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('crops', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_crops_id'), ['id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_crops_name'), ['name'], unique=False)
+
+    op.create_table('market_prices',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('crop_name', sa.String(length=100), nullable=False),
+    sa.Column('variety', sa.String(length=100), nullable=True),
+    sa.Column('market_name', sa.String(length=100), nullable=False),
+    sa.Column('state', sa.String(length=50), nullable=False),
+    sa.Column('district', sa.String(length=50), nullable=False),
+    sa.Column('min_price', sa.Float(), nullable=False),
+    sa.Column('max_price', sa.Float(), nullable=False),
+    sa.Column('modal_price', sa.Float(), nullable=True),
+    sa.Column('arrival_quantity', sa.Float(), nullable=True),
+    sa.Column('quality_grade', sa.String(length=20), nullable=True),
+    sa.Column('source', sa.String(length=50), nullable=True),
+    sa.Column('price_date', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('market_prices', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_market_prices_crop_name'), ['crop_name'], unique=False)
+        batch_op.create_index(batch_op.f('ix_market_prices_id'), ['id'], unique=False)
+
+    op.create_table('shops',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=200), nullable=False),
+    sa.Column('shop_type', sa.String(length=50), nullable=False),
+    sa.Column('phone_number', sa.String(length=15), nullable=True),
+    sa.Column('email', sa.String(length=100), nullable=True),
+    sa.Column('contact_person', sa.String(length=100), nullable=True),
+    sa.Column('address', sa.Text(), nullable=False),
+    sa.Column('state', sa.String(length=50), nullable=False),
+    sa.Column('district', sa.String(length=50), nullable=False),
+    sa.Column('village', sa.String(length=100), nullable=True),
+    sa.Column('pincode', sa.String(length=10), nullable=True),
+    sa.Column('latitude', sa.Float(), nullable=True),
+    sa.Column('longitude', sa.Float(), nullable=True),
+    sa.Column('license_number', sa.String(length=100), nullable=True),
+    sa.Column('is_verified', sa.Boolean(), nullable=True),
+    sa.Column('is_government_approved', sa.Boolean(), nullable=True),
+    sa.Column('services', sa.Text(), nullable=True),
+    sa.Column('payment_methods', sa.Text(), nullable=True),
+    sa.Column('operating_hours', sa.Text(), nullable=True),
+    sa.Column('average_rating', sa.Float(), nullable=True),
+    sa.Column('total_reviews', sa.Integer(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('shops', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_shops_id'), ['id'], unique=False)
+
+    op.create_table('soil_types',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('ph_range_min', sa.Float(), nullable=True),
+    sa.Column('ph_range_max', sa.Float(), nullable=True),
+    sa.Column('organic_matter_percentage', sa.Float(), nullable=True),
+    sa.Column('water_retention_capacity', sa.Float(), nullable=True),
+    sa.Column('suitable_crops', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('name')
+    )
+    with op.batch_alter_table('soil_types', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_soil_types_id'), ['id'], unique=False)
+
+    op.create_table('users',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('phone_number', sa.String(length=15), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('email', sa.String(length=100), nullable=True),
+    sa.Column('state', sa.String(length=50), nullable=False),
+    sa.Column('district', sa.String(length=50), nullable=False),
+    sa.Column('village', sa.String(length=100), nullable=True),
+    sa.Column('pincode', sa.String(length=10), nullable=True),
+    sa.Column('latitude', sa.Float(), nullable=True),
+    sa.Column('longitude', sa.Float(), nullable=True),
+    sa.Column('farm_size', sa.Float(), nullable=True),
+    sa.Column('primary_crops', sa.Text(), nullable=True),
+    sa.Column('farming_experience', sa.Integer(), nullable=True),
+    sa.Column('preferred_language', sa.String(length=5), nullable=True),
+    sa.Column('notification_preferences', sa.Text(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('is_verified', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('last_login', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_users_email'), ['email'], unique=True)
+        batch_op.create_index(batch_op.f('ix_users_id'), ['id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_users_phone_number'), ['phone_number'], unique=True)
+
+    op.create_table('advisories',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(length=200), nullable=False),
+    sa.Column('content', sa.Text(), nullable=False),
+    sa.Column('advisory_type', sa.String(length=50), nullable=False),
+    sa.Column('crop_name', sa.String(length=100), nullable=True),
+    sa.Column('season', sa.String(length=20), nullable=True),
+    sa.Column('soil_type', sa.String(length=50), nullable=True),
+    sa.Column('weather_conditions', sa.Text(), nullable=True),
+    sa.Column('is_ai_generated', sa.Boolean(), nullable=True),
+    sa.Column('confidence_score', sa.Float(), nullable=True),
+    sa.Column('model_version', sa.String(length=20), nullable=True),
+    sa.Column('language', sa.String(length=5), nullable=True),
+    sa.Column('localized_content', sa.Text(), nullable=True),
+    sa.Column('image_urls', sa.Text(), nullable=True),
+    sa.Column('video_urls', sa.Text(), nullable=True),
+    sa.Column('is_read', sa.Boolean(), nullable=True),
+    sa.Column('is_helpful', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('read_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('advisories', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_advisories_id'), ['id'], unique=False)
+
+    op.create_table('community_posts',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(length=200), nullable=False),
+    sa.Column('content', sa.Text(), nullable=False),
+    sa.Column('post_type', sa.String(length=50), nullable=False),
+    sa.Column('crop_category', sa.String(length=100), nullable=True),
+    sa.Column('topic_tags', sa.Text(), nullable=True),
+    sa.Column('image_urls', sa.Text(), nullable=True),
+    sa.Column('video_urls', sa.Text(), nullable=True),
+    sa.Column('likes_count', sa.Integer(), nullable=True),
+    sa.Column('comments_count', sa.Integer(), nullable=True),
+    sa.Column('views_count', sa.Integer(), nullable=True),
+    sa.Column('is_approved', sa.Boolean(), nullable=True),
+    sa.Column('is_featured', sa.Boolean(), nullable=True),
+    sa.Column('is_pinned', sa.Boolean(), nullable=True),
+    sa.Column('language', sa.String(length=5), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('community_posts', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_community_posts_id'), ['id'], unique=False)
+
+    op.create_table('crop_recommendations',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('crop_id', sa.Integer(), nullable=False),
+    sa.Column('confidence_score', sa.Float(), nullable=False),
+    sa.Column('reason', sa.Text(), nullable=True),
+    sa.Column('season', sa.String(length=20), nullable=False),
+    sa.Column('soil_type', sa.String(length=50), nullable=True),
+    sa.Column('weather_conditions', sa.Text(), nullable=True),
+    sa.Column('market_conditions', sa.Text(), nullable=True),
+    sa.Column('is_accepted', sa.Boolean(), nullable=True),
+    sa.Column('feedback', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['crop_id'], ['crops.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('crop_recommendations', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_crop_recommendations_id'), ['id'], unique=False)
+
+    op.create_table('market_insights',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('title', sa.String(length=200), nullable=False),
+    sa.Column('content', sa.Text(), nullable=False),
+    sa.Column('insight_type', sa.String(length=50), nullable=False),
+    sa.Column('crop_name', sa.String(length=100), nullable=True),
+    sa.Column('region', sa.String(length=100), nullable=True),
+    sa.Column('trend_direction', sa.String(length=20), nullable=True),
+    sa.Column('confidence_level', sa.Float(), nullable=True),
+    sa.Column('time_horizon', sa.String(length=20), nullable=True),
+    sa.Column('historical_data', sa.Text(), nullable=True),
+    sa.Column('forecast_data', sa.Text(), nullable=True),
+    sa.Column('is_ai_generated', sa.Boolean(), nullable=True),
+    sa.Column('model_version', sa.String(length=20), nullable=True),
+    sa.Column('language', sa.String(length=5), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('market_insights', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_market_insights_id'), ['id'], unique=False)
+
+    op.create_table('notifications',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(length=200), nullable=False),
+    sa.Column('message', sa.Text(), nullable=False),
+    sa.Column('notification_type', sa.String(length=50), nullable=False),
+    sa.Column('crop_name', sa.String(length=100), nullable=True),
+    sa.Column('action_required', sa.String(length=100), nullable=True),
+    sa.Column('priority', sa.String(length=20), nullable=True),
+    sa.Column('delivery_method', sa.String(length=20), nullable=False),
+    sa.Column('delivery_status', sa.String(length=20), nullable=True),
+    sa.Column('scheduled_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('sent_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('delivered_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('is_read', sa.Boolean(), nullable=True),
+    sa.Column('is_acknowledged', sa.Boolean(), nullable=True),
+    sa.Column('read_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('acknowledged_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('language', sa.String(length=5), nullable=True),
+    sa.Column('related_advisory_id', sa.Integer(), nullable=True),
+    sa.Column('related_market_insight_id', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('notifications', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_notifications_id'), ['id'], unique=False)
+
+    op.create_table('shop_inventory',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('shop_id', sa.Integer(), nullable=False),
+    sa.Column('product_name', sa.String(length=200), nullable=False),
+    sa.Column('product_type', sa.String(length=50), nullable=False),
+    sa.Column('brand', sa.String(length=100), nullable=True),
+    sa.Column('variety', sa.String(length=100), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('specifications', sa.Text(), nullable=True),
+    sa.Column('price_per_unit', sa.Float(), nullable=False),
+    sa.Column('unit', sa.String(length=20), nullable=False),
+    sa.Column('discount_percentage', sa.Float(), nullable=True),
+    sa.Column('current_stock', sa.Float(), nullable=False),
+    sa.Column('minimum_stock', sa.Float(), nullable=True),
+    sa.Column('maximum_stock', sa.Float(), nullable=True),
+    sa.Column('is_available', sa.Boolean(), nullable=True),
+    sa.Column('is_organic', sa.Boolean(), nullable=True),
+    sa.Column('is_government_subsidized', sa.Boolean(), nullable=True),
+    sa.Column('quality_grade', sa.String(length=10), nullable=True),
+    sa.Column('expiry_date', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['shop_id'], ['shops.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('shop_inventory', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_shop_inventory_id'), ['id'], unique=False)
+
+    op.create_table('soil_tests',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('ph_level', sa.Float(), nullable=True),
+    sa.Column('nitrogen_content', sa.Float(), nullable=True),
+    sa.Column('phosphorus_content', sa.Float(), nullable=True),
+    sa.Column('potassium_content', sa.Float(), nullable=True),
+    sa.Column('organic_matter', sa.Float(), nullable=True),
+    sa.Column('soil_type', sa.String(length=50), nullable=True),
+    sa.Column('texture', sa.String(length=50), nullable=True),
+    sa.Column('moisture_content', sa.Float(), nullable=True),
+    sa.Column('test_date', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('lab_name', sa.String(length=100), nullable=True),
+    sa.Column('test_method', sa.String(length=50), nullable=True),
+    sa.Column('recommendations', sa.Text(), nullable=True),
+    sa.Column('fertilizer_suggestions', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('soil_tests', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_soil_tests_id'), ['id'], unique=False)
+
+    op.create_table('weather_data',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('latitude', sa.Float(), nullable=False),
+    sa.Column('longitude', sa.Float(), nullable=False),
+    sa.Column('location_name', sa.String(length=100), nullable=True),
+    sa.Column('temperature', sa.Float(), nullable=True),
+    sa.Column('humidity', sa.Float(), nullable=True),
+    sa.Column('rainfall', sa.Float(), nullable=True),
+    sa.Column('wind_speed', sa.Float(), nullable=True),
+    sa.Column('wind_direction', sa.String(length=10), nullable=True),
+    sa.Column('pressure', sa.Float(), nullable=True),
+    sa.Column('visibility', sa.Float(), nullable=True),
+    sa.Column('forecast_data', sa.Text(), nullable=True),
+    sa.Column('alerts', sa.Text(), nullable=True),
+    sa.Column('source', sa.String(length=50), nullable=True),
+    sa.Column('recorded_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('weather_data', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_weather_data_id'), ['id'], unique=False)
+
+    op.create_table('advisory_feedback',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('advisory_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('rating', sa.Integer(), nullable=False),
+    sa.Column('is_helpful', sa.Boolean(), nullable=False),
+    sa.Column('feedback_text', sa.Text(), nullable=True),
+    sa.Column('accuracy_rating', sa.Integer(), nullable=True),
+    sa.Column('clarity_rating', sa.Integer(), nullable=True),
+    sa.Column('timeliness_rating', sa.Integer(), nullable=True),
+    sa.Column('suggestions', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.ForeignKeyConstraint(['advisory_id'], ['advisories.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('advisory_feedback', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_advisory_feedback_id'), ['id'], unique=False)
+
+    op.create_table('community_comments',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('post_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('parent_comment_id', sa.Integer(), nullable=True),
+    sa.Column('content', sa.Text(), nullable=False),
+    sa.Column('likes_count', sa.Integer(), nullable=True),
+    sa.Column('is_approved', sa.Boolean(), nullable=True),
+    sa.Column('language', sa.String(length=5), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['parent_comment_id'], ['community_comments.id'], ),
+    sa.ForeignKeyConstraint(['post_id'], ['community_posts.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('community_comments', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_community_comments_id'), ['id'], unique=False)
+
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('community_comments', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_community_comments_id'))
+
+    op.drop_table('community_comments')
+    with op.batch_alter_table('advisory_feedback', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_advisory_feedback_id'))
+
+    op.drop_table('advisory_feedback')
+    with op.batch_alter_table('weather_data', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_weather_data_id'))
+
+    op.drop_table('weather_data')
+    with op.batch_alter_table('soil_tests', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_soil_tests_id'))
+
+    op.drop_table('soil_tests')
+    with op.batch_alter_table('shop_inventory', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_shop_inventory_id'))
+
+    op.drop_table('shop_inventory')
+    with op.batch_alter_table('notifications', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_notifications_id'))
+
+    op.drop_table('notifications')
+    with op.batch_alter_table('market_insights', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_market_insights_id'))
+
+    op.drop_table('market_insights')
+    with op.batch_alter_table('crop_recommendations', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_crop_recommendations_id'))
+
+    op.drop_table('crop_recommendations')
+    with op.batch_alter_table('community_posts', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_community_posts_id'))
+
+    op.drop_table('community_posts')
+    with op.batch_alter_table('advisories', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_advisories_id'))
+
+    op.drop_table('advisories')
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_users_phone_number'))
+        batch_op.drop_index(batch_op.f('ix_users_id'))
+        batch_op.drop_index(batch_op.f('ix_users_email'))
+
+    op.drop_table('users')
+    with op.batch_alter_table('soil_types', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_soil_types_id'))
+
+    op.drop_table('soil_types')
+    with op.batch_alter_table('shops', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_shops_id'))
+
+    op.drop_table('shops')
+    with op.batch_alter_table('market_prices', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_market_prices_id'))
+        batch_op.drop_index(batch_op.f('ix_market_prices_crop_name'))
+
+    op.drop_table('market_prices')
+    with op.batch_alter_table('crops', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_crops_name'))
+        batch_op.drop_index(batch_op.f('ix_crops_id'))
+
+    op.drop_table('crops')
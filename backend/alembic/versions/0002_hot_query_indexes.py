@@ -0,0 +1,76 @@
+"""hot query indexes
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 13:00:21.714739
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('advisories', schema=None) as batch_op:
+        batch_op.create_index('ix_advisories_user_id_created_at', ['user_id', 'created_at'], unique=False)
+
+    with op.batch_alter_table('community_comments', schema=None) as batch_op:
+        batch_op.create_index('ix_community_comments_post_id_created_at', ['post_id', 'created_at'], unique=False)
+
+    with op.batch_alter_table('community_posts', schema=None) as batch_op:
+        batch_op.create_index('ix_community_posts_is_approved_created_at', ['is_approved', 'created_at'], unique=False)
+
+    with op.batch_alter_table('market_prices', schema=None) as batch_op:
+        batch_op.create_index('ix_market_prices_crop_name_price_date', ['crop_name', 'price_date'], unique=False)
+        batch_op.create_index('ix_market_prices_price_date', ['price_date'], unique=False)
+        batch_op.create_index('ix_market_prices_state_district_price_date', ['state', 'district', 'price_date'], unique=False)
+
+    with op.batch_alter_table('notifications', schema=None) as batch_op:
+        batch_op.create_index('ix_notifications_user_id_created_at', ['user_id', 'created_at'], unique=False)
+        batch_op.create_index('ix_notifications_user_id_is_read_created_at', ['user_id', 'is_read', 'created_at'], unique=False)
+
+    with op.batch_alter_table('shop_inventory', schema=None) as batch_op:
+        batch_op.create_index('ix_shop_inventory_shop_id_product_type', ['shop_id', 'product_type'], unique=False)
+
+    with op.batch_alter_table('shops', schema=None) as batch_op:
+        batch_op.create_index('ix_shops_is_active_state_district', ['is_active', 'state', 'district'], unique=False)
+
+    with op.batch_alter_table('soil_tests', schema=None) as batch_op:
+        batch_op.create_index('ix_soil_tests_user_id_test_date', ['user_id', 'test_date'], unique=False)
+
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('soil_tests', schema=None) as batch_op:
+        batch_op.drop_index('ix_soil_tests_user_id_test_date')
+
+    with op.batch_alter_table('shops', schema=None) as batch_op:
+        batch_op.drop_index('ix_shops_is_active_state_district')
+
+    with op.batch_alter_table('shop_inventory', schema=None) as batch_op:
+        batch_op.drop_index('ix_shop_inventory_shop_id_product_type')
+
+    with op.batch_alter_table('notifications', schema=None) as batch_op:
+        batch_op.drop_index('ix_notifications_user_id_is_read_created_at')
+        batch_op.drop_index('ix_notifications_user_id_created_at')
+
+    with op.batch_alter_table('market_prices', schema=None) as batch_op:
+        batch_op.drop_index('ix_market_prices_state_district_price_date')
+        batch_op.drop_index('ix_market_prices_price_date')
+        batch_op.drop_index('ix_market_prices_crop_name_price_date')
+
+    with op.batch_alter_table('community_posts', schema=None) as batch_op:
+        batch_op.drop_index('ix_community_posts_is_approved_created_at')
+
+    with op.batch_alter_table('community_comments', schema=None) as batch_op:
+        batch_op.drop_index('ix_community_comments_post_id_created_at')
+
+    with op.batch_alter_table('advisories', schema=None) as batch_op:
+        batch_op.drop_index('ix_advisories_user_id_created_at')
+
@@ -0,0 +1,81 @@
+"""market price rollups
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 13:10:29.300246
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('market_price_daily',
+    sa.Column('price_date', sa.Date(), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('crop_name', sa.String(length=100), nullable=False),
+    sa.Column('market_name', sa.String(length=100), nullable=False),
+    sa.Column('state', sa.String(length=50), nullable=False),
+    sa.Column('district', sa.String(length=50), nullable=False),
+    sa.Column('min_price', sa.Float(), nullable=False),
+    sa.Column('max_price', sa.Float(), nullable=False),
+    sa.Column('min_price_sum', sa.Float(), nullable=False),
+    sa.Column('max_price_sum', sa.Float(), nullable=False),
+    sa.Column('modal_price_sum', sa.Float(), nullable=False),
+    sa.Column('modal_price_count', sa.Integer(), nullable=False),
+    sa.Column('record_count', sa.Integer(), nullable=False),
+    sa.Column('arrival_quantity_sum', sa.Float(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('crop_name', 'market_name', 'state', 'district', 'price_date', name='uq_market_price_daily_key')
+    )
+    with op.batch_alter_table('market_price_daily', schema=None) as batch_op:
+        batch_op.create_index('ix_market_price_daily_crop_name_price_date', ['crop_name', 'price_date'], unique=False)
+        batch_op.create_index(batch_op.f('ix_market_price_daily_id'), ['id'], unique=False)
+        batch_op.create_index('ix_market_price_daily_price_date', ['price_date'], unique=False)
+
+    op.create_table('market_price_weekly',
+    sa.Column('week_start', sa.Date(), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('crop_name', sa.String(length=100), nullable=False),
+    sa.Column('market_name', sa.String(length=100), nullable=False),
+    sa.Column('state', sa.String(length=50), nullable=False),
+    sa.Column('district', sa.String(length=50), nullable=False),
+    sa.Column('min_price', sa.Float(), nullable=False),
+    sa.Column('max_price', sa.Float(), nullable=False),
+    sa.Column('min_price_sum', sa.Float(), nullable=False),
+    sa.Column('max_price_sum', sa.Float(), nullable=False),
+    sa.Column('modal_price_sum', sa.Float(), nullable=False),
+    sa.Column('modal_price_count', sa.Integer(), nullable=False),
+    sa.Column('record_count', sa.Integer(), nullable=False),
+    sa.Column('arrival_quantity_sum', sa.Float(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('crop_name', 'market_name', 'state', 'district', 'week_start', name='uq_market_price_weekly_key')
+    )
+    with op.batch_alter_table('market_price_weekly', schema=None) as batch_op:
+        batch_op.create_index('ix_market_price_weekly_crop_name_week_start', ['crop_name', 'week_start'], unique=False)
+        batch_op.create_index(batch_op.f('ix_market_price_weekly_id'), ['id'], unique=False)
+        batch_op.create_index('ix_market_price_weekly_week_start', ['week_start'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('market_price_weekly', schema=None) as batch_op:
+        batch_op.drop_index('ix_market_price_weekly_week_start')
+        batch_op.drop_index(batch_op.f('ix_market_price_weekly_id'))
+        batch_op.drop_index('ix_market_price_weekly_crop_name_week_start')
+
+    op.drop_table('market_price_weekly')
+    with op.batch_alter_table('market_price_daily', schema=None) as batch_op:
+        batch_op.drop_index('ix_market_price_daily_price_date')
+        batch_op.drop_index(batch_op.f('ix_market_price_daily_id'))
+        batch_op.drop_index('ix_market_price_daily_crop_name_price_date')
+
+    op.drop_table('market_price_daily')
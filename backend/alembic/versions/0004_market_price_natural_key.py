@@ -0,0 +1,40 @@
+"""market price natural key
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 13:14:44.695922
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Legacy rows without a variety get the ingest's default, otherwise
+    # NULLs never conflict and those rows would escape the unique key
+    op.execute("UPDATE market_prices SET variety = 'Other' WHERE variety IS NULL")
+
+    # Keep the newest row of any duplicate natural key so the unique index
+    # can be built; re-run scripts/backfill_market_rollups.py if rows were removed
+    op.execute(
+        "DELETE FROM market_prices WHERE id NOT IN ("
+        "SELECT max(id) FROM market_prices "
+        "GROUP BY crop_name, variety, market_name, state, district, price_date)"
+    )
+
+    with op.batch_alter_table('market_prices', schema=None) as batch_op:
+        batch_op.alter_column('variety', existing_type=sa.String(length=100), nullable=False)
+        batch_op.create_index('uq_market_prices_natural_key', ['crop_name', 'variety', 'market_name', 'state', 'district', 'price_date'], unique=True)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('market_prices', schema=None) as batch_op:
+        batch_op.drop_index('uq_market_prices_natural_key')
+        batch_op.alter_column('variety', existing_type=sa.String(length=100), nullable=True)
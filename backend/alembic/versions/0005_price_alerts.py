@@ -0,0 +1,45 @@
+"""price alerts
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 13:21:13.410160
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('price_alerts',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('crop_name', sa.String(length=100), nullable=False),
+    sa.Column('market_name', sa.String(length=100), nullable=True),
+    sa.Column('alert_type', sa.String(length=10), nullable=False),
+    sa.Column('target_price', sa.Float(), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('triggered_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('price_alerts', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_price_alerts_id'), ['id'], unique=False)
+        batch_op.create_index('ix_price_alerts_is_active_id', ['is_active', 'id'], unique=False)
+        batch_op.create_index('ix_price_alerts_user_id_created_at', ['user_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('price_alerts', schema=None) as batch_op:
+        batch_op.drop_index('ix_price_alerts_user_id_created_at')
+        batch_op.drop_index('ix_price_alerts_is_active_id')
+        batch_op.drop_index(batch_op.f('ix_price_alerts_id'))
+
+    op.drop_table('price_alerts')
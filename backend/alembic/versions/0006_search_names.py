@@ -0,0 +1,130 @@
+"""search names
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19 13:26:15.101538
+
+Name vocabulary for app.core.search, kept current by triggers on the
+source tables so every write path (ORM, bulk upserts, COPY) feeds it.
+SQLite indexes it with an FTS5 trigram table (SQLite 3.34+), PostgreSQL
+with a pg_trgm GIN index.
+
+SQLite drops a table's triggers when batch mode recreates it: a later
+migration that recreates market_prices, crops or shop_inventory must
+re-run create_sync_triggers().
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+# Source table -> (search kind, name column) pairs copied into search_names
+SOURCES = {
+    "market_prices": [("crop", "crop_name"), ("market", "market_name")],
+    "crops": [("crop", "name"), ("crop", "local_name_hindi"), ("crop", "local_name_punjabi")],
+    "shop_inventory": [("product", "product_name")],
+}
+
+
+def create_sync_triggers(dialect_name: str) -> None:
+    for source, names in SOURCES.items():
+        if dialect_name == "sqlite":
+            inserts = "".join(
+                f"INSERT INTO search_names (kind, name) SELECT '{kind}', NEW.{name_column} "
+                f"WHERE NEW.{name_column} IS NOT NULL AND NOT EXISTS ("
+                f"SELECT 1 FROM search_names WHERE kind = '{kind}' AND name = NEW.{name_column}); "
+                for kind, name_column in names
+            )
+            columns = ", ".join(name_column for _, name_column in names)
+            op.execute(f"CREATE TRIGGER {source}_search_names_ai AFTER INSERT ON {source} BEGIN {inserts}END")
+            op.execute(
+                f"CREATE TRIGGER {source}_search_names_au AFTER UPDATE OF {columns} ON {source} "
+                f"BEGIN {inserts}END"
+            )
+        else:
+            # Statement-level with transition tables: one insert per statement, not per row
+            selects = " UNION ".join(
+                f"SELECT '{kind}', {name_column} FROM new_rows WHERE {name_column} IS NOT NULL"
+                for kind, name_column in names
+            )
+            op.execute(
+                f"CREATE FUNCTION {source}_search_names() RETURNS trigger AS $$ BEGIN "
+                f"INSERT INTO search_names (kind, name) {selects} ON CONFLICT (kind, name) DO NOTHING; "
+                f"RETURN NULL; END $$ LANGUAGE plpgsql"
+            )
+            for suffix, event in (("ai", "INSERT"), ("au", "UPDATE")):
+                op.execute(
+                    f"CREATE TRIGGER {source}_search_names_{suffix} AFTER {event} ON {source} "
+                    f"REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT "
+                    f"EXECUTE FUNCTION {source}_search_names()"
+                )
+
+
+def drop_sync_triggers(dialect_name: str) -> None:
+    for source in SOURCES:
+        for suffix in ("ai", "au"):
+            if dialect_name == "sqlite":
+                op.execute(f"DROP TRIGGER IF EXISTS {source}_search_names_{suffix}")
+            else:
+                op.execute(f"DROP TRIGGER IF EXISTS {source}_search_names_{suffix} ON {source}")
+        if dialect_name != "sqlite":
+            op.execute(f"DROP FUNCTION IF EXISTS {source}_search_names()")
+
+
+def upgrade() -> None:
+    dialect_name = op.get_context().dialect.name
+    if dialect_name == "postgresql":
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    op.create_table('search_names',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('kind', sa.String(length=20), nullable=False),
+    sa.Column('name', sa.String(length=200), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('kind', 'name', name='uq_search_names_kind_name')
+    )
+    with op.batch_alter_table('search_names', schema=None) as batch_op:
+        batch_op.create_index('ix_search_names_name_trgm', ['name'], unique=False, postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'})
+
+    if dialect_name == "sqlite":
+        # External-content FTS5 index over search_names (rows are only ever added)
+        op.execute(
+            "CREATE VIRTUAL TABLE search_names_fts USING fts5("
+            "name, content='search_names', content_rowid='id', tokenize='trigram')"
+        )
+        op.execute(
+            "CREATE TRIGGER search_names_fts_ai AFTER INSERT ON search_names "
+            "BEGIN INSERT INTO search_names_fts (rowid, name) VALUES (NEW.id, NEW.name); END"
+        )
+        op.execute(
+            "CREATE TRIGGER search_names_fts_ad AFTER DELETE ON search_names "
+            "BEGIN INSERT INTO search_names_fts (search_names_fts, rowid, name) "
+            "VALUES ('delete', OLD.id, OLD.name); END"
+        )
+
+    op.execute(
+        "INSERT INTO search_names (kind, name) " + " UNION ".join(
+            f"SELECT '{kind}', {name_column} FROM {source} WHERE {name_column} IS NOT NULL"
+            for source, names in SOURCES.items()
+            for kind, name_column in names
+        )
+    )
+    create_sync_triggers(dialect_name)
+
+
+def downgrade() -> None:
+    dialect_name = op.get_context().dialect.name
+    drop_sync_triggers(dialect_name)
+    if dialect_name == "sqlite":
+        op.execute("DROP TABLE IF EXISTS search_names_fts")
+
+    with op.batch_alter_table('search_names', schema=None) as batch_op:
+        batch_op.drop_index('ix_search_names_name_trgm', postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'})
+
+    op.drop_table('search_names')
@@ -0,0 +1,28 @@
+"""market insight indexes
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19 13:32:55.696758
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('market_insights', schema=None) as batch_op:
+        batch_op.create_index('ix_market_insights_created_at', ['created_at'], unique=False)
+        batch_op.create_index('ix_market_insights_crop_name_created_at', ['crop_name', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('market_insights', schema=None) as batch_op:
+        batch_op.drop_index('ix_market_insights_crop_name_created_at')
+        batch_op.drop_index('ix_market_insights_created_at')
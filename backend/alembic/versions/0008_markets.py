@@ -0,0 +1,45 @@
+"""markets
+
+Market dimension table behind /market/markets, backfilled from the
+distinct markets already in market_prices; the ingest adds new ones.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-19 13:40:03.892444
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('markets',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('market_name', sa.String(length=100), nullable=False),
+    sa.Column('state', sa.String(length=50), nullable=False),
+    sa.Column('district', sa.String(length=50), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('state', 'district', 'market_name', name='uq_markets_state_district_market_name')
+    )
+    with op.batch_alter_table('markets', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_markets_id'), ['id'], unique=False)
+
+    op.execute(
+        "INSERT INTO markets (market_name, state, district) "
+        "SELECT DISTINCT market_name, state, district FROM market_prices"
+    )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('markets', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_markets_id'))
+
+    op.drop_table('markets')
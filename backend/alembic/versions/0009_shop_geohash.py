@@ -0,0 +1,46 @@
+"""shop geohash
+
+Geohash column behind /shops/nearby, backfilled for shops that already
+have coordinates; the Shop model keeps it in step with latitude and
+longitude from then on.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-19 13:42:21.979145
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.geo import encode_geohash
+
+
+# revision identifiers, used by Alembic.
+revision = '0009'
+down_revision = '0008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('shops', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('geohash', sa.String(length=12), nullable=True))
+        batch_op.create_index('ix_shops_is_active_geohash', ['is_active', 'geohash'], unique=False)
+
+    shops = sa.table('shops', sa.column('id'), sa.column('latitude'), sa.column('longitude'), sa.column('geohash'))
+    connection = op.get_bind()
+    located = connection.execute(
+        sa.select(shops.c.id, shops.c.latitude, shops.c.longitude)
+        .where(shops.c.latitude.isnot(None), shops.c.longitude.isnot(None))
+    ).all()
+    if located:
+        connection.execute(
+            shops.update().where(shops.c.id == sa.bindparam('shop_id')).values(geohash=sa.bindparam('shop_geohash')),
+            [{'shop_id': shop_id, 'shop_geohash': encode_geohash(latitude, longitude)} for shop_id, latitude, longitude in located]
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('shops', schema=None) as batch_op:
+        batch_op.drop_index('ix_shops_is_active_geohash')
+        batch_op.drop_column('geohash')
@@ -0,0 +1,33 @@
+"""notification outbox lease
+
+Lease columns the outbox worker claims due notifications with, and the
+index behind its due-notification poll.
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-19 14:32:10.518204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0010'
+down_revision = '0009'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('notifications', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('lease_owner', sa.String(length=64), nullable=True))
+        batch_op.add_column(sa.Column('lease_expires_at', sa.DateTime(timezone=True), nullable=True))
+        batch_op.create_index('ix_notifications_delivery_status_scheduled_at', ['delivery_status', 'scheduled_at'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('notifications', schema=None) as batch_op:
+        batch_op.drop_index('ix_notifications_delivery_status_scheduled_at')
+        batch_op.drop_column('lease_expires_at')
+        batch_op.drop_column('lease_owner')
@@ -0,0 +1,38 @@
+"""notification preferences
+
+Normalized per-user delivery preferences read by the routing cache
+(users.notification_preferences JSON remains the fallback).
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-19 14:32:48.270913
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0011'
+down_revision = '0010'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('notification_preferences',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('delivery_method', sa.String(length=20), nullable=False),
+    sa.Column('language', sa.String(length=5), nullable=True),
+    sa.Column('quiet_hours_start', sa.Integer(), nullable=True),
+    sa.Column('quiet_hours_end', sa.Integer(), nullable=True),
+    sa.Column('is_opted_out', sa.Boolean(), nullable=True),
+    sa.Column('opted_out_types', sa.String(length=200), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('notification_preferences')
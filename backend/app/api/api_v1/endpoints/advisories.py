@@ -1,35 +1,43 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
-from app.core.database import get_db
+from app.core.database import get_db, get_async_db
 from app.core.auth import get_current_user
+from app.core.pagination import keyset_paginate, next_page
+from app.core.responses import FastJSONResponse
 from app.models.user import User
 from app.models.advisory import Advisory, AdvisoryFeedback
+from app.services.user_service import UserService
 
 router = APIRouter()
 
 
 @router.get("/")
 async def get_advisories(
-    limit: int = 20,
-    offset: int = 0,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
     advisory_type: Optional[str] = None,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get user's advisories
     """
     try:
-        query = db.query(Advisory).filter(Advisory.user_id == current_user.id)
+        query = select(Advisory).where(Advisory.user_id == current_user.id)
         
         if advisory_type:
-            query = query.filter(Advisory.advisory_type == advisory_type)
+            query = query.where(Advisory.advisory_type == advisory_type)
         
-        advisories = query.order_by(Advisory.created_at.desc()).offset(offset).limit(limit).all()
+        result = await db.execute(
+            keyset_paginate(query, Advisory.id, cursor, limit, sort_column=Advisory.created_at)
+        )
+        advisories, next_cursor = next_page(result.scalars().all(), limit, "created_at")
         
-        return {
+        return FastJSONResponse({
             "advisories": [
                 {
                     "id": advisory.id,
@@ -47,8 +55,11 @@ async def get_advisories(
                 }
                 for advisory in advisories
             ],
-            "total": len(advisories)
-        }
+            "count": len(advisories),
+            "next_cursor": next_cursor
+        })
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching advisories: {str(e)}")
 
@@ -195,25 +206,12 @@ async def get_advisory_stats(
     Get advisory statistics for the user
     """
     try:
-        total_advisories = db.query(Advisory).filter(Advisory.user_id == current_user.id).count()
-        unread_advisories = db.query(Advisory).filter(
-            Advisory.user_id == current_user.id,
-            Advisory.is_read == False
-        ).count()
-        
-        # Get advisories by type
-        advisories_by_type = db.query(
-            Advisory.advisory_type,
-            db.func.count(Advisory.id).label('count')
-        ).filter(Advisory.user_id == current_user.id).group_by(Advisory.advisory_type).all()
+        stats = await UserService().get_advisory_stats(current_user.id, db)
         
         return {
-            "total_advisories": total_advisories,
-            "unread_advisories": unread_advisories,
-            "advisories_by_type": [
-                {"type": adv_type, "count": count}
-                for adv_type, count in advisories_by_type
-            ]
+            "total_advisories": stats["total"],
+            "unread_advisories": stats["unread"],
+            "advisories_by_type": stats["by_type"]
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching advisory stats: {str(e)}")
@@ -11,10 +11,11 @@ from app.core.auth import (
     get_stored_otp,
     verify_otp,
     increment_otp_attempts,
+    delete_otp,
     is_otp_expired,
     is_otp_max_attempts_reached,
-    get_password_hash,
-    verify_password
+    get_current_user,
+    principal_cache
 )
 from app.models.user import User
 from app.schemas.auth import (
@@ -26,6 +27,7 @@ from app.schemas.auth import (
 )
 from app.services.notification_service import NotificationService
 from app.core.config import settings
+from app.core.responses import model_response
 
 router = APIRouter()
 
@@ -110,6 +112,8 @@ async def verify_otp_and_login(
                 detail="Invalid OTP"
             )
         
+        delete_otp(request.phone_number)
+        
         # Get or create user
         user = db.query(User).filter(User.phone_number == request.phone_number).first()
         
@@ -136,7 +140,7 @@ async def verify_otp_and_login(
             data={"sub": str(user.id)}, expires_delta=access_token_expires
         )
         
-        return LoginResponse(
+        return model_response(LoginResponse(
             access_token=access_token,
             token_type="bearer",
             user=UserProfile(
@@ -148,7 +152,7 @@ async def verify_otp_and_login(
                 preferred_language=user.preferred_language,
                 is_verified=user.is_verified
             )
-        )
+        ))
         
     except HTTPException:
         raise
@@ -204,7 +208,7 @@ async def register_user(
             data={"sub": str(user.id)}, expires_delta=access_token_expires
         )
         
-        return LoginResponse(
+        return model_response(LoginResponse(
             access_token=access_token,
             token_type="bearer",
             user=UserProfile(
@@ -216,7 +220,7 @@ async def register_user(
                 preferred_language=user.preferred_language,
                 is_verified=user.is_verified
             )
-        )
+        ))
         
     except HTTPException:
         raise
@@ -261,6 +265,7 @@ async def logout(
     """
     Logout user (client-side token removal)
     """
+    principal_cache.invalidate(current_user.id)
     return {"message": "Logged out successfully"}
 
 
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks
 from sqlalchemy.orm import Session
 from typing import List, Optional
 import json
@@ -10,6 +10,8 @@ from app.services.chatbot_service import ChatbotService
 from app.services.translation_service import TranslationService
 from app.schemas.chatbot import ChatMessage, ChatResponse, VoiceMessage
 from app.core.auth import get_current_user
+from app.core.pagination import keyset_paginate, next_page
+from app.core.responses import FastJSONResponse, model_response
 
 router = APIRouter()
 
@@ -70,13 +72,13 @@ async def chat_with_bot(
         
         background_tasks.add_task(save_advisory, advisory, db)
         
-        return ChatResponse(
+        return model_response(ChatResponse(
             message=localized_response,
             advisory_type=ai_response.get("type", "general"),
             confidence=ai_response.get("confidence", 0.8),
             suggestions=ai_response.get("suggestions", []),
             language=message.language
-        )
+        ))
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Chat error: {str(e)}")
@@ -142,14 +144,14 @@ async def voice_chat(
         
         background_tasks.add_task(save_advisory, advisory, db)
         
-        return ChatResponse(
+        return model_response(ChatResponse(
             message=localized_response,
             advisory_type=ai_response.get("type", "general"),
             confidence=ai_response.get("confidence", 0.8),
             suggestions=ai_response.get("suggestions", []),
             language=voice_message.language,
             audio_response_url=ai_response.get("audio_url")  # For text-to-speech
-        )
+        ))
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Voice chat error: {str(e)}")
@@ -157,20 +159,25 @@ async def voice_chat(
 
 @router.get("/chat-history")
 async def get_chat_history(
-    limit: int = 20,
-    offset: int = 0,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
     Get user's chat history
     """
-    advisories = db.query(Advisory).filter(
+    query = db.query(Advisory).filter(
         Advisory.user_id == current_user.id,
         Advisory.is_ai_generated == True
-    ).order_by(Advisory.created_at.desc()).offset(offset).limit(limit).all()
+    )
+    advisories, next_cursor = next_page(
+        keyset_paginate(query, Advisory.id, cursor, limit, sort_column=Advisory.created_at).all(),
+        limit,
+        "created_at"
+    )
     
-    return {
+    return FastJSONResponse({
         "advisories": [
             {
                 "id": advisory.id,
@@ -182,8 +189,9 @@ async def get_chat_history(
             }
             for advisory in advisories
         ],
-        "total": len(advisories)
-    }
+        "count": len(advisories),
+        "next_cursor": next_cursor
+    })
 
 
 async def save_advisory(advisory: Advisory, db: Session):
@@ -1,38 +1,51 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload
 from typing import List, Optional
 
-from app.core.database import get_db
+from app.core.database import get_db, get_async_db
 from app.core.auth import get_current_user
+from app.core.pagination import keyset_paginate, next_page
+from app.core.responses import FastJSONResponse
 from app.models.user import User
 from app.models.community import CommunityPost, CommunityComment
 
 router = APIRouter()
 
+# Author fields shown next to posts and comments
+AUTHOR_COLUMNS = (User.id, User.name, User.district, User.state)
+
 
 @router.get("/posts")
 async def get_community_posts(
-    limit: int = 20,
-    offset: int = 0,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
     post_type: Optional[str] = None,
     crop_category: Optional[str] = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get community posts
     """
     try:
-        query = db.query(CommunityPost).filter(CommunityPost.is_approved == True)
+        # Authors are eager-loaded: lazy loads are not possible on an AsyncSession
+        query = select(CommunityPost).options(
+            joinedload(CommunityPost.user).load_only(*AUTHOR_COLUMNS)
+        ).where(CommunityPost.is_approved == True)
         
         if post_type:
-            query = query.filter(CommunityPost.post_type == post_type)
+            query = query.where(CommunityPost.post_type == post_type)
         
         if crop_category:
-            query = query.filter(CommunityPost.crop_category == crop_category)
+            query = query.where(CommunityPost.crop_category == crop_category)
         
-        posts = query.order_by(CommunityPost.created_at.desc()).offset(offset).limit(limit).all()
+        result = await db.execute(
+            keyset_paginate(query, CommunityPost.id, cursor, limit, sort_column=CommunityPost.created_at)
+        )
+        posts, next_cursor = next_page(result.scalars().all(), limit, "created_at")
         
-        return {
+        return FastJSONResponse({
             "posts": [
                 {
                     "id": post.id,
@@ -57,8 +70,11 @@ async def get_community_posts(
                 }
                 for post in posts
             ],
-            "total": len(posts)
-        }
+            "count": len(posts),
+            "next_cursor": next_cursor
+        })
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching community posts: {str(e)}")
 
@@ -109,7 +125,9 @@ async def get_community_post(
     Get a specific community post with comments
     """
     try:
-        post = db.query(CommunityPost).filter(
+        post = db.query(CommunityPost).options(
+            joinedload(CommunityPost.user).load_only(*AUTHOR_COLUMNS)
+        ).filter(
             CommunityPost.id == post_id,
             CommunityPost.is_approved == True
         ).first()
@@ -122,7 +140,9 @@ async def get_community_post(
         db.commit()
         
         # Get comments
-        comments = db.query(CommunityComment).filter(
+        comments = db.query(CommunityComment).options(
+            joinedload(CommunityComment.user).load_only(*AUTHOR_COLUMNS)
+        ).filter(
             CommunityComment.post_id == post_id,
             CommunityComment.is_approved == True
         ).order_by(CommunityComment.created_at.asc()).all()
@@ -246,7 +266,9 @@ async def get_trending_posts(
     Get trending community posts
     """
     try:
-        posts = db.query(CommunityPost).filter(
+        posts = db.query(CommunityPost).options(
+            joinedload(CommunityPost.user).load_only(*AUTHOR_COLUMNS)
+        ).filter(
             CommunityPost.is_approved == True
         ).order_by(
             CommunityPost.likes_count.desc(),
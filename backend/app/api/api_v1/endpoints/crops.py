@@ -1,9 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
 from app.core.database import get_db
 from app.core.auth import get_current_user
+from app.core.search import matching_names
 from app.models.user import User
 from app.models.crop import Crop, CropRecommendation
 from app.services.crop_recommendation_service import CropRecommendationService
@@ -13,7 +15,7 @@ router = APIRouter()
 
 @router.get("/")
 async def get_crops(
-    limit: int = 20,
+    limit: int = Query(20, ge=1, le=100),
     offset: int = 0,
     search: Optional[str] = None,
     db: Session = Depends(get_db)
@@ -25,7 +27,13 @@ async def get_crops(
         query = db.query(Crop)
         
         if search:
-            query = query.filter(Crop.name.ilike(f"%{search}%"))
+            # Local names are indexed too, so "गेहूं" matches by local_name_hindi
+            names = matching_names("crop", search)
+            query = query.filter(or_(
+                Crop.name.in_(names),
+                Crop.local_name_hindi.in_(names),
+                Crop.local_name_punjabi.in_(names)
+            ))
         
         crops = query.offset(offset).limit(limit).all()
         
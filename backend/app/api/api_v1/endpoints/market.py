@@ -1,15 +1,63 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, UploadFile, File
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from datetime import datetime, timedelta
+from datetime import date
 
-from app.core.database import get_db
-from app.core.auth import get_current_user
+import orjson
+
+from app.core.database import get_db, get_async_db
+from app.core.auth import get_current_user, require_admin_api_key
+from app.core.pagination import keyset_paginate, next_page
+from app.core.projection import rows_to_dicts
+from app.core.responses import FastJSONResponse, etag_matches
+from app.core.search import name_filter, name_filter_async
 from app.models.user import User
-from app.models.market import MarketPrice, MarketInsight
+from app.models.market import MarketPrice, MarketInsight, PriceAlert
+from app.services.market_service import MarketService, PRICE_HISTORY_INTERVALS
+from app.services.market_ingest_service import (
+    MarketIngestService,
+    INGEST_FORMATS,
+    detect_format,
+    normalize_crop_name,
+    normalize_name,
+    open_text_stream
+)
+from app.services.market_analytics_service import MarketAnalyticsService, AnalyticsUnavailable
+from app.services.market_directory_service import MarketDirectoryService
+from app.services.price_alert_service import ALERT_TYPES
 
 router = APIRouter()
 
+MARKET_PRICE_COLUMNS = (
+    MarketPrice.id,
+    MarketPrice.crop_name,
+    MarketPrice.variety,
+    MarketPrice.market_name,
+    MarketPrice.state,
+    MarketPrice.district,
+    MarketPrice.min_price,
+    MarketPrice.max_price,
+    MarketPrice.modal_price,
+    MarketPrice.arrival_quantity,
+    MarketPrice.quality_grade,
+    MarketPrice.source,
+    MarketPrice.price_date
+)
+
+
+PRICE_ALERT_COLUMNS = (
+    PriceAlert.id,
+    PriceAlert.crop_name,
+    PriceAlert.market_name,
+    PriceAlert.alert_type,
+    PriceAlert.target_price,
+    PriceAlert.is_active,
+    PriceAlert.triggered_at,
+    PriceAlert.created_at
+)
+
 
 @router.get("/prices")
 async def get_market_prices(
@@ -17,126 +65,184 @@ async def get_market_prices(
     market_name: Optional[str] = None,
     state: Optional[str] = None,
     district: Optional[str] = None,
-    limit: int = 20,
-    offset: int = 0,
-    db: Session = Depends(get_db)
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get market prices for crops
     """
     try:
-        query = db.query(MarketPrice)
+        query = select(*MARKET_PRICE_COLUMNS)
         
         if crop_name:
-            query = query.filter(MarketPrice.crop_name.ilike(f"%{crop_name}%"))
+            query = query.where(await name_filter_async(db, MarketPrice.crop_name, "crop", crop_name))
         
         if market_name:
-            query = query.filter(MarketPrice.market_name.ilike(f"%{market_name}%"))
+            query = query.where(await name_filter_async(db, MarketPrice.market_name, "market", market_name))
         
         if state:
-            query = query.filter(MarketPrice.state == state)
+            query = query.where(MarketPrice.state == state)
         
         if district:
-            query = query.filter(MarketPrice.district == district)
+            query = query.where(MarketPrice.district == district)
         
-        prices = query.order_by(MarketPrice.price_date.desc()).offset(offset).limit(limit).all()
+        result = await db.execute(
+            keyset_paginate(query, MarketPrice.id, cursor, limit, sort_column=MarketPrice.price_date)
+        )
+        prices, next_cursor = next_page(result.all(), limit, "price_date")
         
-        return {
-            "prices": [
-                {
-                    "id": price.id,
-                    "crop_name": price.crop_name,
-                    "variety": price.variety,
-                    "market_name": price.market_name,
-                    "state": price.state,
-                    "district": price.district,
-                    "min_price": price.min_price,
-                    "max_price": price.max_price,
-                    "modal_price": price.modal_price,
-                    "arrival_quantity": price.arrival_quantity,
-                    "quality_grade": price.quality_grade,
-                    "source": price.source,
-                    "price_date": price.price_date
-                }
-                for price in prices
-            ],
-            "total": len(prices)
-        }
+        return FastJSONResponse({
+            "prices": rows_to_dicts(prices),
+            "count": len(prices),
+            "next_cursor": next_cursor
+        })
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching market prices: {str(e)}")
 
 
+@router.post("/ingest", dependencies=[Depends(require_admin_api_key)])
+def ingest_market_prices(
+    file: UploadFile = File(...),
+    file_format: Optional[str] = None,
+    source: str = "mandi",
+    db: Session = Depends(get_db)
+):
+    """
+    Bulk upsert a market price dump (CSV, JSON array or NDJSON, optionally
+    gzipped); admin only. Runs in the threadpool and streams the upload in
+    batches, so large files do not block the event loop or load into memory.
+    """
+    try:
+        file_format = file_format or detect_format(file.filename or "")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if file_format not in INGEST_FORMATS:
+        raise HTTPException(status_code=400, detail=f"file_format must be one of {', '.join(INGEST_FORMATS)}")
+    
+    try:
+        stream = open_text_stream(file.file, file.filename or "")
+        stats = MarketIngestService().ingest_file(db, stream, file_format, source=source)
+        return stats.as_dict()
+    except ValueError as e:
+        # Batches before the bad one stay committed; re-running the file is idempotent
+        raise HTTPException(status_code=400, detail=f"Could not parse {file.filename}: {str(e)}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error ingesting market prices: {str(e)}")
+
+
 @router.get("/price-history/{crop_name}")
 async def get_price_history(
     crop_name: str,
     days: int = 30,
     market_name: Optional[str] = None,
+    interval: str = "day",
     db: Session = Depends(get_db)
 ):
     """
-    Get price history for a specific crop
+    Get price history for a specific crop, bucketed by day, week or month
     """
+    if interval not in PRICE_HISTORY_INTERVALS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"interval must be one of {', '.join(PRICE_HISTORY_INTERVALS)}"
+        )
+    
     try:
-        start_date = datetime.utcnow() - timedelta(days=days)
-        
-        query = db.query(MarketPrice).filter(
-            MarketPrice.crop_name.ilike(f"%{crop_name}%"),
-            MarketPrice.price_date >= start_date
+        price_history = await MarketService().get_price_history(
+            db, crop_name, days=days, market_name=market_name, interval=interval
         )
         
-        if market_name:
-            query = query.filter(MarketPrice.market_name.ilike(f"%{market_name}%"))
-        
-        prices = query.order_by(MarketPrice.price_date.asc()).all()
-        
-        # Group by date and calculate average prices
-        price_history = {}
-        for price in prices:
-            date_key = price.price_date.date().isoformat()
-            if date_key not in price_history:
-                price_history[date_key] = {
-                    "date": date_key,
-                    "prices": [],
-                    "avg_min": 0,
-                    "avg_max": 0,
-                    "avg_modal": 0
-                }
-            price_history[date_key]["prices"].append(price)
-        
-        # Calculate averages
-        for date_key, data in price_history.items():
-            prices_list = data["prices"]
-            data["avg_min"] = sum(p.min_price for p in prices_list) / len(prices_list)
-            data["avg_max"] = sum(p.max_price for p in prices_list) / len(prices_list)
-            data["avg_modal"] = sum(p.modal_price for p in prices_list if p.modal_price) / len([p for p in prices_list if p.modal_price])
-            del data["prices"]  # Remove raw prices from response
-        
         return {
             "crop_name": crop_name,
             "days": days,
             "market_name": market_name,
-            "price_history": list(price_history.values())
+            "interval": interval,
+            "price_history": price_history
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching price history: {str(e)}")
 
 
+@router.get("/analytics")
+def get_market_analytics(
+    group_by: str = "crop_name",
+    interval: Optional[str] = None,
+    crop_name: Optional[str] = None,
+    market_name: Optional[str] = None,
+    state: Optional[str] = None,
+    district: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Aggregate price history (low/high, average min/max/modal price,
+    arrivals, record counts) grouped by any of crop_name, market_name,
+    state, district and variety, optionally per day / week / month.
+
+    Answered from the Parquet export (scripts/export_market_history.py),
+    never the database; crop_name takes a comma-separated list of exact
+    names. Runs in the threadpool, as scans are CPU-bound.
+    """
+    dimensions = [name.strip() for name in group_by.split(",") if name.strip()]
+    crop_names = [normalize_crop_name(name) for name in (crop_name or "").split(",") if name.strip()]
+    
+    try:
+        return FastJSONResponse(MarketAnalyticsService().aggregate(
+            dimensions,
+            interval=interval,
+            crop_names=crop_names,
+            market_name=normalize_name(market_name) if market_name else None,
+            state=normalize_name(state) if state else None,
+            district=normalize_name(district) if district else None,
+            start_date=start_date,
+            end_date=end_date
+        ))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except AnalyticsUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error running market analytics: {str(e)}")
+
+
 @router.get("/insights")
 async def get_market_insights(
-    limit: int = 10,
-    offset: int = 0,
+    crop_name: Optional[str] = None,
+    market_name: Optional[str] = None,
+    insight_type: Optional[str] = None,
+    limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = None,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
-    Get market insights and analysis
+    Get market insights and analysis, including the price forecasts
+    precomputed by scripts/forecast_market_prices.py (insight_type
+    "price_forecast", region = market)
     """
     try:
-        insights = db.query(MarketInsight).order_by(
-            MarketInsight.created_at.desc()
-        ).offset(offset).limit(limit).all()
+        query = db.query(MarketInsight)
         
-        return {
+        if crop_name:
+            query = query.filter(name_filter(db, MarketInsight.crop_name, "crop", crop_name))
+        
+        if market_name:
+            query = query.filter(name_filter(db, MarketInsight.region, "market", market_name))
+        
+        if insight_type:
+            query = query.filter(MarketInsight.insight_type == insight_type)
+        
+        insights, next_cursor = next_page(
+            keyset_paginate(query, MarketInsight.id, cursor, limit, sort_column=MarketInsight.created_at).all(),
+            limit,
+            "created_at"
+        )
+        
+        return FastJSONResponse({
             "insights": [
                 {
                     "id": insight.id,
@@ -148,6 +254,8 @@ async def get_market_insights(
                     "trend_direction": insight.trend_direction,
                     "confidence_level": insight.confidence_level,
                     "time_horizon": insight.time_horizon,
+                    "historical_data": orjson.loads(insight.historical_data) if insight.historical_data else None,
+                    "forecast_data": orjson.loads(insight.forecast_data) if insight.forecast_data else None,
                     "is_ai_generated": insight.is_ai_generated,
                     "model_version": insight.model_version,
                     "language": insight.language,
@@ -155,8 +263,11 @@ async def get_market_insights(
                 }
                 for insight in insights
             ],
-            "total": len(insights)
-        }
+            "count": len(insights),
+            "next_cursor": next_cursor
+        })
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching market insights: {str(e)}")
 
@@ -171,99 +282,141 @@ async def set_price_alert(
     db: Session = Depends(get_db)
 ):
     """
-    Set a price alert for a crop
+    Set a price alert for a crop; it fires once, the first time an ingested
+    price crosses target_price in the given direction
     """
+    if alert_type not in ALERT_TYPES:
+        raise HTTPException(status_code=400, detail=f"alert_type must be one of {', '.join(ALERT_TYPES)}")
+    if target_price <= 0:
+        raise HTTPException(status_code=400, detail="target_price must be positive")
+    if not crop_name.strip():
+        raise HTTPException(status_code=400, detail="crop_name is required")
+    
     try:
-        # This would typically create a price alert record
-        # For now, we'll just return a success message
+        alert = PriceAlert(
+            user_id=current_user.id,
+            crop_name=normalize_crop_name(crop_name),
+            market_name=normalize_name(market_name) if market_name and market_name.strip() else None,
+            alert_type=alert_type,
+            target_price=target_price
+        )
+        db.add(alert)
+        db.commit()
+        db.refresh(alert)
         
         return {
             "message": "Price alert set successfully",
-            "crop_name": crop_name,
-            "target_price": target_price,
-            "alert_type": alert_type,
-            "market_name": market_name
+            "id": alert.id,
+            "crop_name": alert.crop_name,
+            "target_price": alert.target_price,
+            "alert_type": alert.alert_type,
+            "market_name": alert.market_name
         }
     except Exception as e:
+        db.rollback()
         raise HTTPException(status_code=500, detail=f"Error setting price alert: {str(e)}")
 
 
-@router.get("/trends")
-async def get_market_trends(
-    crop_name: Optional[str] = None,
-    days: int = 7,
+@router.get("/price-alerts")
+async def get_price_alerts(
+    active_only: bool = False,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
-    Get market trends for crops
+    Get the current user's price alerts, newest first
     """
     try:
-        start_date = datetime.utcnow() - timedelta(days=days)
+        query = select(*PRICE_ALERT_COLUMNS).where(PriceAlert.user_id == current_user.id)
         
-        query = db.query(MarketPrice).filter(
-            MarketPrice.price_date >= start_date
-        )
+        if active_only:
+            query = query.where(PriceAlert.is_active == True)
         
-        if crop_name:
-            query = query.filter(MarketPrice.crop_name.ilike(f"%{crop_name}%"))
+        rows = db.execute(keyset_paginate(query, PriceAlert.id, cursor, limit)).all()
+        alerts, next_cursor = next_page(rows, limit)
         
-        prices = query.order_by(MarketPrice.price_date.desc()).all()
+        return {
+            "alerts": rows_to_dicts(alerts),
+            "count": len(alerts),
+            "next_cursor": next_cursor
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching price alerts: {str(e)}")
+
+
+@router.delete("/price-alerts/{alert_id}")
+async def delete_price_alert(
+    alert_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Cancel a price alert
+    """
+    alert = db.query(PriceAlert).filter(
+        PriceAlert.id == alert_id,
+        PriceAlert.user_id == current_user.id
+    ).first()
+    
+    if not alert:
+        raise HTTPException(status_code=404, detail="Price alert not found")
+    
+    try:
+        # Matchers drop the alert the next time a price would have fired it
+        db.delete(alert)
+        db.commit()
         
-        # Calculate trends
-        trends = {}
-        for price in prices:
-            if price.crop_name not in trends:
-                trends[price.crop_name] = {
-                    "crop_name": price.crop_name,
-                    "current_price": price.modal_price or ((price.min_price + price.max_price) / 2),
-                    "price_change": 0,
-                    "trend": "stable",
-                    "markets": []
-                }
-            
-            trends[price.crop_name]["markets"].append({
-                "market_name": price.market_name,
-                "price": price.modal_price or ((price.min_price + price.max_price) / 2),
-                "date": price.price_date
-            })
+        return {"message": "Price alert deleted successfully"}
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Error deleting price alert: {str(e)}")
+
+
+@router.get("/trends")
+async def get_market_trends(
+    crop_name: Optional[str] = None,
+    days: int = Query(7, ge=1, le=365),
+    ma_window: int = Query(7, ge=1, le=365),
+    db: Session = Depends(get_db)
+):
+    """
+    Get market trends for crops: price change, moving average, volatility
+    and direction over the last `days` days, with the busiest markets
+    """
+    try:
+        trends = await MarketService().get_market_trends(db, crop_name=crop_name, days=days, ma_window=ma_window)
         
         return {
-            "trends": list(trends.values()),
-            "period_days": days
+            "trends": trends,
+            "period_days": days,
+            "ma_window": ma_window
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching market trends: {str(e)}")
 
 
 @router.get("/markets")
-async def get_available_markets(
+def get_available_markets(
     state: Optional[str] = None,
     district: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
     db: Session = Depends(get_db)
 ):
     """
-    Get list of available markets
+    Get list of available markets, served from the in-memory market
+    directory; clients revalidate with If-None-Match and get a 304 until
+    new markets are ingested
     """
     try:
-        query = db.query(MarketPrice.market_name, MarketPrice.state, MarketPrice.district).distinct()
-        
-        if state:
-            query = query.filter(MarketPrice.state == state)
-        
-        if district:
-            query = query.filter(MarketPrice.district == district)
+        directory = MarketDirectoryService().get_directory(db)
+        headers = {"ETag": directory.etag, "Cache-Control": "no-cache"}
+        if etag_matches(if_none_match, directory.etag):
+            return Response(status_code=304, headers=headers)
         
-        markets = query.all()
-        
-        return {
-            "markets": [
-                {
-                    "market_name": market.market_name,
-                    "state": market.state,
-                    "district": market.district
-                }
-                for market in markets
-            ]
-        }
+        return Response(content=directory.body(state or None, district or None), media_type="application/json", headers=headers)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching markets: {str(e)}")
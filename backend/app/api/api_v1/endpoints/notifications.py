@@ -1,39 +1,49 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
-from app.core.database import get_db
-from app.core.auth import get_current_user
+from app.core.database import get_db, get_async_db
+from app.core.auth import get_current_user, get_current_user_live, require_admin_api_key
+from app.core.pagination import keyset_paginate, next_page
+from app.core.responses import FastJSONResponse
 from app.models.user import User
 from app.models.notification import Notification
+from app.services.notification_preference_service import preference_cache
+from app.services.user_service import UserService
+from app.workers.notification_outbox import get_outbox_backlog
 
 router = APIRouter()
 
 
 @router.get("/")
 async def get_notifications(
-    limit: int = 20,
-    offset: int = 0,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
     notification_type: Optional[str] = None,
     is_read: Optional[bool] = None,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get user's notifications
     """
     try:
-        query = db.query(Notification).filter(Notification.user_id == current_user.id)
+        query = select(Notification).where(Notification.user_id == current_user.id)
         
         if notification_type:
-            query = query.filter(Notification.notification_type == notification_type)
+            query = query.where(Notification.notification_type == notification_type)
         
         if is_read is not None:
-            query = query.filter(Notification.is_read == is_read)
+            query = query.where(Notification.is_read == is_read)
         
-        notifications = query.order_by(Notification.created_at.desc()).offset(offset).limit(limit).all()
+        result = await db.execute(
+            keyset_paginate(query, Notification.id, cursor, limit, sort_column=Notification.created_at)
+        )
+        notifications, next_cursor = next_page(result.scalars().all(), limit, "created_at")
         
-        return {
+        return FastJSONResponse({
             "notifications": [
                 {
                     "id": notification.id,
@@ -57,8 +67,11 @@ async def get_notifications(
                 }
                 for notification in notifications
             ],
-            "total": len(notifications)
-        }
+            "count": len(notifications),
+            "next_cursor": next_cursor
+        })
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching notifications: {str(e)}")
 
@@ -161,10 +174,7 @@ async def update_notification_preferences(
     Update user's notification preferences
     """
     try:
-        import json
-        
-        current_user.notification_preferences = json.dumps(preferences)
-        db.commit()
+        preference_cache.save_preferences(current_user.id, preferences, db)
         
         return {
             "message": "Notification preferences updated successfully",
@@ -176,7 +186,7 @@ async def update_notification_preferences(
 
 @router.get("/preferences")
 async def get_notification_preferences(
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_user_live),
     db: Session = Depends(get_db)
 ):
     """
@@ -205,39 +215,37 @@ async def get_notification_stats(
     Get notification statistics for the user
     """
     try:
-        total_notifications = db.query(Notification).filter(
-            Notification.user_id == current_user.id
-        ).count()
-        
-        unread_notifications = db.query(Notification).filter(
-            Notification.user_id == current_user.id,
-            Notification.is_read == False
-        ).count()
-        
-        unacknowledged_notifications = db.query(Notification).filter(
-            Notification.user_id == current_user.id,
-            Notification.is_acknowledged == False
-        ).count()
-        
-        # Get notifications by type
-        notifications_by_type = db.query(
-            Notification.notification_type,
-            db.func.count(Notification.id).label('count')
-        ).filter(Notification.user_id == current_user.id).group_by(Notification.notification_type).all()
+        stats = await UserService().get_notification_stats(current_user.id, db)
         
         return {
-            "total_notifications": total_notifications,
-            "unread_notifications": unread_notifications,
-            "unacknowledged_notifications": unacknowledged_notifications,
-            "notifications_by_type": [
-                {"type": notif_type, "count": count}
-                for notif_type, count in notifications_by_type
-            ]
+            "total_notifications": stats["total"],
+            "unread_notifications": stats["unread"],
+            "unacknowledged_notifications": stats["unacknowledged"],
+            "notifications_by_type": stats["by_type"]
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching notification stats: {str(e)}")
 
 
+@router.get("/outbox/metrics", dependencies=[Depends(require_admin_api_key)])
+async def get_outbox_metrics(
+    request: Request,
+    db: Session = Depends(get_db)
+):
+    """
+    Get notification outbox backlog, lag and (if running in-process) worker throughput
+    """
+    try:
+        worker = getattr(request.app.state, "outbox_worker", None)
+        
+        return {
+            "backlog": get_outbox_backlog(db),
+            "worker": worker.metrics.snapshot() if worker else None
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching outbox metrics: {str(e)}")
+
+
 @router.delete("/{notification_id}")
 async def delete_notification(
     notification_id: int,
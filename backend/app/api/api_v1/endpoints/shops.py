@@ -1,14 +1,90 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
 from app.core.database import get_db
 from app.core.auth import get_current_user
+from app.core.geo import haversine_km, nearby_filter
+from app.core.pagination import keyset_paginate, next_page
+from app.core.projection import labeled, row_to_dict, rows_to_dicts
+from app.core.responses import FastJSONResponse
+from app.core.search import name_filter
 from app.models.user import User
 from app.models.shop import Shop, ShopInventory
 
 router = APIRouter()
 
+# Columns served by the list endpoints; large Text fields that are not part
+# of the response (descriptions, specifications) are never loaded
+SHOP_LIST_COLUMNS = (
+    Shop.id,
+    Shop.name,
+    Shop.shop_type,
+    Shop.phone_number,
+    Shop.email,
+    Shop.contact_person,
+    Shop.address,
+    Shop.state,
+    Shop.district,
+    Shop.village,
+    Shop.pincode,
+    Shop.latitude,
+    Shop.longitude,
+    Shop.license_number,
+    Shop.is_verified,
+    Shop.is_government_approved,
+    Shop.services,
+    Shop.payment_methods,
+    Shop.operating_hours,
+    Shop.average_rating,
+    Shop.total_reviews
+)
+
+PRODUCT_SEARCH_COLUMNS = (
+    ShopInventory.id,
+    ShopInventory.product_name,
+    ShopInventory.product_type,
+    ShopInventory.brand,
+    ShopInventory.variety,
+    ShopInventory.price_per_unit,
+    ShopInventory.unit,
+    ShopInventory.discount_percentage,
+    ShopInventory.is_organic,
+    ShopInventory.is_government_subsidized
+)
+
+PRODUCT_SHOP_COLUMNS = (
+    Shop.id,
+    Shop.name,
+    Shop.shop_type,
+    Shop.address,
+    Shop.state,
+    Shop.district,
+    Shop.phone_number,
+    Shop.is_government_approved
+)
+
+SHOP_INVENTORY_COLUMNS = (
+    ShopInventory.id,
+    ShopInventory.product_name,
+    ShopInventory.product_type,
+    ShopInventory.brand,
+    ShopInventory.variety,
+    ShopInventory.description,
+    ShopInventory.specifications,
+    ShopInventory.price_per_unit,
+    ShopInventory.unit,
+    ShopInventory.discount_percentage,
+    ShopInventory.current_stock,
+    ShopInventory.minimum_stock,
+    ShopInventory.is_available,
+    ShopInventory.is_organic,
+    ShopInventory.is_government_subsidized,
+    ShopInventory.quality_grade,
+    ShopInventory.expiry_date
+)
+
 
 @router.get("/")
 async def get_shops(
@@ -16,63 +92,140 @@ async def get_shops(
     state: Optional[str] = None,
     district: Optional[str] = None,
     is_government_approved: Optional[bool] = None,
-    limit: int = 20,
-    offset: int = 0,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
     """
     Get list of shops
     """
     try:
-        query = db.query(Shop).filter(Shop.is_active == True)
+        query = select(*SHOP_LIST_COLUMNS).where(Shop.is_active == True)
         
         if shop_type:
-            query = query.filter(Shop.shop_type == shop_type)
+            query = query.where(Shop.shop_type == shop_type)
         
         if state:
-            query = query.filter(Shop.state == state)
+            query = query.where(Shop.state == state)
         
         if district:
-            query = query.filter(Shop.district == district)
+            query = query.where(Shop.district == district)
         
         if is_government_approved is not None:
-            query = query.filter(Shop.is_government_approved == is_government_approved)
+            query = query.where(Shop.is_government_approved == is_government_approved)
         
-        shops = query.offset(offset).limit(limit).all()
+        shops, next_cursor = next_page(
+            db.execute(keyset_paginate(query, Shop.id, cursor, limit, descending=False)).all(), limit
+        )
         
-        return {
-            "shops": [
-                {
-                    "id": shop.id,
-                    "name": shop.name,
-                    "shop_type": shop.shop_type,
-                    "phone_number": shop.phone_number,
-                    "email": shop.email,
-                    "contact_person": shop.contact_person,
-                    "address": shop.address,
-                    "state": shop.state,
-                    "district": shop.district,
-                    "village": shop.village,
-                    "pincode": shop.pincode,
-                    "latitude": shop.latitude,
-                    "longitude": shop.longitude,
-                    "license_number": shop.license_number,
-                    "is_verified": shop.is_verified,
-                    "is_government_approved": shop.is_government_approved,
-                    "services": shop.services,
-                    "payment_methods": shop.payment_methods,
-                    "operating_hours": shop.operating_hours,
-                    "average_rating": shop.average_rating,
-                    "total_reviews": shop.total_reviews
-                }
-                for shop in shops
-            ],
-            "total": len(shops)
-        }
+        return FastJSONResponse({
+            "shops": rows_to_dicts(shops),
+            "count": len(shops),
+            "next_cursor": next_cursor
+        })
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching shops: {str(e)}")
 
 
+@router.get("/search-products")
+async def search_products(
+    q: str,
+    product_type: Optional[str] = None,
+    state: Optional[str] = None,
+    district: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = 0,
+    db: Session = Depends(get_db)
+):
+    """
+    Search for products across all shops
+    """
+    try:
+        query = select(
+            *PRODUCT_SEARCH_COLUMNS,
+            *labeled("shop", *PRODUCT_SHOP_COLUMNS)
+        ).join(Shop, Shop.id == ShopInventory.shop_id).where(
+            name_filter(db, ShopInventory.product_name, "product", q),
+            ShopInventory.is_available == True,
+            Shop.is_active == True
+        )
+        
+        if product_type:
+            query = query.where(ShopInventory.product_type == product_type)
+        
+        if state:
+            query = query.where(Shop.state == state)
+        
+        if district:
+            query = query.where(Shop.district == district)
+        
+        products = db.execute(query.offset(offset).limit(limit)).all()
+        
+        return FastJSONResponse({
+            "products": rows_to_dicts(products),
+            "total": len(products),
+            "search_query": q
+        })
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error searching products: {str(e)}")
+
+
+@router.get("/nearby")
+async def get_nearby_shops(
+    latitude: float,
+    longitude: float,
+    radius_km: float = 10.0,
+    shop_type: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get shops within radius_km of a location, nearest first. Candidates
+    come from geohash range scans over the bounding box and are ranked by
+    great-circle distance.
+    """
+    if not -90 <= latitude <= 90 or not -180 <= longitude <= 180:
+        raise HTTPException(status_code=400, detail="latitude must be within [-90, 90] and longitude within [-180, 180]")
+    if radius_km <= 0:
+        raise HTTPException(status_code=400, detail="radius_km must be positive")
+    
+    try:
+        query = select(*labeled("shop", *PRODUCT_SHOP_COLUMNS), Shop.latitude, Shop.longitude).where(
+            nearby_filter(
+                Shop.geohash, Shop.latitude, Shop.longitude, latitude, longitude, radius_km,
+                Shop.is_active == True
+            )
+        )
+        
+        if shop_type:
+            query = query.where(Shop.shop_type == shop_type)
+        
+        nearby_shops = []
+        for row in db.execute(query):
+            distance = haversine_km(latitude, longitude, row.latitude, row.longitude)
+            if distance <= radius_km:
+                nearby_shops.append({
+                    "shop": row_to_dict(row)["shop"],
+                    "distance_km": round(distance, 2)
+                })
+        
+        # Sort by distance
+        nearby_shops.sort(key=lambda x: x["distance_km"])
+        
+        return FastJSONResponse({
+            "nearby_shops": nearby_shops[:limit],
+            "center_latitude": latitude,
+            "center_longitude": longitude,
+            "radius_km": radius_km,
+            "total_found": len(nearby_shops)
+        })
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching nearby shops: {str(e)}")
+
+
 @router.get("/{shop_id}")
 async def get_shop_details(
     shop_id: int,
@@ -120,8 +273,8 @@ async def get_shop_inventory(
     shop_id: int,
     product_type: Optional[str] = None,
     search: Optional[str] = None,
-    limit: int = 20,
-    offset: int = 0,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
     """
@@ -129,171 +282,30 @@ async def get_shop_inventory(
     """
     try:
         # Check if shop exists
-        shop = db.query(Shop).filter(Shop.id == shop_id).first()
-        if not shop:
+        shop_name = db.execute(select(Shop.name).where(Shop.id == shop_id)).scalar_one_or_none()
+        if shop_name is None:
             raise HTTPException(status_code=404, detail="Shop not found")
         
-        query = db.query(ShopInventory).filter(ShopInventory.shop_id == shop_id)
+        query = select(*SHOP_INVENTORY_COLUMNS).where(ShopInventory.shop_id == shop_id)
         
         if product_type:
-            query = query.filter(ShopInventory.product_type == product_type)
+            query = query.where(ShopInventory.product_type == product_type)
         
         if search:
-            query = query.filter(ShopInventory.product_name.ilike(f"%{search}%"))
+            query = query.where(name_filter(db, ShopInventory.product_name, "product", search))
         
-        inventory = query.offset(offset).limit(limit).all()
+        inventory, next_cursor = next_page(
+            db.execute(keyset_paginate(query, ShopInventory.id, cursor, limit, descending=False)).all(), limit
+        )
         
-        return {
+        return FastJSONResponse({
             "shop_id": shop_id,
-            "shop_name": shop.name,
-            "inventory": [
-                {
-                    "id": item.id,
-                    "product_name": item.product_name,
-                    "product_type": item.product_type,
-                    "brand": item.brand,
-                    "variety": item.variety,
-                    "description": item.description,
-                    "specifications": item.specifications,
-                    "price_per_unit": item.price_per_unit,
-                    "unit": item.unit,
-                    "discount_percentage": item.discount_percentage,
-                    "current_stock": item.current_stock,
-                    "minimum_stock": item.minimum_stock,
-                    "is_available": item.is_available,
-                    "is_organic": item.is_organic,
-                    "is_government_subsidized": item.is_government_subsidized,
-                    "quality_grade": item.quality_grade,
-                    "expiry_date": item.expiry_date
-                }
-                for item in inventory
-            ],
-            "total": len(inventory)
-        }
+            "shop_name": shop_name,
+            "inventory": rows_to_dicts(inventory),
+            "count": len(inventory),
+            "next_cursor": next_cursor
+        })
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching shop inventory: {str(e)}")
-
-
-@router.get("/search-products")
-async def search_products(
-    q: str,
-    product_type: Optional[str] = None,
-    state: Optional[str] = None,
-    district: Optional[str] = None,
-    limit: int = 20,
-    offset: int = 0,
-    db: Session = Depends(get_db)
-):
-    """
-    Search for products across all shops
-    """
-    try:
-        query = db.query(ShopInventory).join(Shop).filter(
-            ShopInventory.product_name.ilike(f"%{q}%"),
-            ShopInventory.is_available == True,
-            Shop.is_active == True
-        )
-        
-        if product_type:
-            query = query.filter(ShopInventory.product_type == product_type)
-        
-        if state:
-            query = query.filter(Shop.state == state)
-        
-        if district:
-            query = query.filter(Shop.district == district)
-        
-        products = query.offset(offset).limit(limit).all()
-        
-        return {
-            "products": [
-                {
-                    "id": product.id,
-                    "product_name": product.product_name,
-                    "product_type": product.product_type,
-                    "brand": product.brand,
-                    "variety": product.variety,
-                    "price_per_unit": product.price_per_unit,
-                    "unit": product.unit,
-                    "discount_percentage": product.discount_percentage,
-                    "is_organic": product.is_organic,
-                    "is_government_subsidized": product.is_government_subsidized,
-                    "shop": {
-                        "id": product.shop.id,
-                        "name": product.shop.name,
-                        "shop_type": product.shop.shop_type,
-                        "address": product.shop.address,
-                        "state": product.shop.state,
-                        "district": product.shop.district,
-                        "phone_number": product.shop.phone_number,
-                        "is_government_approved": product.shop.is_government_approved
-                    }
-                }
-                for product in products
-            ],
-            "total": len(products),
-            "search_query": q
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error searching products: {str(e)}")
-
-
-@router.get("/nearby")
-async def get_nearby_shops(
-    latitude: float,
-    longitude: float,
-    radius_km: float = 10.0,
-    shop_type: Optional[str] = None,
-    limit: int = 20,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
-    """
-    Get shops near a specific location
-    """
-    try:
-        # This is a simplified version - in production, you'd use proper geospatial queries
-        shops = db.query(Shop).filter(
-            Shop.is_active == True,
-            Shop.latitude.isnot(None),
-            Shop.longitude.isnot(None)
-        ).all()
-        
-        if shop_type:
-            shops = [shop for shop in shops if shop.shop_type == shop_type]
-        
-        # Calculate distances (simplified)
-        nearby_shops = []
-        for shop in shops:
-            if shop.latitude and shop.longitude:
-                # Simple distance calculation (not accurate for large distances)
-                distance = ((shop.latitude - latitude) ** 2 + (shop.longitude - longitude) ** 2) ** 0.5 * 111  # Rough km conversion
-                if distance <= radius_km:
-                    nearby_shops.append({
-                        "shop": {
-                            "id": shop.id,
-                            "name": shop.name,
-                            "shop_type": shop.shop_type,
-                            "address": shop.address,
-                            "state": shop.state,
-                            "district": shop.district,
-                            "phone_number": shop.phone_number,
-                            "is_government_approved": shop.is_government_approved
-                        },
-                        "distance_km": round(distance, 2)
-                    })
-        
-        # Sort by distance
-        nearby_shops.sort(key=lambda x: x["distance_km"])
-        
-        return {
-            "nearby_shops": nearby_shops[:limit],
-            "center_latitude": latitude,
-            "center_longitude": longitude,
-            "radius_km": radius_km,
-            "total_found": len(nearby_shops)
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error fetching nearby shops: {str(e)}")
@@ -3,6 +3,8 @@ from pydantic import BaseModel
 from datetime import datetime
 from typing import Optional
 
+from app.core.responses import model_response
+
 router = APIRouter()
 
 
@@ -75,11 +77,11 @@ async def chat_with_bot(message: ChatMessage):
     try:
         response_text = generate_ai_response(message.message, message.language)
         
-        return ChatResponse(
+        return model_response(ChatResponse(
             response=response_text,
             timestamp=datetime.utcnow(),
             language=message.language
-        )
+        ))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing message: {str(e)}")
 
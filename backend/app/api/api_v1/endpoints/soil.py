@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
@@ -38,7 +38,7 @@ async def get_soil_types(db: Session = Depends(get_db)):
 
 @router.get("/tests")
 async def get_soil_tests(
-    limit: int = 20,
+    limit: int = Query(20, ge=1, le=100),
     offset: int = 0,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -1,9 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 from typing import Optional
 
 from app.core.database import get_db
-from app.core.auth import get_current_user
+from app.core.auth import get_current_user, get_current_user_live
+from app.core.responses import model_response
 from app.models.user import User
 from app.schemas.user import UserProfile, UserUpdate
 from app.services.user_service import UserService
@@ -13,13 +14,13 @@ router = APIRouter()
 
 @router.get("/me", response_model=UserProfile)
 async def get_current_user_profile(
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_user_live),
     db: Session = Depends(get_db)
 ):
     """
     Get current user profile
     """
-    return UserProfile.from_orm(current_user)
+    return model_response(UserProfile.from_orm(current_user))
 
 
 @router.patch("/me", response_model=UserProfile)
@@ -36,7 +37,7 @@ async def update_user_profile(
         updated_user = await user_service.update_user_profile(
             current_user.id, user_update, db
         )
-        return UserProfile.from_orm(updated_user)
+        return model_response(UserProfile.from_orm(updated_user))
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -46,7 +47,7 @@ async def update_user_profile(
 
 @router.get("/me/notifications")
 async def get_user_notifications(
-    limit: int = 20,
+    limit: int = Query(20, ge=1, le=100),
     offset: int = 0,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
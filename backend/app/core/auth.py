@@ -1,13 +1,18 @@
+import secrets
+import threading
+import time
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Dict, Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, Header, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
 from app.core.database import get_db
+from app.core.otp_store import get_otp_store
 from app.models.user import User
 
 # Password hashing
@@ -49,11 +54,81 @@ def verify_token(token: str) -> Optional[dict]:
         return None
 
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
-    """Get current authenticated user"""
+@dataclass(frozen=True)
+class UserPrincipal:
+    """
+    Immutable snapshot of the user fields endpoints read on every request
+    """
+    id: int
+    phone_number: str
+    name: str
+    state: str
+    district: str
+    farm_size: Optional[float]
+    primary_crops: Optional[str]
+    preferred_language: str
+    is_active: bool
+    is_verified: bool
+
+    @classmethod
+    def from_user(cls, user: User) -> "UserPrincipal":
+        return cls(
+            id=user.id,
+            phone_number=user.phone_number,
+            name=user.name,
+            state=user.state,
+            district=user.district,
+            farm_size=user.farm_size,
+            primary_crops=user.primary_crops,
+            preferred_language=user.preferred_language,
+            is_active=user.is_active,
+            is_verified=user.is_verified
+        )
+
+
+class PrincipalCache:
+    """
+    Short-TTL, process-local cache of UserPrincipal keyed by user id
+    """
+
+    def __init__(self, ttl_seconds: int, max_entries: int = 10000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: Dict[int, tuple] = {}
+        self._lock = threading.Lock()
+
+    def get(self, user_id: int) -> Optional[UserPrincipal]:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+
+        principal, expires_at = entry
+        if expires_at <= time.monotonic():
+            self.invalidate(user_id)
+            return None
+        return principal
+
+    def put(self, principal: UserPrincipal) -> None:
+        if self.ttl_seconds <= 0:
+            return
+
+        now = time.monotonic()
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                expired = [key for key, (_, expires_at) in self._entries.items() if expires_at <= now]
+                for key in expired or list(self._entries)[:self.max_entries // 10]:
+                    del self._entries[key]
+            self._entries[principal.id] = (principal, now + self.ttl_seconds)
+
+    def invalidate(self, user_id: int) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+
+principal_cache = PrincipalCache(settings.PRINCIPAL_CACHE_TTL_SECONDS)
+
+
+def _get_user_id_from_credentials(credentials: HTTPAuthorizationCredentials) -> int:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -66,27 +141,73 @@ def get_current_user(
         if payload is None:
             raise credentials_exception
         
-        user_id: int = payload.get("sub")
+        user_id = payload.get("sub")
         if user_id is None:
             raise credentials_exception
+        
+        return int(user_id)
             
-    except JWTError:
+    except (JWTError, ValueError):
         raise credentials_exception
-    
+
+
+def _load_user(user_id: int, db: Session) -> User:
     user = db.query(User).filter(User.id == user_id).first()
     if user is None:
-        raise credentials_exception
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return user
+
+
+def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+) -> UserPrincipal:
+    """
+    Get current authenticated user as a cached UserPrincipal snapshot.
+    
+    Use get_current_user_live for endpoints that need the ORM object
+    (fields not in the snapshot, or mutating the user row).
+    """
+    user_id = _get_user_id_from_credentials(credentials)
+    
+    principal = principal_cache.get(user_id)
+    if principal is None:
+        principal = UserPrincipal.from_user(_load_user(user_id, db))
+        principal_cache.put(principal)
     
+    return principal
+
+
+def get_current_user_live(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+) -> User:
+    """Get current authenticated user as a live ORM object (always queries)"""
+    user = _load_user(_get_user_id_from_credentials(credentials), db)
+    principal_cache.put(UserPrincipal.from_user(user))
     return user
 
 
-def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
+def get_current_active_user(current_user: UserPrincipal = Depends(get_current_user)) -> UserPrincipal:
     """Get current active user"""
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
 
 
+def require_admin_api_key(x_admin_api_key: Optional[str] = Header(None)) -> None:
+    """Guard operator endpoints with the X-Admin-Api-Key header (disabled unless ADMIN_API_KEY is set)"""
+    if not settings.ADMIN_API_KEY:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin API is disabled")
+    
+    if not x_admin_api_key or not secrets.compare_digest(x_admin_api_key, settings.ADMIN_API_KEY):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid admin API key")
+
+
 # OTP-based authentication for phone numbers
 def generate_otp() -> str:
     """Generate 6-digit OTP"""
@@ -99,42 +220,42 @@ def verify_otp(provided_otp: str, stored_otp: str) -> bool:
     return provided_otp == stored_otp
 
 
-# Simple in-memory OTP storage (in production, use Redis)
-otp_storage = {}
+# OTP storage (in-memory or Redis, see OTP_STORE_BACKEND)
+otp_store = get_otp_store()
 
 
 def store_otp(phone_number: str, otp: str):
     """Store OTP for phone number"""
-    otp_storage[phone_number] = {
-        "otp": otp,
-        "timestamp": datetime.utcnow(),
-        "attempts": 0
-    }
+    otp_store.store(phone_number, otp)
 
 
 def get_stored_otp(phone_number: str) -> Optional[dict]:
     """Get stored OTP for phone number"""
-    return otp_storage.get(phone_number)
+    return otp_store.get(phone_number)
 
 
 def increment_otp_attempts(phone_number: str):
     """Increment OTP verification attempts"""
-    if phone_number in otp_storage:
-        otp_storage[phone_number]["attempts"] += 1
+    otp_store.increment_attempts(phone_number)
+
+
+def delete_otp(phone_number: str):
+    """Remove OTP once it has been used"""
+    otp_store.delete(phone_number)
 
 
 def is_otp_expired(otp_data: dict) -> bool:
-    """Check if OTP is expired (5 minutes)"""
+    """Check if OTP is expired"""
     if not otp_data:
         return True
     
-    expiry_time = otp_data["timestamp"] + timedelta(minutes=5)
+    expiry_time = otp_data["timestamp"] + timedelta(minutes=settings.OTP_EXPIRE_MINUTES)
     return datetime.utcnow() > expiry_time
 
 
 def is_otp_max_attempts_reached(otp_data: dict) -> bool:
-    """Check if maximum OTP attempts reached (3 attempts)"""
+    """Check if maximum OTP attempts reached"""
     if not otp_data:
         return True
     
-    return otp_data["attempts"] >= 3
+    return otp_data["attempts"] >= settings.OTP_MAX_ATTEMPTS
@@ -13,10 +13,26 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str = "sqlite:///./smart_crop_advisory.db"
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: int = 30  # seconds to wait for a connection
+    DB_POOL_RECYCLE: int = 1800  # seconds before a connection is replaced
+    DB_POOL_PRE_PING: bool = True
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_CACHE_SIZE_KB: int = 64000
+    SQLITE_MMAP_SIZE: int = 268435456  # 256MB
+    QUERY_COUNT_HEADER: bool = False  # add X-Query-Count to responses (debugging N+1 loads)
     
     # Security
     SECRET_KEY: str = "your-secret-key-change-in-production"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 30  # 0 disables the authenticated-user cache
+    ADMIN_API_KEY: Optional[str] = None  # X-Admin-Api-Key for operator endpoints; unset disables them
+    
+    # OTP
+    OTP_STORE_BACKEND: str = "memory"  # memory, redis
+    OTP_EXPIRE_MINUTES: int = 5
+    OTP_MAX_ATTEMPTS: int = 3
     
     # AI Services
     OPENAI_API_KEY: Optional[str] = None
@@ -34,6 +50,36 @@ class Settings(BaseSettings):
     WHATSAPP_ACCESS_TOKEN: Optional[str] = None
     WHATSAPP_PHONE_NUMBER_ID: Optional[str] = None
     
+    # Notification dispatch
+    TWILIO_API_BASE_URL: str = "https://api.twilio.com"
+    WHATSAPP_API_BASE_URL: str = "https://graph.facebook.com/v17.0"
+    NOTIFICATION_MAX_CONCURRENCY: int = 100
+    NOTIFICATION_MAX_RETRIES: int = 3
+    NOTIFICATION_RETRY_BASE_DELAY: float = 0.5  # seconds
+    NOTIFICATION_HTTP_TIMEOUT: float = 10.0  # seconds
+    TWILIO_RATE_LIMIT_PER_SECOND: float = 30.0
+    TWILIO_NOTIFY_SERVICE_SID: Optional[str] = None  # enables bulk SMS through Twilio Notify
+    TWILIO_NOTIFY_BASE_URL: str = "https://notify.twilio.com"
+    TWILIO_NOTIFY_BATCH_SIZE: int = 10000
+    WHATSAPP_RATE_LIMIT_PER_SECOND: float = 80.0
+    
+    NOTIFICATION_PREFERENCE_CACHE_TTL: int = 300  # seconds
+    
+    # Notification outbox worker
+    NOTIFICATION_OUTBOX_ENABLED: bool = False  # run the worker inside the API process
+    NOTIFICATION_OUTBOX_BATCH_SIZE: int = 500
+    NOTIFICATION_OUTBOX_POLL_INTERVAL: float = 5.0  # seconds
+    NOTIFICATION_OUTBOX_LEASE_SECONDS: int = 300
+    
+    # Market prices
+    MARKET_INGEST_BATCH_SIZE: int = 5000  # rows per upsert batch / transaction
+    MARKET_TREND_CACHE_TTL: int = 300  # seconds; bounds staleness after ingests in other processes
+    MARKET_FORECAST_HISTORY_DAYS: int = 120  # days of daily prices each forecast is fitted on
+    MARKET_FORECAST_HORIZON_DAYS: int = 14
+    MARKET_FORECAST_WORKERS: Optional[int] = None  # forecast job processes; defaults to CPU count
+    MARKET_DIRECTORY_CACHE_TTL: int = 300  # seconds; picks up markets ingested by other processes
+    MARKET_EXPORT_DIR: str = "exports/market_history"  # Parquet dataset for /market/analytics
+    
     # Redis (for caching)
     REDIS_URL: str = "redis://localhost:6379"
     
@@ -0,0 +1,186 @@
+"""
+Geohash cells and great-circle distances for nearby-shop lookups.
+
+Shops store a full-precision geohash, so every cell that contains a shop
+is a prefix of its geohash and a cell is a contiguous range of the
+geohash index. A radius query becomes: bounding box -> the few cells
+covering it -> index range scans -> exact haversine on the candidates.
+"""
+
+import math
+from typing import List, Optional, Tuple
+
+from sqlalchemy import and_, or_
+from sqlalchemy.sql.elements import ColumnElement
+
+EARTH_RADIUS_KM = 6371.0088  # mean radius
+
+GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+GEOHASH_PRECISION = 12  # stored precision (~4cm cells)
+
+# Most cells a radius query is covered by; coarser cells are used instead
+# of more of them, trading a few extra candidates for fewer range scans
+MAX_COVERING_CELLS = 16
+
+
+def encode_geohash(latitude: float, longitude: float, precision: int = GEOHASH_PRECISION) -> str:
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    value = 0
+    even = True  # bits alternate longitude, latitude, starting with longitude
+    while len(chars) < precision:
+        interval, coordinate = (lon_range, longitude) if even else (lat_range, latitude)
+        middle = (interval[0] + interval[1]) / 2
+        value <<= 1
+        if coordinate >= middle:
+            value |= 1
+            interval[0] = middle
+        else:
+            interval[1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(GEOHASH_ALPHABET[value])
+            bits = 0
+            value = 0
+    return "".join(chars)
+
+
+def _cell_geohash(lat_index: int, lon_index: int, precision: int) -> str:
+    """Geohash of the cell at (row, column) of the precision's grid"""
+    total_bits = 5 * precision
+    lon_bits = (total_bits + 1) // 2
+    lat_bits = total_bits // 2
+    value = 0
+    for bit in range(total_bits):
+        # Even bits (from the most significant) come from longitude
+        if bit % 2 == 0:
+            value = (value << 1) | ((lon_index >> (lon_bits - 1 - bit // 2)) & 1)
+        else:
+            value = (value << 1) | ((lat_index >> (lat_bits - 1 - bit // 2)) & 1)
+    return "".join(GEOHASH_ALPHABET[(value >> shift) & 31] for shift in range(total_bits - 5, -5, -5))
+
+
+def _grid(precision: int) -> Tuple[int, int]:
+    """(latitude rows, longitude columns) of the geohash grid at a precision"""
+    total_bits = 5 * precision
+    return 1 << (total_bits // 2), 1 << ((total_bits + 1) // 2)
+
+
+def haversine_km(latitude1: float, longitude1: float, latitude2: float, longitude2: float) -> float:
+    phi1 = math.radians(latitude1)
+    phi2 = math.radians(latitude2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(longitude2 - longitude1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def bounding_boxes(latitude: float, longitude: float, radius_km: float) -> List[Tuple[float, float, float, float]]:
+    """
+    (min_lat, max_lat, min_lon, max_lon) boxes containing every point within
+    radius_km: one box, or two when the circle crosses the antimeridian.
+    Circles reaching a pole span every longitude.
+    """
+    angular = radius_km / EARTH_RADIUS_KM
+    min_lat = latitude - math.degrees(angular)
+    max_lat = latitude + math.degrees(angular)
+    if min_lat <= -90 or max_lat >= 90:
+        return [(max(min_lat, -90.0), min(max_lat, 90.0), -180.0, 180.0)]
+
+    # Widest longitude offset of the circle (at the tangent latitude, not the centre's)
+    ratio = math.sin(angular) / math.cos(math.radians(latitude))
+    if ratio >= 1:
+        return [(min_lat, max_lat, -180.0, 180.0)]
+    d_lon = math.degrees(math.asin(ratio))
+    min_lon = longitude - d_lon
+    max_lon = longitude + d_lon
+    if min_lon < -180:
+        return [(min_lat, max_lat, min_lon + 360, 180.0), (min_lat, max_lat, -180.0, max_lon)]
+    if max_lon > 180:
+        return [(min_lat, max_lat, min_lon, 180.0), (min_lat, max_lat, -180.0, max_lon - 360)]
+    return [(min_lat, max_lat, min_lon, max_lon)]
+
+
+def _covering_cells(boxes: List[Tuple[float, float, float, float]], precision: int) -> set:
+    rows, columns = _grid(precision)
+    cells = set()
+    for min_lat, max_lat, min_lon, max_lon in boxes:
+        first_row = min(int((min_lat + 90) / 180 * rows), rows - 1)
+        last_row = min(int((max_lat + 90) / 180 * rows), rows - 1)
+        first_column = min(int((min_lon + 180) / 360 * columns), columns - 1)
+        last_column = min(int((max_lon + 180) / 360 * columns), columns - 1)
+        for row in range(first_row, last_row + 1):
+            for column in range(first_column, last_column + 1):
+                cells.add(_cell_geohash(row, column, precision))
+    return cells
+
+
+def _next_geohash(cell: str) -> Optional[str]:
+    """Smallest geohash of the same length after every geohash prefixed by cell (None past the last)"""
+    chars = list(cell)
+    for position in range(len(chars) - 1, -1, -1):
+        index = GEOHASH_ALPHABET.index(chars[position])
+        if index < len(GEOHASH_ALPHABET) - 1:
+            chars[position] = GEOHASH_ALPHABET[index + 1]
+            return "".join(chars)
+        chars[position] = GEOHASH_ALPHABET[0]
+    return None
+
+
+def covering_ranges(
+    boxes: List[Tuple[float, float, float, float]],
+    max_cells: int = MAX_COVERING_CELLS
+) -> List[Tuple[str, Optional[str]]]:
+    """
+    Half-open [start, end) geohash ranges covering the boxes, from the finest
+    precision needing at most max_cells cells; adjacent cells are merged.
+    end is None for a range running to the end of the index.
+    """
+    cells = {""}
+    for precision in range(1, GEOHASH_PRECISION + 1):
+        finer = _covering_cells(boxes, precision)
+        if len(finer) > max_cells:
+            break
+        cells = finer
+
+    ranges: List[Tuple[str, Optional[str]]] = []
+    for cell in sorted(cells):
+        end = _next_geohash(cell) if cell else None
+        if ranges and ranges[-1][1] == cell:
+            ranges[-1] = (ranges[-1][0], end)
+        else:
+            ranges.append((cell, end))
+    return ranges
+
+
+def nearby_filter(
+    geohash_column,
+    latitude_column,
+    longitude_column,
+    latitude: float,
+    longitude: float,
+    radius_km: float,
+    *index_conditions: ColumnElement
+) -> ColumnElement:
+    """
+    Candidates for a radius query: rows in the covering geohash ranges
+    (index range scans) and inside the exact bounding boxes. Rank the
+    candidates with haversine_km: the corners of each box lie outside the radius.
+
+    index_conditions are equality conditions on the columns before geohash
+    in its index. They are repeated inside every range, otherwise SQLite
+    scans the whole prefix instead of one range per cell.
+    """
+    boxes = bounding_boxes(latitude, longitude, radius_km)
+    in_cells = [
+        and_(*index_conditions, geohash_column >= start, *([geohash_column < end] if end is not None else []))
+        for start, end in covering_ranges(boxes)
+    ]
+    in_boxes = [
+        and_(latitude_column.between(min_lat, max_lat), longitude_column.between(min_lon, max_lon))
+        for min_lat, max_lat, min_lon, max_lon in boxes
+    ]
+    return and_(or_(*in_cells), or_(*in_boxes))
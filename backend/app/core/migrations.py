@@ -0,0 +1,38 @@
+import os
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect
+
+from app.core.database import engine
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Revision matching the schema that Base.metadata.create_all used to build
+BASELINE_REVISION = "0001"
+
+
+def get_alembic_config() -> Config:
+    config = Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(BACKEND_DIR, "alembic"))
+    config.attributes["configure_logger"] = False
+    return config
+
+
+def run_migrations(revision: str = "head", bind=None) -> None:
+    """
+    Upgrade the database (the app engine unless another engine is given).
+
+    Databases created by the old create_all() startup have tables but no
+    alembic_version; they are stamped at the baseline before upgrading.
+    """
+    config = get_alembic_config()
+
+    with (bind or engine).begin() as connection:
+        config.attributes["connection"] = connection
+
+        tables = inspect(connection).get_table_names()
+        if "users" in tables and "alembic_version" not in tables:
+            command.stamp(config, BASELINE_REVISION)
+
+        command.upgrade(config, revision)
@@ -0,0 +1,131 @@
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Optional
+
+from app.core.config import settings
+
+
+class InMemoryOTPStore:
+    """
+    Process-local OTP store with TTL eviction.
+
+    Only suitable for a single worker process; use RedisOTPStore when running
+    several uvicorn workers.
+    """
+
+    def __init__(self, ttl_seconds: int, sweep_interval: int = 60):
+        self.ttl_seconds = ttl_seconds
+        self.sweep_interval = sweep_interval
+        self._entries: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+        self._last_sweep = time.monotonic()
+
+    def store(self, phone_number: str, otp: str) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._entries[phone_number] = (
+                {"otp": otp, "timestamp": datetime.utcnow(), "attempts": 0},
+                now + self.ttl_seconds
+            )
+            if now - self._last_sweep >= self.sweep_interval:
+                self._sweep(now)
+
+    def get(self, phone_number: str) -> Optional[dict]:
+        with self._lock:
+            entry = self._entries.get(phone_number)
+            if entry is None:
+                return None
+
+            data, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[phone_number]
+                return None
+            return dict(data)
+
+    def increment_attempts(self, phone_number: str) -> Optional[int]:
+        with self._lock:
+            entry = self._entries.get(phone_number)
+            if entry is None or entry[1] <= time.monotonic():
+                return None
+
+            entry[0]["attempts"] += 1
+            return entry[0]["attempts"]
+
+    def delete(self, phone_number: str) -> None:
+        with self._lock:
+            self._entries.pop(phone_number, None)
+
+    def _sweep(self, now: float) -> None:
+        expired = [key for key, (_, expires_at) in self._entries.items() if expires_at <= now]
+        for key in expired:
+            del self._entries[key]
+        self._last_sweep = now
+
+
+class RedisOTPStore:
+    """
+    Redis-backed OTP store shared by all worker processes.
+
+    Each OTP is a hash under otp:<phone> with a native key expiry; attempts
+    are incremented atomically and never resurrect an expired key.
+    """
+
+    # HINCRBY only if the key still exists, so an increment racing expiry
+    # cannot recreate the hash without a TTL
+    INCREMENT_SCRIPT = """
+    if redis.call('EXISTS', KEYS[1]) == 1 then
+        return redis.call('HINCRBY', KEYS[1], 'attempts', 1)
+    end
+    return nil
+    """
+
+    def __init__(self, redis_url: str, ttl_seconds: int, key_prefix: str = "otp:"):
+        import redis
+
+        self.client = redis.Redis.from_url(redis_url, decode_responses=True)
+        self.ttl_seconds = ttl_seconds
+        self.key_prefix = key_prefix
+        self._increment = self.client.register_script(self.INCREMENT_SCRIPT)
+
+    def _key(self, phone_number: str) -> str:
+        return f"{self.key_prefix}{phone_number}"
+
+    def store(self, phone_number: str, otp: str) -> None:
+        key = self._key(phone_number)
+        pipe = self.client.pipeline(transaction=True)
+        pipe.delete(key)
+        pipe.hset(key, mapping={
+            "otp": otp,
+            "timestamp": datetime.utcnow().isoformat(),
+            "attempts": 0
+        })
+        pipe.expire(key, self.ttl_seconds)
+        pipe.execute()
+
+    def get(self, phone_number: str) -> Optional[dict]:
+        data = self.client.hgetall(self._key(phone_number))
+        if not data:
+            return None
+
+        return {
+            "otp": data["otp"],
+            "timestamp": datetime.fromisoformat(data["timestamp"]),
+            "attempts": int(data.get("attempts", 0))
+        }
+
+    def increment_attempts(self, phone_number: str) -> Optional[int]:
+        attempts = self._increment(keys=[self._key(phone_number)])
+        return int(attempts) if attempts is not None else None
+
+    def delete(self, phone_number: str) -> None:
+        self.client.delete(self._key(phone_number))
+
+
+def get_otp_store():
+    """Build the OTP store configured by OTP_STORE_BACKEND"""
+    ttl_seconds = settings.OTP_EXPIRE_MINUTES * 60
+
+    if settings.OTP_STORE_BACKEND == "redis":
+        return RedisOTPStore(settings.REDIS_URL, ttl_seconds)
+    return InMemoryOTPStore(ttl_seconds)
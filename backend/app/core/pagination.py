@@ -0,0 +1,108 @@
+"""
+Keyset (cursor) pagination helpers.
+
+A cursor is an opaque URL-safe token holding the sort key and id of the last
+row of a page. The next page starts strictly after that row via an indexed
+range condition instead of OFFSET, so page 100 costs the same as page 1.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import DateTime, and_, func, or_, literal
+
+from app.core.database import engine
+
+
+def encode_cursor(sort_value: Any, row_id: int) -> str:
+    """Encode (sort key, id) of the last row on a page into an opaque cursor"""
+    if isinstance(sort_value, datetime):
+        payload = {"t": "dt", "v": sort_value.isoformat(), "i": row_id}
+    else:
+        payload = {"v": sort_value, "i": row_id}
+
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Any, int]:
+    """Decode a cursor produced by encode_cursor; raises 400 if it is malformed"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        sort_value = payload.get("v")
+        if payload.get("t") == "dt":
+            sort_value = datetime.fromisoformat(sort_value)
+        return sort_value, int(payload["i"])
+    except (ValueError, KeyError, TypeError, AttributeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def _after(sort_column, id_column, sort_value, row_id: int, descending: bool):
+    if sort_column is None:
+        return id_column < row_id if descending else id_column > row_id
+
+    # One literal bound through the column's type, so it is written exactly
+    # as values written from Python are stored
+    value = literal(sort_value, sort_column.type)
+    if (
+        engine.dialect.name == "sqlite"
+        and isinstance(sort_column.type, DateTime)
+        and sort_column.server_default is not None
+    ):
+        # SQLite stores server-default timestamps as CURRENT_TIMESTAMP text
+        # (no fractional seconds); datetime() renders the cursor the same way
+        value = func.datetime(value)
+
+    # The redundant outer bound lets the planner seek into the sort index
+    # instead of scanning past every row that came before the cursor
+    if descending:
+        return and_(sort_column <= value, or_(sort_column < value, and_(sort_column == value, id_column < row_id)))
+    return and_(sort_column >= value, or_(sort_column > value, and_(sort_column == value, id_column > row_id)))
+
+
+def keyset_paginate(
+    query,
+    id_column,
+    cursor: Optional[str],
+    limit: int,
+    sort_column=None,
+    descending: bool = True
+):
+    """
+    Order a select()/Query by (sort_column, id_column), continue after the
+    cursor row and fetch one extra row so next_page can tell if more exist.
+
+    Without a sort_column the query is paged by id alone.
+    """
+    if cursor:
+        sort_value, row_id = decode_cursor(cursor)
+        query = query.where(_after(sort_column, id_column, sort_value, row_id, descending))
+
+    order_by = [id_column.desc() if descending else id_column.asc()]
+    if sort_column is not None:
+        order_by.insert(0, sort_column.desc() if descending else sort_column.asc())
+
+    return query.order_by(*order_by).limit(limit + 1)
+
+
+def next_page(rows: List[Any], limit: int, sort_attr: Optional[str] = None, id_attr: str = "id"):
+    """
+    Trim the look-ahead row from a keyset page and build the cursor for the
+    following page (None on the last page)
+    """
+    if limit <= 0 or not rows:
+        return [], None
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    sort_value = getattr(last, sort_attr) if sort_attr else None
+    return rows, encode_cursor(sort_value, getattr(last, id_attr))
@@ -0,0 +1,33 @@
+"""
+Column-projected read helpers for list endpoints.
+
+Selecting explicit columns returns plain Core Row tuples: no identity map,
+no attribute instrumentation and no unused Text blobs are loaded, which is
+where most per-row cost goes when a page only needs a handful of fields.
+"""
+
+from typing import Any, Dict, Iterable, List
+
+
+def labeled(prefix: str, *columns) -> List[Any]:
+    """Label columns as <prefix>__<name> so rows_to_dicts can nest them"""
+    return [column.label(f"{prefix}__{column.key}") for column in columns]
+
+
+def row_to_dict(row) -> Dict[str, Any]:
+    """
+    Convert a Row to a dict, folding <prefix>__<name> columns into a nested
+    dict under <prefix>
+    """
+    data: Dict[str, Any] = {}
+    for key, value in row._mapping.items():
+        prefix, sep, name = key.partition("__")
+        if sep:
+            data.setdefault(prefix, {})[name] = value
+        else:
+            data[key] = value
+    return data
+
+
+def rows_to_dicts(rows: Iterable[Any]) -> List[Dict[str, Any]]:
+    return [row_to_dict(row) for row in rows]
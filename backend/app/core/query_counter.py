@@ -0,0 +1,52 @@
+"""
+Per-request SQL statement counting.
+
+Listens on the engines' before_cursor_execute event and attributes each
+statement to the QueryCounter active in the current context, which makes
+N+1 relationship loads visible in tests and (opt-in) as an X-Query-Count
+response header.
+"""
+
+from contextvars import ContextVar
+from typing import List, Optional
+
+from sqlalchemy import event
+
+
+_active_counter: ContextVar[Optional["QueryCounter"]] = ContextVar("active_query_counter", default=None)
+
+
+class QueryCounter:
+    """
+    Context manager counting the SQL statements executed inside it:
+
+        with QueryCounter() as counter:
+            ...
+        print(counter.count)
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.statements: List[str] = []
+        self._token = None
+
+    def __enter__(self) -> "QueryCounter":
+        self._token = _active_counter.set(self)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        _active_counter.reset(self._token)
+
+
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    counter = _active_counter.get()
+    if counter is not None:
+        counter.count += 1
+        counter.statements.append(statement)
+
+
+def install_query_counter(*engines) -> None:
+    """Attach the counting listener to the given (sync) engines once"""
+    for engine in engines:
+        if not event.contains(engine, "before_cursor_execute", _count_statement):
+            event.listen(engine, "before_cursor_execute", _count_statement)
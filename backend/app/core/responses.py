@@ -0,0 +1,58 @@
+"""
+orjson-based JSON responses.
+
+FastJSONResponse is the app-wide default response class. Endpoints that
+return large pages should return it directly: FastAPI then skips
+jsonable_encoder (and response_model validation) and orjson serializes
+datetimes, dates and UUIDs natively.
+"""
+
+from decimal import Decimal
+from typing import Any, Optional
+
+import orjson
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel
+
+
+def _default(value: Any) -> Any:
+    """Types orjson does not handle natively, encoded like jsonable_encoder"""
+    if isinstance(value, Decimal):
+        # Same rule as FastAPI's decimal_encoder: integral -> int, else float
+        return int(value) if value.as_tuple().exponent >= 0 else float(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class FastJSONResponse(JSONResponse):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def model_response(model: BaseModel, status_code: int = 200) -> Response:
+    """
+    Return an already-validated Pydantic model without FastAPI validating it
+    a second time against the route's response_model
+    """
+    return Response(
+        content=model.model_dump_json(),
+        status_code=status_code,
+        media_type="application/json"
+    )
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header covers etag (weak comparison, as RFC 9110 requires)"""
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or etag.removeprefix("W/") in (candidate.removeprefix("W/") for candidate in candidates)
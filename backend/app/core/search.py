@@ -0,0 +1,169 @@
+"""
+Name search for the crop, market and product filters.
+
+Filtering the large tables with ilike('%term%') scans every row: no index
+serves a leading wildcard. Instead every distinct name is stored once in
+search_names (kept current by triggers on the source tables, see migration
+0006) and the term is matched there - through the FTS5 trigram table on
+SQLite, or the pg_trgm GIN index on PostgreSQL. The large table then
+filters by the matching names, which its ordinary indexes serve.
+
+Terms are expanded through TRANSLITERATIONS first, so a farmer typing the
+local name in Latin or native script ("gehun", "गेहूं", "ਕਣਕ") finds Wheat.
+"""
+
+from typing import List
+
+from sqlalchemy import Select, column, or_, select, table, true
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.core.database import engine
+from app.models.search import SearchName
+
+
+# search_names kinds: crop, market, product. Market names are not
+# transliterated ("tur" must not turn a market search into arhar)
+TRANSLITERATED_KINDS = ("crop", "product")
+
+# Trigram indexes only answer terms of 3+ characters; shorter ones fall
+# back to LIKE over search_names (a few thousand rows, not millions)
+MIN_TRIGRAM_LENGTH = 3
+
+# Beyond this many matching names, filter by the matching_names subquery
+# instead of a bound IN list
+MAX_RESOLVED_NAMES = 500
+
+# Local crop names (romanised Hindi/Punjabi, Devanagari, Gurmukhi and common
+# trade names) -> the English name used in market_prices and crops
+TRANSLITERATIONS = {
+    # Wheat
+    "gehun": "wheat", "gehu": "wheat", "gehoon": "wheat", "gahu": "wheat", "kanak": "wheat",
+    "गेहूं": "wheat", "गेहूँ": "wheat", "ਕਣਕ": "wheat",
+    # Rice / paddy
+    "chawal": "rice", "chaval": "rice", "dhan": "rice", "dhaan": "rice", "paddy": "rice", "jhona": "rice",
+    "चावल": "rice", "धान": "rice", "ਚੌਲ": "rice", "ਝੋਨਾ": "rice",
+    # Maize
+    "makka": "maize", "makki": "maize", "makkai": "maize", "corn": "maize",
+    "मक्का": "maize", "ਮੱਕੀ": "maize",
+    # Millets and sorghum
+    "bajra": "bajra", "bajri": "bajra", "बाजरा": "bajra", "ਬਾਜਰਾ": "bajra",
+    "jowar": "jowar", "jwar": "jowar", "ज्वार": "jowar",
+    "ragi": "ragi", "nachni": "ragi", "mandua": "ragi",
+    # Pulses
+    "chana": "gram", "chickpea": "gram", "चना": "gram", "ਛੋਲੇ": "gram",
+    "arhar": "arhar", "tur": "arhar", "toor": "arhar", "अरहर": "arhar",
+    "moong": "moong", "mung": "moong", "मूंग": "moong",
+    "urad": "urad", "udad": "urad", "उड़द": "urad",
+    "masoor": "masoor", "masur": "masoor", "मसूर": "masoor",
+    # Oilseeds
+    "sarson": "mustard", "sarso": "mustard", "rai": "mustard", "सरसों": "mustard", "ਸਰ੍ਹੋਂ": "mustard",
+    "moongphali": "groundnut", "mungfali": "groundnut", "मूंगफली": "groundnut",
+    "soyabean": "soybean", "सोयाबीन": "soybean",
+    "til": "sesamum", "तिल": "sesamum",
+    # Fibre and cash crops
+    "kapas": "cotton", "narma": "cotton", "कपास": "cotton", "ਕਪਾਹ": "cotton", "ਨਰਮਾ": "cotton",
+    "ganna": "sugarcane", "ganne": "sugarcane", "गन्ना": "sugarcane", "ਗੰਨਾ": "sugarcane",
+    # Vegetables
+    "aloo": "potato", "alu": "potato", "आलू": "potato", "ਆਲੂ": "potato",
+    "pyaz": "onion", "pyaaz": "onion", "kanda": "onion", "प्याज": "onion", "ਪਿਆਜ਼": "onion",
+    "tamatar": "tomato", "टमाटर": "tomato", "ਟਮਾਟਰ": "tomato",
+    "mirch": "chilli", "mirchi": "chilli", "मिर्च": "chilli",
+    "bhindi": "bhindi", "okra": "bhindi", "भिंडी": "bhindi",
+    "baingan": "brinjal", "bengan": "brinjal", "बैंगन": "brinjal",
+    "gobhi": "cauliflower", "phool gobhi": "cauliflower", "फूलगोभी": "cauliflower",
+    "patta gobhi": "cabbage", "bandh gobhi": "cabbage", "पत्ता गोभी": "cabbage",
+    "adrak": "ginger", "अदरक": "ginger",
+    "lahsun": "garlic", "lehsun": "garlic", "लहसुन": "garlic",
+    "haldi": "turmeric", "हल्दी": "turmeric",
+}
+
+_fts = table("search_names_fts", column("rowid"), column("search_names_fts"))
+
+
+def search_terms(term: str, transliterate: bool = True) -> List[str]:
+    """
+    The normalised term plus the English names it transliterates to. A term
+    of 3+ characters also expands through aliases it is a prefix of, so
+    "gehu" already finds Wheat while it is being typed.
+    """
+    term = " ".join(term.split()).lower()
+    if not term:
+        return []
+
+    terms = [term]
+    if not transliterate:
+        return terms
+    for alias, name in TRANSLITERATIONS.items():
+        if alias == term or (len(term) >= MIN_TRIGRAM_LENGTH and alias.startswith(term)):
+            if name not in terms:
+                terms.append(name)
+    return terms
+
+
+def _like_pattern(term: str) -> str:
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _fts_query(terms: List[str]) -> str:
+    """FTS5 query matching any of the terms as a substring (trigram phrases)"""
+    return " OR ".join('"' + term.replace('"', '""') + '"' for term in terms)
+
+
+def matching_names(kind: str, term: str) -> Select:
+    """
+    SELECT of the search_names of this kind containing the term (or one of
+    its transliterations) anywhere, case-insensitively, for use in IN;
+    a blank term selects every name of the kind
+    """
+    terms = search_terms(term, transliterate=kind in TRANSLITERATED_KINDS)
+    query = select(SearchName.name).where(SearchName.kind == kind)
+    if not terms:
+        return query
+
+    if engine.dialect.name == "sqlite":
+        trigram_terms = [item for item in terms if len(item) >= MIN_TRIGRAM_LENGTH]
+        conditions = [
+            SearchName.name.ilike(_like_pattern(item), escape="\\")
+            for item in terms if len(item) < MIN_TRIGRAM_LENGTH
+        ]
+        if trigram_terms:
+            conditions.append(SearchName.id.in_(
+                select(_fts.c.rowid).where(_fts.c.search_names_fts.match(_fts_query(trigram_terms)))
+            ))
+    else:
+        # PostgreSQL serves ILIKE '%term%' from the gin_trgm_ops index
+        conditions = [SearchName.name.ilike(_like_pattern(item), escape="\\") for item in terms]
+
+    return query.where(or_(*conditions))
+
+
+def _in_names(name_column, kind: str, term: str, names: List[str]) -> ColumnElement:
+    if len(names) == 1:
+        # Equality lets a (name, date) index return rows already in page order
+        return name_column == names[0]
+    if len(names) > MAX_RESOLVED_NAMES:
+        return name_column.in_(matching_names(kind, term))
+    return name_column.in_(names)
+
+
+def name_filter(db: Session, name_column, kind: str, term: str) -> ColumnElement:
+    """
+    Replacement for name_column.ilike(f"%{term}%"): resolves the matching
+    names first (one small query), then filters name_column by them so its
+    own index serves the query. A blank term filters nothing.
+    """
+    if not search_terms(term):
+        return true()
+    names = db.execute(matching_names(kind, term).limit(MAX_RESOLVED_NAMES + 1)).scalars().all()
+    return _in_names(name_column, kind, term, names)
+
+
+async def name_filter_async(db: AsyncSession, name_column, kind: str, term: str) -> ColumnElement:
+    """name_filter for AsyncSession callers"""
+    if not search_terms(term):
+        return true()
+    result = await db.execute(matching_names(kind, term).limit(MAX_RESOLVED_NAMES + 1))
+    return _in_names(name_column, kind, term, result.scalars().all())
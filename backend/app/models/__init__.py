@@ -4,9 +4,10 @@ from .soil import SoilType, SoilTest
 from .weather import WeatherData
 from .advisory import Advisory, AdvisoryFeedback
 from .community import CommunityPost, CommunityComment
-from .market import MarketPrice, MarketInsight
+from .market import MarketPrice, Market, MarketPriceDaily, MarketPriceWeekly, MarketInsight, PriceAlert
 from .shop import Shop, ShopInventory
-from .notification import Notification
+from .notification import Notification, NotificationPreference
+from .search import SearchName
 
 __all__ = [
     "User",
@@ -20,8 +21,14 @@ __all__ = [
     "CommunityPost",
     "CommunityComment",
     "MarketPrice",
+    "Market",
+    "MarketPriceDaily",
+    "MarketPriceWeekly",
     "MarketInsight",
+    "PriceAlert",
     "Shop",
     "ShopInventory",
-    "Notification"
+    "Notification",
+    "NotificationPreference",
+    "SearchName"
 ]
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, Float, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, Text, Float, ForeignKey, Boolean, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.core.database import Base
@@ -46,6 +46,11 @@ class Advisory(Base):
     # Relationships
     user = relationship("User", back_populates="advisories")
     feedback = relationship("AdvisoryFeedback", back_populates="advisory")
+    
+    # Per-user feed ordered by recency
+    __table_args__ = (
+        Index("ix_advisories_user_id_created_at", "user_id", "created_at"),
+    )
 
 
 class AdvisoryFeedback(Base):
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Boolean, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.core.database import Base
@@ -43,6 +43,11 @@ class CommunityPost(Base):
     # Relationships
     user = relationship("User", back_populates="community_posts")
     comments = relationship("CommunityComment", back_populates="post")
+    
+    # Approved feed ordered by recency
+    __table_args__ = (
+        Index("ix_community_posts_is_approved_created_at", "is_approved", "created_at"),
+    )
 
 
 class CommunityComment(Base):
@@ -74,3 +79,8 @@ class CommunityComment(Base):
     user = relationship("User")
     parent_comment = relationship("CommunityComment", remote_side=[id])
     replies = relationship("CommunityComment", back_populates="parent_comment")
+    
+    # Comments of a post ordered by time
+    __table_args__ = (
+        Index("ix_community_comments_post_id_created_at", "post_id", "created_at"),
+    )
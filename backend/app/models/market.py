@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, Float, ForeignKey
+from sqlalchemy import Column, Integer, String, Date, DateTime, Text, Float, ForeignKey, Boolean, Index, UniqueConstraint
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.core.database import Base
@@ -11,7 +11,7 @@ class MarketPrice(Base):
     
     # Crop Information
     crop_name = Column(String(100), nullable=False, index=True)
-    variety = Column(String(100), nullable=True)
+    variety = Column(String(100), nullable=False, default="Other")
     
     # Location Information
     market_name = Column(String(100), nullable=False)
@@ -36,10 +36,93 @@ class MarketPrice(Base):
     
     # Index for efficient querying
     __table_args__ = (
+        Index("ix_market_prices_crop_name_price_date", "crop_name", "price_date"),
+        Index("ix_market_prices_state_district_price_date", "state", "district", "price_date"),
+        Index("ix_market_prices_price_date", "price_date"),
+        # Natural key the ingest upserts on (variety is NOT NULL, so every row is covered)
+        Index(
+            "uq_market_prices_natural_key",
+            "crop_name", "variety", "market_name", "state", "district", "price_date",
+            unique=True
+        ),
         {"extend_existing": True}
     )
 
 
+class Market(Base):
+    # Every (market, state, district) seen in market_prices; added at ingest
+    __tablename__ = "markets"
+
+    id = Column(Integer, primary_key=True, index=True)
+    market_name = Column(String(100), nullable=False)
+    state = Column(String(50), nullable=False)
+    district = Column(String(50), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    __table_args__ = (
+        # Also the order the market directory is loaded in
+        UniqueConstraint("state", "district", "market_name", name="uq_markets_state_district_market_name"),
+    )
+
+
+class PriceRollupColumns:
+    """
+    Aggregates shared by the daily and weekly market price rollups.
+
+    Sums and counts (rather than averages) are stored so new prices can be
+    folded in incrementally; averages are sum / count at read time.
+    """
+    id = Column(Integer, primary_key=True, index=True)
+    
+    # Rollup key (plus the bucket date column on each table)
+    crop_name = Column(String(100), nullable=False)
+    market_name = Column(String(100), nullable=False)
+    state = Column(String(50), nullable=False)
+    district = Column(String(50), nullable=False)
+    
+    # Aggregates
+    min_price = Column(Float, nullable=False)  # lowest min_price in the bucket
+    max_price = Column(Float, nullable=False)  # highest max_price in the bucket
+    min_price_sum = Column(Float, nullable=False, default=0)
+    max_price_sum = Column(Float, nullable=False, default=0)
+    modal_price_sum = Column(Float, nullable=False, default=0)
+    modal_price_count = Column(Integer, nullable=False, default=0)  # records with a modal price
+    record_count = Column(Integer, nullable=False, default=0)
+    arrival_quantity_sum = Column(Float, nullable=False, default=0)
+    
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class MarketPriceDaily(PriceRollupColumns, Base):
+    __tablename__ = "market_price_daily"
+
+    price_date = Column(Date, nullable=False)
+    
+    __table_args__ = (
+        UniqueConstraint(
+            "crop_name", "market_name", "state", "district", "price_date",
+            name="uq_market_price_daily_key"
+        ),
+        Index("ix_market_price_daily_crop_name_price_date", "crop_name", "price_date"),
+        Index("ix_market_price_daily_price_date", "price_date"),
+    )
+
+
+class MarketPriceWeekly(PriceRollupColumns, Base):
+    __tablename__ = "market_price_weekly"
+
+    week_start = Column(Date, nullable=False)  # Monday
+    
+    __table_args__ = (
+        UniqueConstraint(
+            "crop_name", "market_name", "state", "district", "week_start",
+            name="uq_market_price_weekly_key"
+        ),
+        Index("ix_market_price_weekly_crop_name_week_start", "crop_name", "week_start"),
+        Index("ix_market_price_weekly_week_start", "week_start"),
+    )
+
+
 class MarketInsight(Base):
     __tablename__ = "market_insights"
 
@@ -77,3 +160,37 @@ class MarketInsight(Base):
     
     # Relationships
     user = relationship("User")
+    
+    __table_args__ = (
+        # /market/insights: newest first, optionally for one crop
+        Index("ix_market_insights_created_at", "created_at"),
+        Index("ix_market_insights_crop_name_created_at", "crop_name", "created_at"),
+    )
+
+
+class PriceAlert(Base):
+    __tablename__ = "price_alerts"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    
+    # What to watch (names normalized like ingested prices)
+    crop_name = Column(String(100), nullable=False)
+    market_name = Column(String(100), nullable=True)  # None matches every market
+    
+    # Fires once when a market price crosses target_price in this direction
+    alert_type = Column(String(10), nullable=False)  # above, below
+    target_price = Column(Float, nullable=False)  # per quintal
+    
+    # Status
+    is_active = Column(Boolean, default=True, nullable=False)
+    triggered_at = Column(DateTime(timezone=True), nullable=True)
+    
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    __table_args__ = (
+        Index("ix_price_alerts_user_id_created_at", "user_id", "created_at"),
+        # Incremental loads of new alerts into the in-memory matcher
+        Index("ix_price_alerts_is_active_id", "is_active", "id"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Boolean, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.core.database import Base
@@ -29,6 +29,10 @@ class Notification(Base):
     sent_at = Column(DateTime(timezone=True), nullable=True)
     delivered_at = Column(DateTime(timezone=True), nullable=True)
     
+    # Outbox leasing (see app.workers.notification_outbox)
+    lease_owner = Column(String(64), nullable=True)
+    lease_expires_at = Column(DateTime(timezone=True), nullable=True)
+    
     # User Interaction
     is_read = Column(Boolean, default=False)
     is_acknowledged = Column(Boolean, default=False)
@@ -48,3 +52,38 @@ class Notification(Base):
     
     # Relationships
     user = relationship("User", back_populates="notifications")
+    
+    # Index for the outbox worker's due-notification poll
+    __table_args__ = (
+        Index("ix_notifications_delivery_status_scheduled_at", "delivery_status", "scheduled_at"),
+        Index("ix_notifications_user_id_created_at", "user_id", "created_at"),
+        Index("ix_notifications_user_id_is_read_created_at", "user_id", "is_read", "created_at"),
+    )
+
+
+class NotificationPreference(Base):
+    """
+    Typed copy of users.notification_preferences used for routing sends
+    without parsing JSON (see app.services.notification_preference_service)
+    """
+    __tablename__ = "notification_preferences"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    
+    # Routing
+    delivery_method = Column(String(20), nullable=False, default="sms")  # sms, whatsapp
+    language = Column(String(5), nullable=True)  # overrides users.preferred_language
+    
+    # Quiet hours (local hour of day, 0-23; the window may wrap midnight)
+    quiet_hours_start = Column(Integer, nullable=True)
+    quiet_hours_end = Column(Integer, nullable=True)
+    
+    # Opt-outs
+    is_opted_out = Column(Boolean, default=False)
+    opted_out_types = Column(String(200), nullable=True)  # comma-separated notification types
+    
+    # Timestamps
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    # Relationships
+    user = relationship("User", back_populates="notification_preference")
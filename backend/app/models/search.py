@@ -0,0 +1,28 @@
+from sqlalchemy import Column, Integer, String, Index, UniqueConstraint
+from app.core.database import Base
+
+
+class SearchName(Base):
+    """
+    Distinct searchable names (crops, markets, products) for app.core.search.
+
+    Filled by database triggers on the source tables (see migration 0006),
+    so every write path - ORM, bulk ingest, COPY - keeps it current. Names
+    are never removed; a stale name simply matches no rows.
+    """
+    __tablename__ = "search_names"
+
+    id = Column(Integer, primary_key=True)
+    kind = Column(String(20), nullable=False)  # crop, market, product
+    name = Column(String(200), nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("kind", "name", name="uq_search_names_kind_name"),
+        # Trigram GIN index on PostgreSQL (pg_trgm); SQLite uses the search_names_fts table
+        Index(
+            "ix_search_names_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"}
+        ),
+    )
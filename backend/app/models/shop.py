@@ -1,7 +1,8 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, Float, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, Text, Float, ForeignKey, Boolean, Index, event
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.core.database import Base
+from app.core.geo import GEOHASH_PRECISION, encode_geohash
 
 
 class Shop(Base):
@@ -26,6 +27,7 @@ class Shop(Base):
     pincode = Column(String(10), nullable=True)
     latitude = Column(Float, nullable=True)
     longitude = Column(Float, nullable=True)
+    geohash = Column(String(GEOHASH_PRECISION), nullable=True)  # set from latitude/longitude on flush
     
     # Shop Details
     license_number = Column(String(100), nullable=True)
@@ -52,6 +54,21 @@ class Shop(Base):
     
     # Relationships
     inventory = relationship("ShopInventory", back_populates="shop")
+    
+    # Active shop listing by location; nearby search scans geohash ranges
+    __table_args__ = (
+        Index("ix_shops_is_active_state_district", "is_active", "state", "district"),
+        Index("ix_shops_is_active_geohash", "is_active", "geohash"),
+    )
+
+
+@event.listens_for(Shop, "before_insert")
+@event.listens_for(Shop, "before_update")
+def _set_geohash(mapper, connection, shop: Shop) -> None:
+    if shop.latitude is None or shop.longitude is None:
+        shop.geohash = None
+    else:
+        shop.geohash = encode_geohash(shop.latitude, shop.longitude)
 
 
 class ShopInventory(Base):
@@ -95,3 +112,8 @@ class ShopInventory(Base):
     
     # Relationships
     shop = relationship("Shop", back_populates="inventory")
+    
+    # Inventory of a shop, optionally by product type
+    __table_args__ = (
+        Index("ix_shop_inventory_shop_id_product_type", "shop_id", "product_type"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, Float, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Text, Float, ForeignKey, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.core.database import Base
@@ -58,3 +58,8 @@ class SoilTest(Base):
     
     # Relationships
     user = relationship("User", back_populates="soil_tests")
+    
+    # Per-user test history ordered by test date
+    __table_args__ = (
+        Index("ix_soil_tests_user_id_test_date", "user_id", "test_date"),
+    )
@@ -43,3 +43,4 @@ class User(Base):
     soil_tests = relationship("SoilTest", back_populates="user")
     community_posts = relationship("CommunityPost", back_populates="user")
     notifications = relationship("Notification", back_populates="user")
+    notification_preference = relationship("NotificationPreference", back_populates="user", uselist=False)
@@ -3,6 +3,7 @@ from typing import Dict, Any, List
 from sqlalchemy.orm import Session
 from app.models.crop import Crop, CropRecommendation
 from app.models.soil import SoilType
+from app.services.market_service import MarketService
 from app.services.weather_service import WeatherService
 
 
@@ -88,6 +89,9 @@ class CropRecommendationService:
             # Get available crops from database
             crops = db.query(Crop).all()
             
+            # Recent mandi price ranges for all crops in one rollup query
+            market_prices = await MarketService().get_recent_price_ranges(db)
+            
             recommendations = []
             
             for crop in crops:
@@ -112,7 +116,7 @@ class CropRecommendationService:
                             "suitability_score": score,
                             "season": season,
                             "expected_yield": self._estimate_yield(crop.name.lower(), farm_size),
-                            "market_price": self._get_market_price(crop.name.lower()),
+                            "market_price": self._get_market_price(crop.name.lower(), market_prices),
                             "reason": self._get_recommendation_reason(
                                 crop.name.lower(), suitability_data, season, soil_type
                             )
@@ -194,10 +198,13 @@ class CropRecommendationService:
         base_yield = yield_per_acre.get(crop_name, 20)
         return base_yield * farm_size
 
-    def _get_market_price(self, crop_name: str) -> Dict[str, float]:
+    def _get_market_price(self, crop_name: str, market_prices: Dict[str, Dict[str, float]] = None) -> Dict[str, float]:
         """
         Get estimated market price for a crop
         """
+        if market_prices and crop_name in market_prices:
+            return market_prices[crop_name]
+        
         # Average market prices per quintal (in INR)
         prices = {
             "rice": {"min": 2000, "max": 3000},
@@ -0,0 +1,178 @@
+import os
+import threading
+from datetime import date
+from typing import Dict, Any, Optional, Sequence
+
+import pyarrow as pa
+import pyarrow.acero as ac
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+from pyarrow import fs
+
+from app.core.config import settings
+from app.services.market_export_service import (
+    PARTITION_SCHEMA,
+    MANIFEST_FILE,
+    month_key,
+    read_manifest
+)
+from app.services.market_service import PRICE_HISTORY_INTERVALS
+
+
+ANALYTICS_DIMENSIONS = ("crop_name", "market_name", "state", "district", "variety")
+
+# Groups returned per query; the rest are reported as truncated
+ANALYTICS_MAX_GROUPS = 10000
+
+# (source column, arrow aggregation, output name)
+ANALYTICS_AGGREGATES = [
+    ("min_price", "min", "low"),
+    ("max_price", "max", "high"),
+    ("min_price", "mean", "avg_min"),
+    ("max_price", "mean", "avg_max"),
+    ("modal_price", "mean", "avg_modal"),
+    ("arrival_quantity", "sum", "arrival_quantity"),
+    ("min_price", "count", "records"),
+]
+
+
+class AnalyticsUnavailable(Exception):
+    """No market history export exists yet"""
+
+
+class MarketHistoryDataset:
+    """
+    Process-local handle on the exported Parquet dataset, reopened when an
+    export rewrites the manifest. Files are memory-mapped, so repeated
+    scans are served from the page cache without copying into the heap.
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = root or settings.MARKET_EXPORT_DIR
+        self._dataset: Optional[ds.Dataset] = None
+        self._manifest: Optional[Dict[str, Any]] = None
+        self._manifest_mtime: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        """(dataset, manifest); raises AnalyticsUnavailable before the first export"""
+        try:
+            mtime = os.stat(os.path.join(self.root, MANIFEST_FILE)).st_mtime
+        except FileNotFoundError:
+            raise AnalyticsUnavailable("Market history has not been exported yet")
+
+        if mtime != self._manifest_mtime:
+            with self._lock:
+                if mtime != self._manifest_mtime:
+                    self._dataset = ds.dataset(
+                        self.root,
+                        format="parquet",
+                        partitioning=ds.partitioning(PARTITION_SCHEMA, flavor="hive"),
+                        filesystem=fs.LocalFileSystem(use_mmap=True)
+                    )
+                    self._manifest = read_manifest(self.root)
+                    self._manifest_mtime = mtime
+        return self._dataset, self._manifest
+
+
+market_history = MarketHistoryDataset()
+
+
+class MarketAnalyticsService:
+    """
+    Aggregate queries over the exported market history; never touches the
+    database. Only the columns a query needs are read, and crop / date
+    filters prune whole partitions before any file is opened.
+    """
+
+    def __init__(self, dataset: Optional[MarketHistoryDataset] = None):
+        self.dataset = dataset or market_history
+
+    def aggregate(
+        self,
+        group_by: Sequence[str],
+        interval: Optional[str] = None,
+        crop_names: Optional[Sequence[str]] = None,
+        market_name: Optional[str] = None,
+        state: Optional[str] = None,
+        district: Optional[str] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> Dict[str, Any]:
+        unknown = [name for name in group_by if name not in ANALYTICS_DIMENSIONS]
+        if unknown:
+            raise ValueError(f"group_by must be among {', '.join(ANALYTICS_DIMENSIONS)}")
+        if interval is not None and interval not in PRICE_HISTORY_INTERVALS:
+            raise ValueError(f"interval must be one of {', '.join(PRICE_HISTORY_INTERVALS)}")
+
+        dataset, manifest = self.dataset.get()
+
+        conditions = []
+        filter_columns = set()
+        if crop_names:
+            conditions.append(ds.field("crop_name").isin(list(crop_names)))
+            filter_columns.add("crop_name")
+        for name, value in (("market_name", market_name), ("state", state), ("district", district)):
+            if value:
+                conditions.append(ds.field(name) == value)
+                filter_columns.add(name)
+        if start_date:
+            conditions.append(ds.field("month") >= month_key(start_date))
+            conditions.append(ds.field("price_date") >= start_date)
+            filter_columns |= {"month", "price_date"}
+        if end_date:
+            conditions.append(ds.field("month") <= month_key(end_date))
+            conditions.append(ds.field("price_date") <= end_date)
+            filter_columns |= {"month", "price_date"}
+
+        scan_filter = None
+        for condition in conditions:
+            scan_filter = condition if scan_filter is None else scan_filter & condition
+
+        # Each file has its own string dictionaries; group on plain strings
+        keys = list(group_by)
+        projection = {name: pc.field(name).cast(pa.string()) for name in group_by}
+        if interval:
+            projection["period"] = pc.floor_temporal(pc.field("price_date"), unit=interval, week_starts_monday=True)
+            keys.append("period")
+        sources = sorted({source for source, _, _ in ANALYTICS_AGGREGATES})
+        projection.update((source, pc.field(source)) for source in sources)
+
+        # Grouped (hash_*) or whole-scan aggregations, plus the scanned row count
+        prefix = "hash_" if keys else ""
+        aggregates = [(source, prefix + aggregation, None, name) for source, aggregation, name in ANALYTICS_AGGREGATES]
+        aggregates.append(([], prefix + "count_all", None, "scanned_rows"))
+
+        # Streamed scan -> filter -> project -> aggregate: batches are folded
+        # into the aggregates as they are read, so memory is bounded by the
+        # number of groups rather than the rows scanned
+        scan_columns = sorted(set(group_by) | set(sources) | filter_columns | ({"price_date"} if interval else set()))
+        plan = [ac.Declaration("scan", ac.ScanNodeOptions(dataset, columns=scan_columns, filter=scan_filter))]
+        if scan_filter is not None:
+            # The scan only uses the filter to prune files and row groups
+            plan.append(ac.Declaration("filter", ac.FilterNodeOptions(scan_filter)))
+        plan.append(ac.Declaration("project", ac.ProjectNodeOptions(list(projection.values()), list(projection))))
+        plan.append(ac.Declaration("aggregate", ac.AggregateNodeOptions(aggregates, keys=keys)))
+        grouped = ac.Declaration.from_sequence(plan).to_table()
+
+        scanned_rows = pc.sum(grouped["scanned_rows"]).as_py() or 0
+        grouped = grouped.drop_columns(["scanned_rows"])
+        if keys:
+            grouped = grouped.sort_by([(key, "ascending") for key in keys])
+
+        truncated = grouped.num_rows > ANALYTICS_MAX_GROUPS
+        rows = grouped.slice(0, ANALYTICS_MAX_GROUPS).to_pylist()
+        for row in rows:
+            for name in ("low", "high", "avg_min", "avg_max", "avg_modal", "arrival_quantity"):
+                if row[name] is not None:
+                    row[name] = round(row[name], 2)
+
+        return {
+            "group_by": keys,
+            "interval": interval,
+            "rows": rows,
+            "count": len(rows),
+            "truncated": truncated,
+            "scanned_rows": scanned_rows,
+            "exported_at": (manifest or {}).get("exported_at")
+        }
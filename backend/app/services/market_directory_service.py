@@ -0,0 +1,142 @@
+import hashlib
+import threading
+import time
+from typing import Dict, Any, List, Optional, Tuple
+
+from sqlalchemy import select, insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.responses import dumps
+from app.models.market import Market
+
+
+class MarketDirectorySnapshot:
+    """
+    Immutable state -> district -> markets tree with the /market/markets
+    bodies rendered from it on first use. The ETag is a hash of the
+    markets themselves, so every process serving the same markets agrees
+    on it and a rebuild with nothing new keeps clients' copies valid.
+    """
+
+    def __init__(self, markets: List[Tuple[str, str, str]], version: int, expires_at: float):
+        self.version = version
+        self.expires_at = expires_at
+        self.tree: Dict[str, Dict[str, List[str]]] = {}
+        for market_name, state, district in markets:
+            self.tree.setdefault(state, {}).setdefault(district, []).append(market_name)
+
+        digest = hashlib.sha1()
+        for market in markets:
+            digest.update("\x1f".join(market).encode())
+            digest.update(b"\x1e")
+        self.etag = f'"{digest.hexdigest()}"'
+        self._bodies: Dict[tuple, bytes] = {}
+
+    def markets(self, state: Optional[str] = None, district: Optional[str] = None) -> List[Dict[str, str]]:
+        """Markets sorted by state, district and name; filters match exactly"""
+        states = [state] if state is not None else list(self.tree)
+        return [
+            {"market_name": market_name, "state": market_state, "district": market_district}
+            for market_state in states
+            for market_district, names in self.tree.get(market_state, {}).items()
+            if district is None or market_district == district
+            for market_name in names
+        ]
+
+    def body(self, state: Optional[str] = None, district: Optional[str] = None) -> bytes:
+        key = (state, district)
+        body = self._bodies.get(key)
+        if body is None:
+            markets = self.markets(state, district)
+            body = dumps({"markets": markets})
+            # Only filters that match something are kept, bounding the
+            # cache by the number of states and districts
+            if markets:
+                self._bodies[key] = body
+        return body
+
+
+class MarketDirectory:
+    """
+    Process-local market directory loaded from the markets table.
+
+    Ingests in this process bump the version when they add markets; the
+    snapshot also expires after MARKET_DIRECTORY_CACHE_TTL seconds to pick
+    up markets added by other processes.
+    """
+
+    def __init__(self, ttl_seconds: Optional[int] = None):
+        self.ttl_seconds = ttl_seconds or settings.MARKET_DIRECTORY_CACHE_TTL
+        self.version = 0
+        self._snapshot: Optional[MarketDirectorySnapshot] = None
+        self._lock = threading.Lock()
+
+    def get(self, db: Session) -> MarketDirectorySnapshot:
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.version == self.version and snapshot.expires_at >= time.monotonic():
+            return snapshot
+
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is None or snapshot.version != self.version or snapshot.expires_at < time.monotonic():
+                # Read the version first so markets added mid-load leave this snapshot stale
+                version = self.version
+                markets = db.execute(
+                    select(Market.market_name, Market.state, Market.district)
+                    .order_by(Market.state, Market.district, Market.market_name)
+                ).all()
+                snapshot = MarketDirectorySnapshot(
+                    [tuple(market) for market in markets], version, time.monotonic() + self.ttl_seconds
+                )
+                self._snapshot = snapshot
+        return snapshot
+
+    def bump_version(self) -> None:
+        """Drop the snapshot; called after markets are added"""
+        with self._lock:
+            self.version += 1
+            self._snapshot = None
+
+
+market_directory = MarketDirectory()
+
+
+class MarketDirectoryService:
+    def __init__(self, directory: Optional[MarketDirectory] = None):
+        self.directory = directory or market_directory
+
+    def get_directory(self, db: Session) -> MarketDirectorySnapshot:
+        return self.directory.get(db)
+
+    def record_markets(self, db: Session, rows: List[Dict[str, Any]]) -> int:
+        """
+        Add the markets of ingested price rows that are not in the markets
+        table yet, in the caller's transaction; returns how many were new
+        """
+        keys = {(row["market_name"], row["state"], row["district"]) for row in rows}
+        if not keys:
+            return 0
+
+        existing = db.execute(
+            select(Market.market_name, Market.state, Market.district)
+            .where(Market.market_name.in_({market_name for market_name, _, _ in keys}))
+        )
+        missing = keys - {tuple(market) for market in existing}
+        if not missing:
+            return 0
+
+        dialect_name = db.get_bind().dialect.name
+        values = [
+            {"market_name": market_name, "state": state, "district": district}
+            for market_name, state, district in sorted(missing)
+        ]
+        if dialect_name == "postgresql":
+            statement = postgresql.insert(Market).on_conflict_do_nothing()
+        elif dialect_name == "sqlite":
+            statement = sqlite.insert(Market).on_conflict_do_nothing()
+        else:
+            statement = insert(Market)
+        db.execute(statement, values)
+        return len(missing)
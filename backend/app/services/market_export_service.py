@@ -0,0 +1,236 @@
+import json
+import os
+import shutil
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from typing import Dict, Any, Iterator, Optional, Tuple
+from urllib.parse import quote
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from sqlalchemy import select, func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.market import MarketPrice
+
+
+# Hive-style partitions: <root>/crop_name=<crop>/month=<YYYY-MM>/data.parquet
+PARTITION_SCHEMA = pa.schema([("crop_name", pa.string()), ("month", pa.string())])
+PARTITION_FILE = "data.parquet"
+
+# Rewritten after every export; readers reopen the dataset when it changes
+MANIFEST_FILE = "_manifest.json"
+
+# Columns stored in each file (crop_name and month come from the path)
+EXPORT_SCHEMA = pa.schema([
+    ("market_name", pa.dictionary(pa.int32(), pa.string())),
+    ("state", pa.dictionary(pa.int32(), pa.string())),
+    ("district", pa.dictionary(pa.int32(), pa.string())),
+    ("variety", pa.dictionary(pa.int32(), pa.string())),
+    ("price_date", pa.date32()),
+    ("min_price", pa.float64()),
+    ("max_price", pa.float64()),
+    ("modal_price", pa.float64()),
+    ("arrival_quantity", pa.float64()),
+    ("source", pa.dictionary(pa.int32(), pa.string())),
+])
+
+EXPORT_FETCH_SIZE = 50000
+
+
+def month_key(day: date) -> str:
+    return f"{day.year:04d}-{day.month:02d}"
+
+
+def _month_start(day: date) -> date:
+    return date(day.year, day.month, 1)
+
+
+def _next_month(day: date) -> date:
+    return date(day.year + day.month // 12, day.month % 12 + 1, 1)
+
+
+def partition_dir(root: str, crop_name: str, month: str) -> str:
+    # Percent-encoded so any crop name is a single path segment; the
+    # dataset reader decodes it back
+    return os.path.join(root, f"crop_name={quote(crop_name, safe='')}", f"month={month}")
+
+
+def read_manifest(root: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(os.path.join(root, MANIFEST_FILE)) as manifest:
+            return json.load(manifest)
+    except FileNotFoundError:
+        return None
+
+
+@dataclass
+class ExportStats:
+    months: int = 0
+    partitions: int = 0
+    removed_partitions: int = 0
+    rows: int = 0
+    bytes_written: int = 0
+    elapsed: float = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "months": self.months,
+            "partitions": self.partitions,
+            "removed_partitions": self.removed_partitions,
+            "rows": self.rows,
+            "bytes_written": self.bytes_written,
+            "elapsed_seconds": round(self.elapsed, 3)
+        }
+
+
+class PartitionWriter:
+    """
+    Writes one partition's file a batch at a time, to a dot-prefixed
+    temporary file (dataset discovery skips a half-written partition)
+    that atomically replaces the old file on close.
+    """
+
+    def __init__(self, root: str, crop_name: str, month: str):
+        self.crop_name = crop_name
+        directory = partition_dir(root, crop_name, month)
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, PARTITION_FILE)
+        self.temporary = os.path.join(directory, f".{PARTITION_FILE}.tmp")
+        self.writer = pq.ParquetWriter(self.temporary, EXPORT_SCHEMA, compression="zstd")
+
+    def write(self, table: pa.Table) -> None:
+        self.writer.write_table(table)
+
+    def close(self) -> int:
+        """Publish the file; returns its size"""
+        self.writer.close()
+        os.replace(self.temporary, self.path)
+        return os.path.getsize(self.path)
+
+    def abort(self) -> None:
+        self.writer.close()
+        os.remove(self.temporary)
+
+
+class MarketExportService:
+    """
+    Exports market_prices to a Parquet dataset partitioned by crop and
+    month, for MarketAnalyticsService to scan instead of the database.
+
+    Work is done a month at a time (an indexed price_date range), and every
+    partition of an exported month is rewritten whole, so re-exporting is
+    idempotent and picks up corrections and deletions. Files are replaced
+    atomically; readers holding the old file keep a consistent view.
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = root or settings.MARKET_EXPORT_DIR
+
+    def export(self, db: Session, since: Optional[date] = None) -> ExportStats:
+        """Export every month from since's month onwards (all history when since is None)"""
+        started = time.perf_counter()
+        stats = ExportStats()
+
+        first, last = db.execute(select(func.min(MarketPrice.price_date), func.max(MarketPrice.price_date))).one()
+        if first is None:
+            stats.elapsed = time.perf_counter() - started
+            return stats
+
+        month = _month_start(max(since, first.date()) if since else first.date())
+        os.makedirs(self.root, exist_ok=True)
+        while month <= last.date():
+            self._export_month(db, month, stats)
+            stats.months += 1
+            month = _next_month(month)
+
+        self._write_manifest(since)
+        stats.elapsed = time.perf_counter() - started
+        return stats
+
+    def _export_month(self, db: Session, month: date, stats: ExportStats) -> None:
+        key = month_key(month)
+        written = set()
+        writer: Optional[PartitionWriter] = None
+        try:
+            # Rows arrive grouped by crop, so each partition is written
+            # start to finish before the next one is opened
+            for crop_name, table in self._read_month(db, month):
+                if writer is None or writer.crop_name != crop_name:
+                    if writer is not None:
+                        stats.bytes_written += writer.close()
+                        stats.partitions += 1
+                    writer = PartitionWriter(self.root, crop_name, key)
+                    written.add(crop_name)
+                writer.write(table)
+                stats.rows += table.num_rows
+            if writer is not None:
+                stats.bytes_written += writer.close()
+                stats.partitions += 1
+        except BaseException:
+            if writer is not None:
+                writer.abort()
+            raise
+
+        stats.removed_partitions += self._remove_stale_partitions(key, written)
+
+    def _read_month(self, db: Session, month: date) -> Iterator[Tuple[str, pa.Table]]:
+        """
+        Stream the month as (crop name, rows) runs of at most
+        EXPORT_FETCH_SIZE rows. Rows are sorted by crop, market and date, so
+        each crop's rows are contiguous and markets and dates are sorted
+        within each file for tight row-group statistics.
+        """
+        columns = ["crop_name"] + EXPORT_SCHEMA.names
+        result = db.connection().execution_options(stream_results=True, yield_per=EXPORT_FETCH_SIZE).execute(
+            select(*(getattr(MarketPrice, name) for name in columns)).where(
+                MarketPrice.price_date >= month,
+                MarketPrice.price_date < _next_month(month)
+            ).order_by(MarketPrice.crop_name, MarketPrice.market_name, MarketPrice.price_date)
+        )
+        for rows in result.partitions():
+            values = dict(zip(columns, zip(*rows)))
+            values["price_date"] = [
+                value.date() if isinstance(value, datetime) else value for value in values["price_date"]
+            ]
+            table = pa.table({
+                field.name: pa.array(values[field.name], field.type.value_type if pa.types.is_dictionary(field.type) else field.type)
+                for field in EXPORT_SCHEMA
+            }).cast(EXPORT_SCHEMA)
+
+            # Split the batch where the crop changes
+            crops = pc.dictionary_encode(pa.array(values["crop_name"], pa.string()))
+            boundaries = np.flatnonzero(np.diff(crops.indices.to_numpy(zero_copy_only=False))) + 1
+            starts = np.concatenate([[0], boundaries])
+            ends = np.concatenate([boundaries, [len(rows)]])
+            for start, end in zip(starts, ends):
+                yield values["crop_name"][start], table.slice(start, end - start)
+
+    def _remove_stale_partitions(self, month: str, keep: set) -> int:
+        """Drop this month's partitions for crops no longer in the database"""
+        keep_dirs = {os.path.basename(os.path.dirname(partition_dir(self.root, crop_name, month))) for crop_name in keep}
+        removed = 0
+        for entry in os.scandir(self.root):
+            if not entry.is_dir() or not entry.name.startswith("crop_name=") or entry.name in keep_dirs:
+                continue
+            directory = os.path.join(entry.path, f"month={month}")
+            if os.path.isdir(directory):
+                shutil.rmtree(directory)
+                removed += 1
+                if not os.listdir(entry.path):
+                    os.rmdir(entry.path)
+        return removed
+
+    def _write_manifest(self, since: Optional[date]) -> None:
+        path = os.path.join(self.root, MANIFEST_FILE)
+        temporary = path + ".tmp"
+        with open(temporary, "w") as manifest:
+            json.dump({
+                "exported_at": datetime.now(timezone.utc).isoformat(),
+                "since": since.isoformat() if since else None
+            }, manifest)
+        os.replace(temporary, path)
@@ -0,0 +1,285 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import date, timedelta
+from itertools import repeat
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+import orjson
+import pandas as pd
+from sklearn.linear_model import Ridge
+from sqlalchemy import select, delete, insert, func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.market import MarketPriceDaily, MarketInsight
+from app.services.market_trend_service import TREND_STABLE_PERCENT, representative_prices
+
+
+FORECAST_INSIGHT_TYPE = "price_forecast"
+FORECAST_MODEL_VERSION = "ridge-dow-v1"
+
+# A series needs this many days with reports in the history window, the
+# latest no older than FORECAST_MAX_STALE_DAYS before the newest data
+FORECAST_MIN_OBSERVED_DAYS = 21
+FORECAST_MAX_STALE_DAYS = 14
+
+# Ridge penalty and the half-life (days) of the recency weighting
+FORECAST_RIDGE_ALPHA = 1.0
+FORECAST_HALF_LIFE_DAYS = 30.0
+
+# Backtest MAPE at which confidence reaches 0 (linear from 1 at 0%)
+FORECAST_ZERO_CONFIDENCE_MAPE = 0.25
+
+# Series per process-pool task (each task is one multi-output fit)
+FORECAST_CHUNK_SIZE = 2000
+
+# Recent actual prices stored alongside each forecast
+FORECAST_HISTORY_POINTS = 30
+
+
+def _features(days: int, horizon: int) -> np.ndarray:
+    """Trend plus weekly seasonality (day-of-week Fourier terms), for history and horizon days"""
+    t = np.arange(days + horizon, dtype=float)
+    angle = 2 * np.pi * t / 7
+    return np.column_stack([t / days, np.sin(angle), np.cos(angle), np.sin(2 * angle), np.cos(2 * angle)])
+
+
+def fit_forecast(
+    log_prices: np.ndarray,
+    horizon: int,
+    alpha: float = FORECAST_RIDGE_ALPHA,
+    half_life: float = FORECAST_HALF_LIFE_DAYS
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Fit one model per series at once: log_prices is days x series, and a
+    multi-output Ridge over shared calendar features solves every series'
+    coefficients in a single least-squares problem. Recent days weigh more.
+
+    Returns (horizon x series forecast log prices, per-series residual
+    standard deviation, per-series backtest MAPE from refitting without the
+    last `horizon` days and scoring on them).
+    """
+    days = log_prices.shape[0]
+    features = _features(days, horizon)
+    weights = 0.5 ** ((days - 1 - np.arange(days)) / half_life)
+
+    model = Ridge(alpha=alpha).fit(features[:days], log_prices, sample_weight=weights)
+    forecast = model.predict(features[days:]).reshape(horizon, -1)
+    residuals = log_prices - model.predict(features[:days]).reshape(days, -1)
+    spread = np.sqrt(np.average(residuals ** 2, axis=0, weights=weights))
+
+    train = days - horizon
+    backtest = Ridge(alpha=alpha).fit(features[:train], log_prices[:train], sample_weight=weights[horizon:])
+    predicted = np.exp(backtest.predict(features[train:days]).reshape(horizon, -1))
+    actual = np.exp(log_prices[train:])
+    mape = np.mean(np.abs(predicted - actual) / actual, axis=0)
+    return forecast, spread, mape
+
+
+def _time_horizon(horizon_days: int) -> str:
+    if horizon_days <= 14:
+        return "short_term"
+    if horizon_days <= 60:
+        return "medium_term"
+    return "long_term"
+
+
+@dataclass
+class ForecastStats:
+    series: int = 0
+    forecasted: int = 0
+    skipped: int = 0  # too few or too stale observations
+    workers: int = 0
+    as_of: Optional[date] = None
+    elapsed: float = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "series": self.series,
+            "forecasted": self.forecasted,
+            "skipped": self.skipped,
+            "workers": self.workers,
+            "as_of": self.as_of,
+            "elapsed_seconds": round(self.elapsed, 3)
+        }
+
+
+class MarketForecastService:
+    """
+    Batch price forecasts per (crop, market) from the daily rollup, stored
+    as MarketInsight rows that /market/insights serves as-is.
+
+    Series are split into chunks fitted in a process pool; each chunk is a
+    single vectorized fit (see fit_forecast). A run replaces the previous
+    run's forecasts in one transaction.
+    """
+
+    def __init__(
+        self,
+        history_days: Optional[int] = None,
+        horizon_days: Optional[int] = None,
+        workers: Optional[int] = None
+    ):
+        self.history_days = history_days or settings.MARKET_FORECAST_HISTORY_DAYS
+        self.horizon_days = horizon_days or settings.MARKET_FORECAST_HORIZON_DAYS
+        self.workers = workers or settings.MARKET_FORECAST_WORKERS or os.cpu_count() or 1
+        if self.history_days <= 2 * self.horizon_days:
+            raise ValueError("history_days must be more than twice horizon_days (the backtest holds out one horizon)")
+
+    def run(self, db: Session) -> ForecastStats:
+        started = time.perf_counter()
+        stats = ForecastStats()
+
+        prices = self._load_prices(db)
+        if prices.empty:
+            stats.elapsed = time.perf_counter() - started
+            return stats
+
+        stats.series = prices.shape[1]
+        stats.as_of = prices.index[-1].date()
+        prices = self._usable_series(prices)
+        stats.skipped = stats.series - prices.shape[1]
+
+        insights: List[Dict[str, Any]] = []
+        if prices.shape[1]:
+            # Carry the last report over gaps; the first report back-fills the start
+            log_prices = np.log(prices.ffill().bfill().to_numpy())
+            forecast, spread, mape = self._fit(log_prices, stats)
+            insights = self._insights(prices, forecast, spread, mape, stats.as_of)
+        stats.forecasted = len(insights)
+
+        db.execute(
+            delete(MarketInsight).where(
+                MarketInsight.insight_type == FORECAST_INSIGHT_TYPE,
+                MarketInsight.user_id.is_(None)
+            )
+        )
+        if insights:
+            db.execute(insert(MarketInsight), insights)
+        db.commit()
+
+        stats.elapsed = time.perf_counter() - started
+        return stats
+
+    def _load_prices(self, db: Session) -> pd.DataFrame:
+        """Day x (crop, market) matrix of daily representative prices (NaN without reports)"""
+        as_of = db.execute(select(func.max(MarketPriceDaily.price_date))).scalar()
+        if as_of is None:
+            return pd.DataFrame()
+        start = as_of - timedelta(days=self.history_days - 1)
+
+        # Core connection: plain tuples, skipping ORM row processing for ~history x series rows
+        result = db.connection().execute(
+            select(
+                MarketPriceDaily.crop_name,
+                MarketPriceDaily.market_name,
+                MarketPriceDaily.price_date,
+                func.sum(MarketPriceDaily.min_price_sum).label("min_price_sum"),
+                func.sum(MarketPriceDaily.max_price_sum).label("max_price_sum"),
+                func.sum(MarketPriceDaily.modal_price_sum).label("modal_price_sum"),
+                func.sum(MarketPriceDaily.modal_price_count).label("modal_price_count"),
+                func.sum(MarketPriceDaily.record_count).label("record_count")
+            )
+            .where(MarketPriceDaily.price_date >= start)
+            .group_by(MarketPriceDaily.crop_name, MarketPriceDaily.market_name, MarketPriceDaily.price_date)
+        )
+        rows = pd.DataFrame(result.all(), columns=list(result.keys()))
+        rows = rows.assign(price=representative_prices(rows), price_date=pd.to_datetime(rows["price_date"]))
+
+        days = pd.date_range(pd.Timestamp(start), pd.Timestamp(as_of), freq="D")
+        prices = rows.pivot(index="price_date", columns=["crop_name", "market_name"], values="price")
+        return prices.reindex(days).where(lambda frame: frame > 0)
+
+    def _usable_series(self, prices: pd.DataFrame) -> pd.DataFrame:
+        observed = prices.notna()
+        last_seen = observed.to_numpy()[::-1].argmax(axis=0)  # days since the latest report
+        keep = (observed.sum().to_numpy() >= FORECAST_MIN_OBSERVED_DAYS) & (last_seen <= FORECAST_MAX_STALE_DAYS)
+        return prices.loc[:, keep]
+
+    def _fit(self, log_prices: np.ndarray, stats: ForecastStats) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        chunks = [
+            log_prices[:, i:i + FORECAST_CHUNK_SIZE]
+            for i in range(0, log_prices.shape[1], FORECAST_CHUNK_SIZE)
+        ]
+        stats.workers = min(self.workers, len(chunks))
+        if stats.workers == 1:
+            results = [fit_forecast(chunk, self.horizon_days) for chunk in chunks]
+        else:
+            with ProcessPoolExecutor(max_workers=stats.workers) as executor:
+                results = list(executor.map(fit_forecast, chunks, repeat(self.horizon_days)))
+
+        forecast, spread, mape = zip(*results)
+        return np.hstack(forecast), np.concatenate(spread), np.concatenate(mape)
+
+    def _insights(
+        self,
+        prices: pd.DataFrame,
+        forecast: np.ndarray,
+        spread: np.ndarray,
+        mape: np.ndarray,
+        as_of: date
+    ) -> List[Dict[str, Any]]:
+        filled = prices.ffill()
+        current = filled.iloc[-1].to_numpy()
+        # Direction is judged against the last week's average, not one noisy day
+        baseline = filled.iloc[-7:].mean().to_numpy()
+        expected = np.exp(forecast)
+        # ~95% band from the in-sample residual spread (log scale)
+        low = np.exp(forecast - 1.96 * spread)
+        high = np.exp(forecast + 1.96 * spread)
+        change = (expected[-1] - baseline) / baseline * 100
+        direction = np.select(
+            [change >= TREND_STABLE_PERCENT, change <= -TREND_STABLE_PERCENT],
+            ["up", "down"],
+            "stable"
+        )
+        confidence = np.clip(1 - mape / FORECAST_ZERO_CONFIDENCE_MAPE, 0.0, 1.0)
+
+        forecast_dates = [(as_of + timedelta(days=day + 1)).isoformat() for day in range(self.horizon_days)]
+        history = prices.iloc[-FORECAST_HISTORY_POINTS:]
+        history_dates = [day.date().isoformat() for day in history.index]
+        history_prices = history.to_numpy()
+        time_horizon = _time_horizon(self.horizon_days)
+        wording = {"up": "rise", "down": "fall", "stable": "hold steady at"}
+
+        insights = []
+        for i, (crop_name, market_name) in enumerate(prices.columns):
+            points = [
+                {"date": day, "price": round(float(price), 2), "low": round(float(lo), 2), "high": round(float(hi), 2)}
+                for day, price, lo, hi in zip(forecast_dates, expected[:, i], low[:, i], high[:, i])
+            ]
+            final_price = points[-1]["price"]
+            insights.append({
+                "title": f"{crop_name} price forecast: {market_name}",
+                "content": (
+                    f"{crop_name} at {market_name} is expected to {wording[direction[i]]} "
+                    + (f"{abs(change[i]):.1f}% to " if direction[i] != "stable" else "")
+                    + f"Rs {final_price:,.0f}/quintal by {forecast_dates[-1]} "
+                    f"(confidence {confidence[i]:.0%})."
+                ),
+                "insight_type": FORECAST_INSIGHT_TYPE,
+                "crop_name": crop_name,
+                "region": market_name,
+                "trend_direction": str(direction[i]),
+                "confidence_level": round(float(confidence[i]), 3),
+                "time_horizon": time_horizon,
+                "historical_data": orjson.dumps([
+                    {"date": day, "price": round(float(price), 2)}
+                    for day, price in zip(history_dates, history_prices[:, i]) if not np.isnan(price)
+                ]).decode(),
+                "forecast_data": orjson.dumps({
+                    "as_of": as_of.isoformat(),
+                    "current_price": round(float(current[i]), 2),
+                    "week_average": round(float(baseline[i]), 2),
+                    "expected_change": round(float(change[i]), 2),
+                    "backtest_mape": round(float(mape[i]), 4),
+                    "points": points
+                }).decode(),
+                "is_ai_generated": True,
+                "model_version": FORECAST_MODEL_VERSION,
+                "language": "en"
+            })
+        return insights
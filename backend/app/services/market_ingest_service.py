@@ -0,0 +1,479 @@
+import csv
+import gzip
+import io
+import json
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
+from datetime import datetime, timezone
+from typing import Dict, Any, Callable, IO, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import select, column, table
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.market import MarketPrice
+from app.services.market_directory_service import MarketDirectoryService, market_directory
+from app.services.market_rollup_service import MarketRollupService
+from app.services.market_trend_service import trend_cache
+from app.services.price_alert_service import PriceAlertService, price_alert_index
+
+
+# Matches the uq_market_prices_natural_key index
+NATURAL_KEY_COLUMNS = ("crop_name", "variety", "market_name", "state", "district", "price_date")
+PRICE_COLUMNS = ("min_price", "max_price", "modal_price", "arrival_quantity", "quality_grade", "source")
+INGEST_COLUMNS = NATURAL_KEY_COLUMNS + PRICE_COLUMNS
+
+INGEST_FORMATS = ("csv", "json")
+
+# Agmarknet's label for an unspecified variety; keeps the natural key NOT NULL
+DEFAULT_VARIETY = "Other"
+
+# Normalized header -> MarketPrice column (Agmarknet exports and our own column names)
+FIELD_ALIASES = {
+    "commodity": "crop_name",
+    "crop": "crop_name",
+    "crop_name": "crop_name",
+    "variety": "variety",
+    "market": "market_name",
+    "mandi": "market_name",
+    "market_name": "market_name",
+    "state": "state",
+    "district": "district",
+    "arrival_date": "price_date",
+    "price_date": "price_date",
+    "date": "price_date",
+    "min_price": "min_price",
+    "max_price": "max_price",
+    "modal_price": "modal_price",
+    "arrivals": "arrival_quantity",
+    "arrival_quantity": "arrival_quantity",
+    "grade": "quality_grade",
+    "quality_grade": "quality_grade"
+}
+
+# Commodity labels that name a crop the rest of the app knows by another name
+CROP_NAME_ALIASES = {
+    "paddy(dhan)(common)": "Rice",
+    "paddy(dhan)": "Rice",
+    "paddy": "Rice"
+}
+
+DATE_FORMATS = ("%d/%m/%Y", "%Y-%m-%d", "%d-%m-%Y", "%d-%b-%Y")
+
+MISSING_VALUES = ("", "-", "na", "nr", "n/a", "null", "none")
+
+
+def _field_name(header: str) -> Optional[str]:
+    key = header.strip().lower().replace("_x0020_", "_").replace(" ", "_")
+    return FIELD_ALIASES.get(key)
+
+
+def _keyed(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Key a JSON record by MarketPrice column, dropping fields we do not store"""
+    keyed = {}
+    for header, value in record.items():
+        name = _field_name(header)
+        if name:
+            keyed[name] = value
+    return keyed
+
+
+# Dumps repeat the same names and dates on every row, so parsing is memoized
+@lru_cache(maxsize=65536)
+def normalize_name(value: str) -> str:
+    """Collapse whitespace and title-case names that arrive in a single case"""
+    value = " ".join(value.split())
+    if value.isupper() or value.islower():
+        value = value.title()
+    return value
+
+
+@lru_cache(maxsize=4096)
+def normalize_crop_name(value: str) -> str:
+    name = normalize_name(value)
+    return CROP_NAME_ALIASES.get(name.lower().replace(" ", ""), name)
+
+
+def _text(raw: Dict[str, Any], name: str) -> Optional[str]:
+    value = raw.get(name)
+    if value is None:
+        return None
+    value = str(value).strip()
+    return None if value.lower() in MISSING_VALUES else value
+
+
+def _price(raw: Dict[str, Any], name: str) -> Optional[float]:
+    value = _text(raw, name)
+    if value is None:
+        return None
+    try:
+        price = float(value.replace(",", ""))
+    except ValueError:
+        raise ValueError(f"{name} is not a number: {value!r}")
+    if price < 0:
+        raise ValueError(f"{name} is negative")
+    return price
+
+
+@lru_cache(maxsize=4096)
+def _price_date(value: Optional[str]) -> datetime:
+    if value is None:
+        raise ValueError("price_date is missing")
+
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, date_format)
+        except ValueError:
+            continue
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"price_date is not a date: {value!r}")
+    return _naive_utc(parsed).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _naive_utc(value: datetime) -> datetime:
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def normalize_record(raw: Dict[str, Any], source: str = "mandi") -> Dict[str, Any]:
+    """
+    Validate one raw record (already keyed by MarketPrice column) and return
+    the row to upsert; raises ValueError describing the first problem found
+    """
+    row: Dict[str, Any] = {}
+    for name in ("crop_name", "market_name", "state", "district"):
+        value = _text(raw, name)
+        if value is None:
+            raise ValueError(f"{name} is missing")
+        row[name] = normalize_name(value)
+    row["crop_name"] = normalize_crop_name(row["crop_name"])
+
+    variety = _text(raw, "variety")
+    row["variety"] = normalize_name(variety) if variety else DEFAULT_VARIETY
+    row["price_date"] = _price_date(_text(raw, "price_date"))
+
+    row["min_price"] = _price(raw, "min_price")
+    row["max_price"] = _price(raw, "max_price")
+    if row["min_price"] is None or row["max_price"] is None:
+        raise ValueError("min_price and max_price are required")
+    if row["min_price"] > row["max_price"]:
+        raise ValueError("min_price is above max_price")
+
+    row["modal_price"] = _price(raw, "modal_price")
+    row["arrival_quantity"] = _price(raw, "arrival_quantity")
+    row["quality_grade"] = _text(raw, "quality_grade")
+    row["source"] = source
+
+    for name in ("crop_name", "variety", "market_name"):
+        if len(row[name]) > 100:
+            raise ValueError(f"{name} is longer than 100 characters")
+    for name in ("state", "district"):
+        if len(row[name]) > 50:
+            raise ValueError(f"{name} is longer than 50 characters")
+    if row["quality_grade"] and len(row["quality_grade"]) > 20:
+        raise ValueError("quality_grade is longer than 20 characters")
+
+    return row
+
+
+def iter_csv_records(stream: IO[str]) -> Iterator[Dict[str, Any]]:
+    """Yield CSV rows keyed by MarketPrice column; unknown columns are dropped"""
+    reader = csv.reader(stream)
+    header = next(reader, None)
+    if header is None:
+        return
+
+    fields = [_field_name(name) for name in header]
+    for values in reader:
+        yield {name: value for name, value in zip(fields, values) if name}
+
+
+def iter_json_records(stream: IO[str], read_size: int = 1 << 16) -> Iterator[Dict[str, Any]]:
+    """
+    Yield objects from a top-level JSON array or newline-delimited JSON,
+    decoding incrementally so only the current chunk is held in memory
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+
+    while True:
+        chunk = stream.read(read_size)
+        buffer += chunk
+        position = 0
+
+        while True:
+            # Skip whitespace and the array punctuation between records
+            while position < len(buffer) and buffer[position] in " \t\r\n,[]":
+                position += 1
+            if position == len(buffer):
+                break
+            try:
+                record, position_after = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if not chunk:
+                    raise ValueError("Malformed JSON at end of file")
+                break  # record continues in the next chunk
+            position = position_after
+            if not isinstance(record, dict):
+                raise ValueError("JSON records must be objects")
+            yield _keyed(record)
+
+        buffer = buffer[position:]
+        if not chunk:
+            break
+
+
+def detect_format(filename: str) -> str:
+    name = filename.lower()
+    if name.endswith(".gz"):
+        name = name[:-3]
+    if name.endswith(".csv"):
+        return "csv"
+    if name.endswith((".json", ".jsonl", ".ndjson")):
+        return "json"
+    raise ValueError(f"Cannot tell the format of {filename}; pass one of {', '.join(INGEST_FORMATS)}")
+
+
+def open_text_stream(binary: IO[bytes], filename: str = "") -> IO[str]:
+    """Wrap a binary upload or file as text, decompressing .gz on the fly"""
+    if filename.lower().endswith(".gz"):
+        binary = gzip.GzipFile(fileobj=binary)
+    # utf-8-sig drops the BOM Excel puts in front of CSV exports
+    return io.TextIOWrapper(binary, encoding="utf-8-sig", newline="")
+
+
+@dataclass
+class IngestStats:
+    rows_read: int = 0
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    duplicates: int = 0  # repeated natural keys within a batch (last one wins)
+    rejected: int = 0
+    alerts_triggered: int = 0
+    batches: int = 0
+    errors: List[str] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows_read / self.elapsed if self.elapsed else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "rows_read": self.rows_read,
+            "inserted": self.inserted,
+            "updated": self.updated,
+            "unchanged": self.unchanged,
+            "duplicates": self.duplicates,
+            "rejected": self.rejected,
+            "alerts_triggered": self.alerts_triggered,
+            "batches": self.batches,
+            "errors": self.errors,
+            "elapsed_seconds": round(self.elapsed, 3),
+            "rows_per_second": round(self.rows_per_second, 1)
+        }
+
+
+def _natural_key(row: Dict[str, Any]) -> tuple:
+    return tuple(row[name] for name in NATURAL_KEY_COLUMNS)
+
+
+class MarketIngestService:
+    """
+    Streams market price dumps into market_prices.
+
+    Records are validated and normalized one at a time, deduplicated on the
+    natural key within a batch and upserted batch by batch, each batch in
+    its own transaction together with its rollup update, so memory stays
+    bounded by the batch size whatever the file size. Run one ingest at a
+    time: concurrent batches for the same keys could double-count rollups.
+    """
+
+    def __init__(self, batch_size: Optional[int] = None, max_errors: int = 100):
+        self.batch_size = batch_size or settings.MARKET_INGEST_BATCH_SIZE
+        self.max_errors = max_errors
+        self.rollups = MarketRollupService()
+        self.alerts = PriceAlertService()
+        self.markets = MarketDirectoryService()
+
+    def ingest_file(
+        self,
+        db: Session,
+        stream: IO[str],
+        file_format: str,
+        source: str = "mandi",
+        on_progress: Optional[Callable[[IngestStats], None]] = None
+    ) -> IngestStats:
+        if file_format not in INGEST_FORMATS:
+            raise ValueError(f"file_format must be one of {', '.join(INGEST_FORMATS)}")
+
+        records = iter_csv_records(stream) if file_format == "csv" else iter_json_records(stream)
+        return self.ingest_records(db, records, source=source, on_progress=on_progress)
+
+    def ingest_records(
+        self,
+        db: Session,
+        records: Iterable[Dict[str, Any]],
+        source: str = "mandi",
+        on_progress: Optional[Callable[[IngestStats], None]] = None
+    ) -> IngestStats:
+        stats = IngestStats()
+        started = time.perf_counter()
+        batch: Dict[tuple, Dict[str, Any]] = {}
+
+        for number, raw in enumerate(records, start=1):
+            stats.rows_read += 1
+            try:
+                row = normalize_record(raw, source)
+            except ValueError as e:
+                stats.rejected += 1
+                if len(stats.errors) < self.max_errors:
+                    stats.errors.append(f"record {number}: {e}")
+                continue
+
+            key = _natural_key(row)
+            if key in batch:
+                stats.duplicates += 1
+            batch[key] = row
+
+            if len(batch) >= self.batch_size:
+                self._flush(db, batch, stats)
+                batch = {}
+                stats.elapsed = time.perf_counter() - started
+                if on_progress:
+                    on_progress(stats)
+
+        if batch:
+            self._flush(db, batch, stats)
+
+        stats.elapsed = time.perf_counter() - started
+        if on_progress:
+            on_progress(stats)
+        return stats
+
+    def _flush(self, db: Session, batch: Dict[tuple, Dict[str, Any]], stats: IngestStats) -> None:
+        """Upsert one batch, fold it into the rollups, fire crossed price alerts and record new markets in a single transaction"""
+        try:
+            existing = self._existing_prices(db, list(batch.values()))
+            new_rows, changed_rows = [], []
+            for key, row in batch.items():
+                current = existing.get(key)
+                if current is None:
+                    new_rows.append(row)
+                elif current != tuple(row[name] for name in PRICE_COLUMNS):
+                    changed_rows.append(row)
+
+            self._write(db, new_rows + changed_rows)
+
+            # Before the rollups take the batch in: alerts compare against
+            # the latest daily prices stored there
+            alerts_triggered = self.alerts.process_prices(db, new_rows + changed_rows)
+
+            # New prices fold in incrementally; corrections rebuild their buckets
+            # afterwards (from market_prices, which by then includes new_rows)
+            self.rollups.record_prices(db, new_rows)
+            if changed_rows:
+                days = [row["price_date"].date() for row in changed_rows]
+                self.rollups.rebuild_range(db, {row["crop_name"] for row in changed_rows}, min(days), max(days))
+
+            # Corrections keep their natural key, so only new rows can add a market
+            new_markets = self.markets.record_markets(db, new_rows)
+
+            db.commit()
+        except Exception:
+            db.rollback()
+            # The matcher already dropped the alerts this batch claimed
+            price_alert_index.reset()
+            raise
+
+        if new_rows or changed_rows:
+            trend_cache.bump_version()
+        if new_markets:
+            market_directory.bump_version()
+
+        stats.batches += 1
+        stats.inserted += len(new_rows)
+        stats.updated += len(changed_rows)
+        stats.alerts_triggered += alerts_triggered
+        stats.unchanged += len(batch) - len(new_rows) - len(changed_rows)
+
+    def _existing_prices(self, db: Session, rows: List[Dict[str, Any]]) -> Dict[tuple, Tuple]:
+        """
+        Stored price fields for the batch's natural keys; dumps cover few
+        dates and crops, so this is one narrow probe of the unique index
+        """
+        price_columns = [getattr(MarketPrice, name) for name in PRICE_COLUMNS]
+        result = db.execute(
+            select(*[getattr(MarketPrice, name) for name in NATURAL_KEY_COLUMNS], *price_columns).where(
+                MarketPrice.crop_name.in_({row["crop_name"] for row in rows}),
+                MarketPrice.price_date.in_({row["price_date"] for row in rows})
+            )
+        )
+
+        key_length = len(NATURAL_KEY_COLUMNS)
+        existing = {}
+        for stored in result:
+            key = tuple(stored[:key_length - 1]) + (_naive_utc(stored[key_length - 1]),)
+            existing[key] = tuple(stored[key_length:])
+        return existing
+
+    def _write(self, db: Session, rows: List[Dict[str, Any]]) -> None:
+        if not rows:
+            return
+
+        bind = db.get_bind()
+        if bind.dialect.name == "postgresql" and bind.dialect.driver == "psycopg2":
+            self._copy_upsert(db, rows)
+            return
+
+        if bind.dialect.name == "postgresql":
+            statement = postgresql.insert(MarketPrice.__table__)
+        elif bind.dialect.name == "sqlite":
+            statement = sqlite.insert(MarketPrice.__table__)
+        else:
+            raise NotImplementedError(f"Market price ingest is not supported on {bind.dialect.name}")
+
+        # executemany: SQLAlchemy batches the rows into multi-VALUES statements
+        db.execute(self._on_conflict(statement), rows)
+
+    def _copy_upsert(self, db: Session, rows: List[Dict[str, Any]]) -> None:
+        """
+        COPY the batch into a transaction-scoped staging table, then merge it
+        with a single INSERT ... SELECT ... ON CONFLICT
+        """
+        connection = db.connection()
+        columns = ", ".join(INGEST_COLUMNS)
+        connection.exec_driver_sql(
+            f"CREATE TEMP TABLE market_prices_staging ON COMMIT DROP AS "
+            f"SELECT {columns} FROM market_prices WITH NO DATA"
+        )
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            # Unquoted empty fields load as NULL
+            writer.writerow(["" if row[name] is None else row[name] for name in INGEST_COLUMNS])
+        buffer.seek(0)
+
+        cursor = connection.connection.cursor()
+        try:
+            cursor.copy_expert(f"COPY market_prices_staging ({columns}) FROM STDIN WITH (FORMAT csv)", buffer)
+        finally:
+            cursor.close()
+
+        staging = table("market_prices_staging", *[column(name) for name in INGEST_COLUMNS])
+        statement = postgresql.insert(MarketPrice.__table__).from_select(list(INGEST_COLUMNS), select(staging))
+        connection.execute(self._on_conflict(statement))
+
+    @staticmethod
+    def _on_conflict(statement):
+        return statement.on_conflict_do_update(
+            index_elements=list(NATURAL_KEY_COLUMNS),
+            set_={name: statement.excluded[name] for name in PRICE_COLUMNS}
+        )
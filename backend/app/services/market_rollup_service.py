@@ -0,0 +1,236 @@
+from datetime import date, datetime, timedelta
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func, select, delete, insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.market import MarketPrice, MarketPriceDaily, MarketPriceWeekly
+from app.services.market_service import bucket_expression
+from app.services.market_trend_service import trend_cache
+
+
+ROLLUP_KEY_COLUMNS = ("crop_name", "market_name", "state", "district")
+
+
+def week_start(day: date) -> date:
+    """Monday of the week containing day"""
+    return day - timedelta(days=day.weekday())
+
+
+def _price_fields(price) -> Dict[str, Any]:
+    if isinstance(price, dict):
+        return price
+    return {
+        "crop_name": price.crop_name,
+        "market_name": price.market_name,
+        "state": price.state,
+        "district": price.district,
+        "min_price": price.min_price,
+        "max_price": price.max_price,
+        "modal_price": price.modal_price,
+        "arrival_quantity": price.arrival_quantity,
+        "price_date": price.price_date
+    }
+
+
+def _new_bucket(key: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        **key,
+        "min_price": None,
+        "max_price": None,
+        "min_price_sum": 0.0,
+        "max_price_sum": 0.0,
+        "modal_price_sum": 0.0,
+        "modal_price_count": 0,
+        "record_count": 0,
+        "arrival_quantity_sum": 0.0
+    }
+
+
+def _accumulate(bucket: Dict[str, Any], price: Dict[str, Any]) -> None:
+    min_price, max_price = price["min_price"], price["max_price"]
+    bucket["min_price"] = min_price if bucket["min_price"] is None else min(bucket["min_price"], min_price)
+    bucket["max_price"] = max_price if bucket["max_price"] is None else max(bucket["max_price"], max_price)
+    bucket["min_price_sum"] += min_price
+    bucket["max_price_sum"] += max_price
+    if price.get("modal_price") is not None:
+        bucket["modal_price_sum"] += price["modal_price"]
+        bucket["modal_price_count"] += 1
+    bucket["record_count"] += 1
+    bucket["arrival_quantity_sum"] += price.get("arrival_quantity") or 0.0
+
+
+class MarketRollupService:
+    """
+    Maintains the market_price_daily and market_price_weekly rollups.
+
+    record_prices folds newly ingested prices into the rollups inside the
+    caller's transaction; backfill rebuilds them from market_prices.
+    """
+
+    def record_prices(self, db: Session, prices: Iterable[Any]) -> Tuple[int, int]:
+        """
+        Fold MarketPrice rows (or dicts with the same fields) into the
+        rollups with one multi-row upsert per table; does not commit.
+        Returns the number of (daily, weekly) buckets touched.
+        """
+        daily: Dict[tuple, Dict[str, Any]] = {}
+        weekly: Dict[tuple, Dict[str, Any]] = {}
+
+        for price in prices:
+            fields = _price_fields(price)
+            price_date = fields["price_date"]
+            day = price_date.date() if isinstance(price_date, datetime) else price_date
+            key = tuple(fields[column] for column in ROLLUP_KEY_COLUMNS)
+
+            if key + (day,) not in daily:
+                daily[key + (day,)] = _new_bucket({**dict(zip(ROLLUP_KEY_COLUMNS, key)), "price_date": day})
+            _accumulate(daily[key + (day,)], fields)
+
+            monday = week_start(day)
+            if key + (monday,) not in weekly:
+                weekly[key + (monday,)] = _new_bucket({**dict(zip(ROLLUP_KEY_COLUMNS, key)), "week_start": monday})
+            _accumulate(weekly[key + (monday,)], fields)
+
+        self._upsert(db, MarketPriceDaily, "price_date", list(daily.values()))
+        self._upsert(db, MarketPriceWeekly, "week_start", list(weekly.values()))
+        return len(daily), len(weekly)
+
+    def backfill(self, db: Session, since: Optional[date] = None) -> Tuple[int, int]:
+        """
+        Rebuild the rollups from market_prices (everything, or from `since`
+        onwards; weekly buckets restart at the Monday on or before it).
+        Commits and returns the number of (daily, weekly) rows written.
+        """
+        dialect_name = db.get_bind().dialect.name
+        weekly_since = week_start(since) if since else None
+
+        daily_rows = self._rebuild(db, MarketPriceDaily, "price_date", "day", dialect_name, since)
+        weekly_rows = self._rebuild(db, MarketPriceWeekly, "week_start", "week", dialect_name, weekly_since)
+        db.commit()
+        trend_cache.bump_version()
+        return daily_rows, weekly_rows
+
+    def rebuild_range(self, db: Session, crop_names: Iterable[str], start: date, end: date) -> Tuple[int, int]:
+        """
+        Recompute the buckets of the given crops between start and end
+        (inclusive) from market_prices, for prices corrected in place where
+        the stored min/max cannot be folded incrementally; does not commit.
+        """
+        dialect_name = db.get_bind().dialect.name
+        crop_names = list(crop_names)
+
+        daily_rows = self._rebuild(
+            db, MarketPriceDaily, "price_date", "day", dialect_name,
+            start, end + timedelta(days=1), crop_names
+        )
+        weekly_rows = self._rebuild(
+            db, MarketPriceWeekly, "week_start", "week", dialect_name,
+            week_start(start), week_start(end) + timedelta(weeks=1), crop_names
+        )
+        return daily_rows, weekly_rows
+
+    def _rebuild(
+        self,
+        db: Session,
+        model,
+        date_column: str,
+        interval: str,
+        dialect_name: str,
+        since: Optional[date] = None,
+        until: Optional[date] = None,
+        crop_names: Optional[List[str]] = None
+    ) -> int:
+        bucket = bucket_expression(MarketPrice.price_date, interval, dialect_name)
+
+        clear = delete(model)
+        if since:
+            clear = clear.where(getattr(model, date_column) >= since)
+        if until:
+            clear = clear.where(getattr(model, date_column) < until)
+        if crop_names is not None:
+            clear = clear.where(model.crop_name.in_(crop_names))
+        db.execute(clear)
+
+        source = select(
+            MarketPrice.crop_name,
+            MarketPrice.market_name,
+            MarketPrice.state,
+            MarketPrice.district,
+            bucket,
+            func.min(MarketPrice.min_price),
+            func.max(MarketPrice.max_price),
+            func.sum(MarketPrice.min_price),
+            func.sum(MarketPrice.max_price),
+            func.coalesce(func.sum(MarketPrice.modal_price), 0),
+            func.count(MarketPrice.modal_price),
+            func.count(MarketPrice.id),
+            func.coalesce(func.sum(MarketPrice.arrival_quantity), 0)
+        ).group_by(
+            MarketPrice.crop_name,
+            MarketPrice.market_name,
+            MarketPrice.state,
+            MarketPrice.district,
+            bucket
+        )
+        if since:
+            source = source.where(MarketPrice.price_date >= datetime.combine(since, datetime.min.time()))
+        if until:
+            source = source.where(MarketPrice.price_date < datetime.combine(until, datetime.min.time()))
+        if crop_names is not None:
+            source = source.where(MarketPrice.crop_name.in_(crop_names))
+
+        result = db.execute(
+            insert(model.__table__).from_select(
+                [
+                    *ROLLUP_KEY_COLUMNS,
+                    date_column,
+                    "min_price",
+                    "max_price",
+                    "min_price_sum",
+                    "max_price_sum",
+                    "modal_price_sum",
+                    "modal_price_count",
+                    "record_count",
+                    "arrival_quantity_sum"
+                ],
+                source
+            )
+        )
+        return result.rowcount
+
+    def _upsert(self, db: Session, model, date_column: str, buckets: List[Dict[str, Any]]) -> None:
+        if not buckets:
+            return
+
+        dialect_name = db.get_bind().dialect.name
+        if dialect_name == "postgresql":
+            statement = postgresql.insert(model.__table__)
+            lowest, highest = func.least, func.greatest
+        elif dialect_name == "sqlite":
+            statement = sqlite.insert(model.__table__)
+            # SQLite's scalar min()/max() take several arguments
+            lowest, highest = func.min, func.max
+        else:
+            raise NotImplementedError(f"Market price rollups are not supported on {dialect_name}")
+
+        table = model.__table__
+        excluded = statement.excluded
+        statement = statement.on_conflict_do_update(
+            index_elements=[*ROLLUP_KEY_COLUMNS, date_column],
+            set_={
+                "min_price": lowest(table.c.min_price, excluded.min_price),
+                "max_price": highest(table.c.max_price, excluded.max_price),
+                "min_price_sum": table.c.min_price_sum + excluded.min_price_sum,
+                "max_price_sum": table.c.max_price_sum + excluded.max_price_sum,
+                "modal_price_sum": table.c.modal_price_sum + excluded.modal_price_sum,
+                "modal_price_count": table.c.modal_price_count + excluded.modal_price_count,
+                "record_count": table.c.record_count + excluded.record_count,
+                "arrival_quantity_sum": table.c.arrival_quantity_sum + excluded.arrival_quantity_sum,
+                "updated_at": func.now()
+            }
+        )
+
+        # executemany: SQLAlchemy batches the rows into multi-VALUES statements
+        db.execute(statement, buckets)
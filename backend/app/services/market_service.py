@@ -0,0 +1,132 @@
+from datetime import date, datetime, timedelta
+from typing import Dict, Any, List, Optional
+
+from sqlalchemy import func, select, Date, cast
+from sqlalchemy.orm import Session
+
+from app.core.search import name_filter
+from app.models.market import MarketPriceDaily, MarketPriceWeekly
+from app.services.market_trend_service import MarketTrendService
+
+
+PRICE_HISTORY_INTERVALS = ("day", "week", "month")
+
+
+def bucket_expression(column, interval: str, dialect_name: str):
+    """
+    SQL expression truncating a date or timestamp column to the start of
+    its day, week (Monday) or month
+    """
+    if interval not in PRICE_HISTORY_INTERVALS:
+        raise ValueError(f"interval must be one of {', '.join(PRICE_HISTORY_INTERVALS)}")
+
+    if dialect_name == "postgresql":
+        return cast(func.date_trunc(interval, column), Date)
+
+    if dialect_name == "sqlite":
+        if interval == "week":
+            # Next Sunday (or today), then back six days: the Monday of that week
+            return func.date(column, "weekday 0", "-6 days")
+        if interval == "month":
+            return func.date(column, "start of month")
+        return func.date(column)
+
+    # Other backends: daily buckets through the portable DATE() cast
+    if interval != "day":
+        raise ValueError(f"{interval} buckets are not supported on {dialect_name}")
+    return cast(column, Date)
+
+
+def _bucket_key(value) -> str:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()[:10]
+    return str(value)
+
+
+class MarketService:
+    def __init__(self):
+        pass
+
+    async def get_price_history(
+        self,
+        db: Session,
+        crop_name: str,
+        days: int = 30,
+        market_name: Optional[str] = None,
+        interval: str = "day"
+    ) -> List[Dict[str, Any]]:
+        """
+        Average min/max/modal prices per day, week or month from the daily
+        rollup, so the cost scales with the number of buckets
+        """
+        bucket = bucket_expression(MarketPriceDaily.price_date, interval, db.get_bind().dialect.name).label("bucket")
+        start_date = (datetime.utcnow() - timedelta(days=days)).date()
+        records = func.sum(MarketPriceDaily.record_count)
+
+        query = select(
+            bucket,
+            (func.sum(MarketPriceDaily.min_price_sum) / records).label("avg_min"),
+            (func.sum(MarketPriceDaily.max_price_sum) / records).label("avg_max"),
+            # None (not a division error) for buckets without modal prices
+            (
+                func.sum(MarketPriceDaily.modal_price_sum)
+                / func.nullif(func.sum(MarketPriceDaily.modal_price_count), 0)
+            ).label("avg_modal"),
+            records.label("records")
+        ).where(
+            name_filter(db, MarketPriceDaily.crop_name, "crop", crop_name),
+            MarketPriceDaily.price_date >= start_date
+        )
+
+        if market_name:
+            query = query.where(name_filter(db, MarketPriceDaily.market_name, "market", market_name))
+
+        rows = db.execute(query.group_by(bucket).order_by(bucket)).all()
+
+        return [
+            {
+                "date": _bucket_key(row.bucket),
+                "avg_min": row.avg_min,
+                "avg_max": row.avg_max,
+                "avg_modal": row.avg_modal,
+                "records": row.records
+            }
+            for row in rows
+        ]
+
+    async def get_market_trends(
+        self,
+        db: Session,
+        crop_name: Optional[str] = None,
+        days: int = 7,
+        ma_window: int = 7
+    ) -> List[Dict[str, Any]]:
+        """
+        Per-crop price change, moving average, volatility and direction over
+        the last `days` days of the daily rollup (cached until the next ingest)
+        """
+        return MarketTrendService().get_trends(db, crop_name=crop_name, days=days, ma_window=ma_window)
+
+    async def get_recent_price_ranges(self, db: Session, weeks: int = 4) -> Dict[str, Dict[str, float]]:
+        """
+        Average min/max price per crop (keyed by lower-cased name) over the
+        last few weeks of the weekly rollup
+        """
+        start_week = (datetime.utcnow() - timedelta(weeks=weeks)).date()
+        crop_key = func.lower(MarketPriceWeekly.crop_name)
+        records = func.sum(MarketPriceWeekly.record_count)
+
+        rows = db.execute(
+            select(
+                crop_key.label("crop"),
+                (func.sum(MarketPriceWeekly.min_price_sum) / records).label("avg_min"),
+                (func.sum(MarketPriceWeekly.max_price_sum) / records).label("avg_max")
+            ).where(
+                MarketPriceWeekly.week_start >= start_week
+            ).group_by(crop_key)
+        ).all()
+
+        return {
+            row.crop: {"min": round(row.avg_min, 2), "max": round(row.avg_max, 2)}
+            for row in rows
+        }
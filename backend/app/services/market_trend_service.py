@@ -0,0 +1,200 @@
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.search import name_filter
+from app.models.market import MarketPriceDaily
+
+
+# |percent change| below this over the window is reported as "stable"
+TREND_STABLE_PERCENT = 2.0
+
+# Markets listed per crop (most reported first), keeping the payload bounded
+MAX_TREND_MARKETS = 5
+
+
+def _round(value) -> Optional[float]:
+    return None if pd.isna(value) else round(float(value), 2)
+
+
+def representative_prices(frame: pd.DataFrame) -> pd.Series:
+    """Average modal price per row, or the mid-point of the average range without modal prices"""
+    modal_count = frame["modal_price_count"].where(frame["modal_price_count"] > 0)
+    range_mid = (frame["min_price_sum"] + frame["max_price_sum"]) / (2 * frame["record_count"])
+    return (frame["modal_price_sum"] / modal_count).fillna(range_mid)
+
+
+def compute_trends(
+    rows: pd.DataFrame,
+    start: datetime,
+    end: datetime,
+    ma_window: int = 7
+) -> List[Dict[str, Any]]:
+    """
+    Per-crop trend summary from daily rollup rows (one per crop, market and
+    day). All crops are computed at once on a day x crop price matrix:
+
+    - current_price: latest daily price (average modal, or range mid-point)
+    - moving_average: ma_window-day moving average on the last day
+    - price_change: percent change of the moving average across the window
+    - volatility: standard deviation of day-over-day percent changes
+    - trend: up / down / stable against TREND_STABLE_PERCENT
+    """
+    if rows.empty:
+        return []
+
+    rows = rows.assign(price_date=pd.to_datetime(rows["price_date"]))
+
+    # Day x crop price matrix; days without reports carry the last price forward
+    daily = rows.groupby(["price_date", "crop_name"])[
+        ["modal_price_sum", "modal_price_count", "min_price_sum", "max_price_sum", "record_count"]
+    ].sum()
+    days = pd.date_range(pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize(), freq="D")
+    prices = representative_prices(daily).unstack("crop_name").reindex(days).ffill()
+
+    moving_average = prices.rolling(ma_window, min_periods=1).mean()
+    first_average = moving_average.bfill().iloc[0]
+    last_average = moving_average.iloc[-1]
+    price_change = ((last_average - first_average) / first_average * 100).fillna(0.0)
+    volatility = (prices.pct_change(fill_method=None).std() * 100).fillna(0.0)
+    trend = np.select(
+        [price_change >= TREND_STABLE_PERCENT, price_change <= -TREND_STABLE_PERCENT],
+        ["up", "down"],
+        "stable"
+    )
+
+    per_crop = rows.groupby("crop_name").agg(
+        low=("min_price", "min"),
+        high=("max_price", "max"),
+        days_with_data=("price_date", "nunique")
+    )
+
+    # Latest price per market, busiest markets first
+    rows = rows.assign(price=representative_prices(rows)).sort_values("price_date")
+    markets = rows.groupby(["crop_name", "market_name"]).agg(
+        price=("price", "last"),
+        date=("price_date", "last"),
+        records=("record_count", "sum")
+    ).sort_values("records", ascending=False).groupby(level="crop_name").head(MAX_TREND_MARKETS)
+
+    market_lists: Dict[str, List[Dict[str, Any]]] = {}
+    for (crop_name, market_name), market in markets.iterrows():
+        market_lists.setdefault(crop_name, []).append({
+            "market_name": market_name,
+            "price": _round(market["price"]),
+            "date": market["date"].date()
+        })
+
+    current_price = prices.iloc[-1]
+    trends = [
+        {
+            "crop_name": crop_name,
+            "current_price": _round(current_price[crop_name]),
+            "moving_average": _round(last_average[crop_name]),
+            "price_change": _round(price_change[crop_name]),
+            "volatility": _round(volatility[crop_name]),
+            "trend": str(crop_trend),
+            "low": _round(per_crop.at[crop_name, "low"]),
+            "high": _round(per_crop.at[crop_name, "high"]),
+            "days_with_data": int(per_crop.at[crop_name, "days_with_data"]),
+            "markets": market_lists.get(crop_name, [])
+        }
+        for crop_name, crop_trend in zip(prices.columns, trend)
+    ]
+    trends.sort(key=lambda item: item["crop_name"])
+    return trends
+
+
+class MarketTrendCache:
+    """
+    Process-local cache of trend summaries keyed by (crop filter, window,
+    moving-average window).
+
+    Ingests and backfills in this process bump the version, dropping every
+    entry; entries also expire after MARKET_TREND_CACHE_TTL seconds to pick
+    up ingests run from other processes (the CLI or other workers).
+    """
+
+    def __init__(self, ttl_seconds: Optional[int] = None):
+        self.ttl_seconds = ttl_seconds or settings.MARKET_TREND_CACHE_TTL
+        self.version = 0
+        self._entries: Dict[tuple, tuple] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> Optional[List[Dict[str, Any]]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        trends, version, expires_at = entry
+        if version != self.version or expires_at < time.monotonic():
+            with self._lock:
+                self._entries.pop(key, None)
+            return None
+        return trends
+
+    def put(self, key: tuple, trends: List[Dict[str, Any]], version: int) -> None:
+        with self._lock:
+            self._entries[key] = (trends, version, time.monotonic() + self.ttl_seconds)
+
+    def bump_version(self) -> None:
+        """Invalidate every entry; called after market prices change"""
+        with self._lock:
+            self.version += 1
+            self._entries.clear()
+
+
+trend_cache = MarketTrendCache()
+
+
+class MarketTrendService:
+    def __init__(self, cache: Optional[MarketTrendCache] = None):
+        self.cache = cache or trend_cache
+
+    def get_trends(
+        self,
+        db: Session,
+        crop_name: Optional[str] = None,
+        days: int = 7,
+        ma_window: int = 7
+    ) -> List[Dict[str, Any]]:
+        key = ((crop_name or "").strip().lower(), days, ma_window)
+        trends = self.cache.get(key)
+        if trends is not None:
+            return trends
+
+        # Read the version first so an ingest finishing mid-computation
+        # leaves this entry stale rather than cached under the new version
+        version = self.cache.version
+        end = datetime.utcnow()
+        start = end - timedelta(days=days)
+
+        query = select(
+            MarketPriceDaily.crop_name,
+            MarketPriceDaily.market_name,
+            MarketPriceDaily.price_date,
+            MarketPriceDaily.min_price,
+            MarketPriceDaily.max_price,
+            MarketPriceDaily.min_price_sum,
+            MarketPriceDaily.max_price_sum,
+            MarketPriceDaily.modal_price_sum,
+            MarketPriceDaily.modal_price_count,
+            MarketPriceDaily.record_count
+        ).where(MarketPriceDaily.price_date >= start.date())
+
+        if crop_name:
+            query = query.where(name_filter(db, MarketPriceDaily.crop_name, "crop", crop_name))
+
+        result = db.execute(query)
+        rows = pd.DataFrame(result.all(), columns=list(result.keys()))
+
+        trends = compute_trends(rows, start, end, ma_window=ma_window)
+        self.cache.put(key, trends, version)
+        return trends
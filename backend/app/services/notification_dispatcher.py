@@ -0,0 +1,341 @@
+import asyncio
+import json
+import random
+import time
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Iterable, Tuple, Callable, Awaitable
+
+import httpx
+
+from app.core.config import settings
+
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Delivery methods with a provider; anything else (push, email, ...) is never sent
+DISPATCH_METHODS = ("sms", "whatsapp")
+
+
+def format_sms_number(phone_number: str) -> str:
+    """Format phone number for Twilio (E.164, India by default)"""
+    return f"+91{phone_number}" if not phone_number.startswith('+') else phone_number
+
+
+def format_whatsapp_number(phone_number: str) -> str:
+    """Format phone number for WhatsApp Business API (no leading +)"""
+    return f"91{phone_number}" if not phone_number.startswith('91') else phone_number
+
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter shared by all tasks sending to one provider
+    """
+
+    def __init__(self, rate_per_second: float, capacity: Optional[float] = None):
+        self.rate = rate_per_second
+        self.capacity = capacity or rate_per_second
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+@dataclass
+class OutboundMessage:
+    phone_number: str
+    message: str
+    delivery_method: str = "sms"
+    user_id: Optional[int] = None
+    notification_id: Optional[int] = None
+
+
+@dataclass
+class DispatchResult:
+    message: OutboundMessage
+    success: bool
+    attempts: int
+    status_code: Optional[int] = None
+    error: Optional[str] = None
+    delivered: bool = False  # True only when delivery is confirmed synchronously (mock mode)
+
+
+class NotificationDispatcher:
+    """
+    Fans outbound SMS/WhatsApp messages out over a pooled async HTTP client.
+
+    Concurrency is bounded by a semaphore, each provider has its own token
+    bucket, and retryable failures (429/5xx/transport errors) are retried with
+    full-jitter exponential backoff.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        max_retries: Optional[int] = None,
+        client: Optional[httpx.AsyncClient] = None
+    ):
+        self.max_concurrency = max_concurrency or settings.NOTIFICATION_MAX_CONCURRENCY
+        self.max_retries = settings.NOTIFICATION_MAX_RETRIES if max_retries is None else max_retries
+        self.retry_base_delay = settings.NOTIFICATION_RETRY_BASE_DELAY
+
+        self.twilio_account_sid = settings.TWILIO_ACCOUNT_SID
+        self.twilio_auth_token = settings.TWILIO_AUTH_TOKEN
+        self.twilio_phone_number = settings.TWILIO_PHONE_NUMBER
+        self.whatsapp_access_token = settings.WHATSAPP_ACCESS_TOKEN
+        self.whatsapp_phone_number_id = settings.WHATSAPP_PHONE_NUMBER_ID
+
+        self.rate_limiters = {
+            "sms": TokenBucket(settings.TWILIO_RATE_LIMIT_PER_SECOND),
+            "whatsapp": TokenBucket(settings.WHATSAPP_RATE_LIMIT_PER_SECOND)
+        }
+
+        self._client = client
+        self._owns_client = client is None
+
+    async def __aenter__(self) -> "NotificationDispatcher":
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency,
+                    max_keepalive_connections=self.max_concurrency
+                ),
+                timeout=settings.NOTIFICATION_HTTP_TIMEOUT
+            )
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if self._owns_client and self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def dispatch(self, messages: Iterable[OutboundMessage]) -> Dict[str, Any]:
+        """
+        Send all messages concurrently and aggregate the results
+        """
+        return self.aggregate(await self.dispatch_results(messages))
+
+    async def dispatch_results(self, messages: Iterable[OutboundMessage]) -> List[DispatchResult]:
+        """
+        Send all messages concurrently and return per-message results
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def _bounded_send(outbound: OutboundMessage) -> DispatchResult:
+            async with semaphore:
+                return await self.send(outbound)
+
+        if self._client is None:
+            async with self:
+                return list(await asyncio.gather(*(_bounded_send(m) for m in messages)))
+
+        return list(await asyncio.gather(*(_bounded_send(m) for m in messages)))
+
+    async def send(self, outbound: OutboundMessage) -> DispatchResult:
+        """
+        Send a single message, retrying retryable failures with jittered backoff
+        """
+        method = outbound.delivery_method
+        if method not in DISPATCH_METHODS:
+            return DispatchResult(
+                message=outbound, success=False, attempts=0, error=f"unsupported delivery method: {method}"
+            )
+
+        if not self._has_credentials(method):
+            print(f"📱 Mock {method} to {outbound.phone_number}: {outbound.message}")
+            return DispatchResult(message=outbound, success=True, attempts=1, delivered=True)
+
+        success, attempts, status_code, error = await self._post_with_retries(
+            method, lambda: self._post(method, outbound)
+        )
+        return DispatchResult(
+            message=outbound, success=success, attempts=attempts, status_code=status_code, error=error
+        )
+
+    async def dispatch_grouped(
+        self,
+        groups: Dict[Tuple[str, str], List[OutboundMessage]]
+    ) -> Dict[str, Any]:
+        """
+        Send messages grouped by (rendered message, delivery method).
+
+        SMS groups go out through the Twilio Notify bulk API when a Notify
+        service is configured, one request per TWILIO_NOTIFY_BATCH_SIZE
+        recipients. Everything else falls back to per-recipient sends that
+        share the already-rendered message body.
+        """
+        results: List[DispatchResult] = []
+
+        async def _run() -> None:
+            per_recipient: List[OutboundMessage] = []
+
+            for (message, method), recipients in groups.items():
+                if method == "sms" and self._has_notify_service():
+                    results.extend(await self._send_notify_group(message, recipients))
+                elif method in DISPATCH_METHODS and not self._has_credentials(method):
+                    print(f"📱 Mock bulk {method} to {len(recipients)} recipients: {message}")
+                    results.extend(
+                        DispatchResult(message=r, success=True, attempts=1, delivered=True)
+                        for r in recipients
+                    )
+                else:
+                    per_recipient.extend(recipients)
+
+            if per_recipient:
+                results.extend(await self.dispatch_results(per_recipient))
+
+        if self._client is None:
+            async with self:
+                await _run()
+        else:
+            await _run()
+
+        summary = self.aggregate(results)
+        summary["groups"] = len(groups)
+        return summary
+
+    async def _send_notify_group(self, message: str, recipients: List[OutboundMessage]) -> List[DispatchResult]:
+        batch_size = settings.TWILIO_NOTIFY_BATCH_SIZE
+        results: List[DispatchResult] = []
+
+        for i in range(0, len(recipients), batch_size):
+            chunk = recipients[i:i + batch_size]
+            success, attempts, status_code, error = await self._post_with_retries(
+                "sms", lambda chunk=chunk: self._post_notify(message, chunk)
+            )
+            results.extend(
+                DispatchResult(
+                    message=r, success=success, attempts=attempts, status_code=status_code, error=error
+                )
+                for r in chunk
+            )
+
+        return results
+
+    async def _post_with_retries(
+        self,
+        method: str,
+        post: Callable[[], Awaitable[httpx.Response]]
+    ) -> Tuple[bool, int, Optional[int], Optional[str]]:
+        """
+        Run a provider request under the method's rate limiter, retrying
+        retryable failures; returns (success, attempts, status_code, error)
+        """
+        attempt = 0
+        status_code = None
+        error = None
+
+        while attempt <= self.max_retries:
+            attempt += 1
+            await self.rate_limiters[method].acquire()
+
+            try:
+                response = await post()
+                status_code = response.status_code
+
+                if status_code in (200, 201):
+                    return True, attempt, status_code, None
+
+                error = response.text
+                if status_code not in RETRYABLE_STATUS_CODES:
+                    break
+
+                retry_after = response.headers.get("Retry-After")
+                delay = float(retry_after) if retry_after and retry_after.isdigit() else None
+
+            except httpx.TransportError as e:
+                error = str(e)
+                delay = None
+
+            except (httpx.HTTPError, httpx.InvalidURL) as e:
+                # Not retryable (bad URL, undecodable body, ...): fail this
+                # request alone instead of the whole gather
+                error = str(e) or e.__class__.__name__
+                break
+
+            if attempt <= self.max_retries:
+                await asyncio.sleep(delay if delay is not None else self._backoff_delay(attempt))
+
+        return False, attempt, status_code, error
+
+    @staticmethod
+    def aggregate(results: List[DispatchResult]) -> Dict[str, Any]:
+        """
+        Aggregate per-message results into counters
+        """
+        summary = {"success": 0, "failed": 0, "retried": 0, "by_method": {}, "failed_user_ids": []}
+
+        for result in results:
+            method = result.message.delivery_method
+            by_method = summary["by_method"].setdefault(method, {"success": 0, "failed": 0})
+
+            if result.success:
+                summary["success"] += 1
+                by_method["success"] += 1
+            else:
+                summary["failed"] += 1
+                by_method["failed"] += 1
+                if result.message.user_id is not None:
+                    summary["failed_user_ids"].append(result.message.user_id)
+
+            if result.attempts > 1:
+                summary["retried"] += 1
+
+        return summary
+
+    def _backoff_delay(self, attempt: int) -> float:
+        """Full-jitter exponential backoff"""
+        return random.uniform(0, self.retry_base_delay * (2 ** (attempt - 1)))
+
+    def _has_credentials(self, method: str) -> bool:
+        if method == "whatsapp":
+            return bool(self.whatsapp_access_token and self.whatsapp_phone_number_id)
+        return bool(self.twilio_account_sid and self.twilio_auth_token)
+
+    def _has_notify_service(self) -> bool:
+        return bool(settings.TWILIO_NOTIFY_SERVICE_SID and self._has_credentials("sms"))
+
+    async def _post_notify(self, message: str, recipients: List[OutboundMessage]) -> httpx.Response:
+        bindings = [
+            json.dumps({"binding_type": "sms", "address": format_sms_number(r.phone_number)})
+            for r in recipients
+        ]
+        return await self._client.post(
+            f"{settings.TWILIO_NOTIFY_BASE_URL}/v1/Services/{settings.TWILIO_NOTIFY_SERVICE_SID}/Notifications",
+            data={"ToBinding": bindings, "Body": message},
+            auth=(self.twilio_account_sid, self.twilio_auth_token)
+        )
+
+    async def _post(self, method: str, outbound: OutboundMessage) -> httpx.Response:
+        if method == "whatsapp":
+            return await self._client.post(
+                f"{settings.WHATSAPP_API_BASE_URL}/{self.whatsapp_phone_number_id}/messages",
+                headers={"Authorization": f"Bearer {self.whatsapp_access_token}"},
+                json={
+                    "messaging_product": "whatsapp",
+                    "to": format_whatsapp_number(outbound.phone_number),
+                    "type": "text",
+                    "text": {"body": outbound.message}
+                }
+            )
+
+        return await self._client.post(
+            f"{settings.TWILIO_API_BASE_URL}/2010-04-01/Accounts/{self.twilio_account_sid}/Messages.json",
+            data={
+                "From": self.twilio_phone_number,
+                "To": format_sms_number(outbound.phone_number),
+                "Body": outbound.message
+            },
+            auth=(self.twilio_account_sid, self.twilio_auth_token)
+        )
@@ -0,0 +1,258 @@
+import json
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Iterable, FrozenSet
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.notification import NotificationPreference
+from app.models.user import User
+
+
+DELIVERY_METHODS = ("sms", "whatsapp")
+
+# Keep IN lists under SQLite's bound-parameter limit
+ROUTE_QUERY_CHUNK_SIZE = 900
+
+
+@dataclass(frozen=True)
+class NotificationRoute:
+    """
+    Everything needed to route a message to one user
+    """
+    user_id: int
+    phone_number: str
+    delivery_method: str = "sms"
+    language: str = "hi"
+    quiet_hours_start: Optional[int] = None
+    quiet_hours_end: Optional[int] = None
+    is_opted_out: bool = False
+    opted_out_types: FrozenSet[str] = frozenset()
+
+    def allows(self, notification_type: str, at: Optional[datetime] = None) -> bool:
+        """Check opt-outs and quiet hours for a notification type"""
+        if self.is_opted_out or notification_type in self.opted_out_types:
+            return False
+        return not self.in_quiet_hours(at)
+
+    def in_quiet_hours(self, at: Optional[datetime] = None) -> bool:
+        if self.quiet_hours_start is None or self.quiet_hours_end is None:
+            return False
+
+        hour = (at or datetime.now()).hour
+        if self.quiet_hours_start <= self.quiet_hours_end:
+            return self.quiet_hours_start <= hour < self.quiet_hours_end
+        return hour >= self.quiet_hours_start or hour < self.quiet_hours_end
+
+
+def normalize_preferences(preferences: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Map a notification preferences payload onto NotificationPreference columns
+    """
+    delivery_method = preferences.get("delivery_method", "sms")
+    if delivery_method not in DELIVERY_METHODS:
+        delivery_method = "sms"
+
+    quiet_hours = preferences.get("quiet_hours") or {}
+    opted_out_types = preferences.get("opted_out_types") or []
+
+    return {
+        "delivery_method": delivery_method,
+        "language": preferences.get("language"),
+        "quiet_hours_start": quiet_hours.get("start"),
+        "quiet_hours_end": quiet_hours.get("end"),
+        "is_opted_out": bool(preferences.get("opt_out", False)),
+        "opted_out_types": ",".join(opted_out_types) if opted_out_types else None
+    }
+
+
+class NotificationPreferenceCache:
+    """
+    Process-local user_id -> NotificationRoute cache backed by the
+    notification_preferences table.
+
+    Entries expire after NOTIFICATION_PREFERENCE_CACHE_TTL seconds and are
+    dropped immediately when preferences are saved through this cache. At
+    max_entries, expired entries (or else the oldest tenth) are evicted.
+    """
+
+    def __init__(self, ttl_seconds: Optional[int] = None, max_entries: int = 10000):
+        self.ttl_seconds = ttl_seconds or settings.NOTIFICATION_PREFERENCE_CACHE_TTL
+        self.max_entries = max_entries
+        self._routes: Dict[int, tuple] = {}
+        self._lock = threading.Lock()
+
+    def get(self, user_id: int) -> Optional[NotificationRoute]:
+        entry = self._routes.get(user_id)
+        if entry is None:
+            return None
+
+        route, expires_at = entry
+        if expires_at < time.monotonic():
+            self._routes.pop(user_id, None)
+            return None
+        return route
+
+    def put(self, route: NotificationRoute) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if len(self._routes) >= self.max_entries:
+                expired = [key for key, (_, expires_at) in self._routes.items() if expires_at < now]
+                for key in expired or list(self._routes)[:max(1, self.max_entries // 10)]:
+                    del self._routes[key]
+            self._routes[route.user_id] = (route, now + self.ttl_seconds)
+
+    def invalidate(self, user_id: int) -> None:
+        with self._lock:
+            self._routes.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._routes.clear()
+
+    def route_for_user(self, user: User) -> NotificationRoute:
+        """
+        Route for an already-loaded User; only hits the database on a cache miss
+        """
+        route = self.get(user.id)
+        if route is None:
+            route = self._build_route(
+                user.id,
+                user.phone_number,
+                user.preferred_language,
+                user.notification_preference,
+                user.notification_preferences
+            )
+            self.put(route)
+        return route
+
+    def get_routes(self, db: Session, user_ids: Iterable[int]) -> Dict[int, NotificationRoute]:
+        """
+        Routes for many users, loading cache misses with one column-only
+        query per ROUTE_QUERY_CHUNK_SIZE ids
+        """
+        routes: Dict[int, NotificationRoute] = {}
+        missing: List[int] = []
+
+        for user_id in user_ids:
+            route = self.get(user_id)
+            if route is None:
+                missing.append(user_id)
+            else:
+                routes[user_id] = route
+
+        for i in range(0, len(missing), ROUTE_QUERY_CHUNK_SIZE):
+            chunk = missing[i:i + ROUTE_QUERY_CHUNK_SIZE]
+            for route in self._load_routes(db, User.id.in_(chunk)):
+                routes[route.user_id] = route
+
+        return routes
+
+    def resolve_routes(self, db: Session, *criteria) -> List[NotificationRoute]:
+        """
+        Routes for every active user matching the given User criteria
+        (e.g. User.district == "Ludhiana") in a single query
+        """
+        return self._load_routes(db, User.is_active == True, *criteria)
+
+    def save_preferences(self, user_id: int, preferences: Dict[str, Any], db: Session) -> None:
+        """
+        Persist preferences to both the JSON column and the typed side table,
+        then invalidate the cached route
+        """
+        user = db.query(User).filter(User.id == user_id).first()
+        if not user:
+            raise ValueError("User not found")
+
+        user.notification_preferences = json.dumps(preferences)
+
+        columns = normalize_preferences(preferences)
+        row = db.get(NotificationPreference, user_id)
+        if row is None:
+            db.add(NotificationPreference(user_id=user_id, **columns))
+        else:
+            for field, value in columns.items():
+                setattr(row, field, value)
+
+        db.commit()
+        self.invalidate(user_id)
+
+    def _load_routes(self, db: Session, *criteria) -> List[NotificationRoute]:
+        rows = db.execute(
+            select(
+                User.id,
+                User.phone_number,
+                User.preferred_language,
+                User.notification_preferences,
+                NotificationPreference.user_id.label("pref_user_id"),
+                NotificationPreference.delivery_method,
+                NotificationPreference.language,
+                NotificationPreference.quiet_hours_start,
+                NotificationPreference.quiet_hours_end,
+                NotificationPreference.is_opted_out,
+                NotificationPreference.opted_out_types
+            )
+            .outerjoin(NotificationPreference, NotificationPreference.user_id == User.id)
+            .where(*criteria)
+        ).all()
+
+        routes = []
+        for row in rows:
+            preference = row if row.pref_user_id is not None else None
+            route = self._build_route(
+                row.id, row.phone_number, row.preferred_language, preference, row.notification_preferences
+            )
+            self.put(route)
+            routes.append(route)
+        return routes
+
+    @staticmethod
+    def _build_route(
+        user_id: int,
+        phone_number: str,
+        preferred_language: Optional[str],
+        preference,
+        legacy_json: Optional[str]
+    ) -> NotificationRoute:
+        if preference is None and legacy_json:
+            # Users whose preferences predate the side table: parse once, then cached
+            try:
+                columns = normalize_preferences(json.loads(legacy_json))
+            except (ValueError, AttributeError):
+                columns = None
+        elif preference is not None:
+            columns = {
+                "delivery_method": preference.delivery_method,
+                "language": preference.language,
+                "quiet_hours_start": preference.quiet_hours_start,
+                "quiet_hours_end": preference.quiet_hours_end,
+                "is_opted_out": preference.is_opted_out,
+                "opted_out_types": preference.opted_out_types
+            }
+        else:
+            columns = None
+
+        if not columns:
+            return NotificationRoute(
+                user_id=user_id,
+                phone_number=phone_number,
+                language=preferred_language or "hi"
+            )
+
+        return NotificationRoute(
+            user_id=user_id,
+            phone_number=phone_number,
+            delivery_method=columns["delivery_method"] or "sms",
+            language=columns["language"] or preferred_language or "hi",
+            quiet_hours_start=columns["quiet_hours_start"],
+            quiet_hours_end=columns["quiet_hours_end"],
+            is_opted_out=bool(columns["is_opted_out"]),
+            opted_out_types=frozenset(filter(None, (columns["opted_out_types"] or "").split(",")))
+        )
+
+
+preference_cache = NotificationPreferenceCache()
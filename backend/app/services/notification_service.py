@@ -1,12 +1,64 @@
 import asyncio
 import requests
-from typing import Dict, Any, List, Optional
+from collections import defaultdict
+from typing import Dict, Any, List, Optional, Tuple, Callable, Union
 from datetime import datetime, timedelta
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
 from app.models.notification import Notification
 from app.models.user import User
+from app.services.notification_preference_service import NotificationRoute, preference_cache
+from app.services.notification_dispatcher import (
+    NotificationDispatcher,
+    OutboundMessage,
+    format_sms_number,
+    format_whatsapp_number
+)
+
+
+# Alert message templates by category, key and language (falls back to Hindi)
+ALERT_TEMPLATES = {
+    "weather": {
+        "heavy_rain": {
+            "hi": "🌧️ भारी बारिश की चेतावनी! तापमान: {temperature}°C, आर्द्रता: {humidity}%। खेत की सुरक्षा के लिए उचित कदम उठाएं।",
+            "en": "🌧️ Heavy rain warning! Temperature: {temperature}°C, humidity: {humidity}%. Take steps to protect your field."
+        },
+        "high_temperature": {
+            "hi": "🌡️ उच्च तापमान चेतावनी! तापमान: {temperature}°C। पौधों को अधिक पानी दें और छाया का प्रबंध करें।",
+            "en": "🌡️ High temperature warning! Temperature: {temperature}°C. Water plants more and arrange shade."
+        },
+        "high_humidity": {
+            "hi": "💧 उच्च आर्द्रता! आर्द्रता: {humidity}%। फंगल रोगों से सावधान रहें।",
+            "en": "💧 High humidity! Humidity: {humidity}%. Watch out for fungal diseases."
+        },
+        "normal": {
+            "hi": "🌤️ मौसम अपडेट: तापमान {temperature}°C, आर्द्रता {humidity}%। खेती के लिए अनुकूल मौसम।",
+            "en": "🌤️ Weather update: temperature {temperature}°C, humidity {humidity}%. Favourable weather for farming."
+        }
+    },
+    "market": {
+        "price_update": {
+            "hi": "💰 {crop_name} की कीमत अपडेट: {market_name} में ₹{min_price}-{max_price} प्रति क्विंटल। बेहतर मूल्य के लिए बाजार की जांच करें।",
+            "en": "💰 {crop_name} price update: ₹{min_price}-{max_price} per quintal at {market_name}. Check the market for better prices."
+        },
+        "price_alert_above": {
+            "hi": "📈 {crop_name} का भाव {market_name} में ₹{price} प्रति क्विंटल पहुंच गया, आपके लक्ष्य ₹{target_price} से ऊपर।",
+            "en": "📈 {crop_name} reached ₹{price} per quintal at {market_name}, above your target of ₹{target_price}."
+        },
+        "price_alert_below": {
+            "hi": "📉 {crop_name} का भाव {market_name} में ₹{price} प्रति क्विंटल हो गया, आपके लक्ष्य ₹{target_price} से नीचे।",
+            "en": "📉 {crop_name} fell to ₹{price} per quintal at {market_name}, below your target of ₹{target_price}."
+        }
+    },
+    "disease": {
+        "detected": {
+            "hi": "{severity_emoji} {crop_name} में {disease_name} की पहचान हुई है। तुरंत उपचार की आवश्यकता है। विशेषज्ञ सलाह लें।",
+            "en": "{severity_emoji} {disease_name} detected in {crop_name}. Immediate treatment is needed. Consult an expert."
+        }
+    }
+}
 
 
 class NotificationService:
@@ -27,11 +79,11 @@ class NotificationService:
                 return self._mock_sms_send(phone_number, otp)
             
             # Format phone number for India
-            formatted_phone = f"+91{phone_number}" if not phone_number.startswith('+') else phone_number
+            formatted_phone = format_sms_number(phone_number)
             
             message = f"Your Smart Crop Advisory OTP is: {otp}. Valid for 5 minutes. Do not share with anyone."
             
-            url = f"https://api.twilio.com/2010-04-01/Accounts/{self.twilio_account_sid}/Messages.json"
+            url = f"{settings.TWILIO_API_BASE_URL}/2010-04-01/Accounts/{self.twilio_account_sid}/Messages.json"
             
             data = {
                 "From": self.twilio_phone_number,
@@ -66,9 +118,9 @@ class NotificationService:
                 return self._mock_whatsapp_send(phone_number, message)
             
             # Format phone number for India
-            formatted_phone = f"91{phone_number}" if not phone_number.startswith('91') else phone_number
+            formatted_phone = format_whatsapp_number(phone_number)
             
-            url = f"https://graph.facebook.com/v17.0/{self.whatsapp_phone_number_id}/messages"
+            url = f"{settings.WHATSAPP_API_BASE_URL}/{self.whatsapp_phone_number_id}/messages"
             
             headers = {
                 "Authorization": f"Bearer {self.whatsapp_access_token}",
@@ -128,20 +180,7 @@ class NotificationService:
         Send weather alert to user
         """
         try:
-            temperature = weather_data.get("temperature", 0)
-            humidity = weather_data.get("humidity", 0)
-            rainfall = weather_data.get("rainfall", 0)
-            
-            # Generate weather alert message
-            if rainfall > 10:
-                message = f"🌧️ भारी बारिश की चेतावनी! तापमान: {temperature}°C, आर्द्रता: {humidity}%। खेत की सुरक्षा के लिए उचित कदम उठाएं।"
-            elif temperature > 35:
-                message = f"🌡️ उच्च तापमान चेतावनी! तापमान: {temperature}°C। पौधों को अधिक पानी दें और छाया का प्रबंध करें।"
-            elif humidity > 80:
-                message = f"💧 उच्च आर्द्रता! आर्द्रता: {humidity}%। फंगल रोगों से सावधान रहें।"
-            else:
-                message = f"🌤️ मौसम अपडेट: तापमान {temperature}°C, आर्द्रता {humidity}%। खेती के लिए अनुकूल मौसम।"
-            
+            message = self._render_weather_alert(weather_data, user.preferred_language)
             return await self.send_farming_reminder(user, "weather_alert", message)
             
         except Exception as e:
@@ -158,12 +197,7 @@ class NotificationService:
         Send market price alert to user
         """
         try:
-            min_price = price_data.get("min_price", 0)
-            max_price = price_data.get("max_price", 0)
-            market_name = price_data.get("market_name", "Local Market")
-            
-            message = f"💰 {crop_name} की कीमत अपडेट: {market_name} में ₹{min_price}-{max_price} प्रति क्विंटल। बेहतर मूल्य के लिए बाजार की जांच करें।"
-            
+            message = self._render_market_price_alert(crop_name, price_data, user.preferred_language)
             return await self.send_farming_reminder(user, "market_alert", message)
             
         except Exception as e:
@@ -181,29 +215,159 @@ class NotificationService:
         Send pest/disease alert to user
         """
         try:
-            severity_emoji = "🔴" if severity == "high" else "🟡" if severity == "medium" else "🟢"
-            
-            message = f"{severity_emoji} {crop_name} में {disease_name} की पहचान हुई है। तुरंत उपचार की आवश्यकता है। विशेषज्ञ सलाह लें।"
-            
+            message = self._render_pest_disease_alert(crop_name, disease_name, severity, user.preferred_language)
             return await self.send_farming_reminder(user, "disease_alert", message)
             
         except Exception as e:
             print(f"Pest/disease alert sending error: {e}")
             return False
 
+    async def send_weather_alert_bulk(
+        self,
+        users: List[Union[User, NotificationRoute]],
+        weather_data: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Send the same weather alert to many users (e.g. a whole district)
+        """
+        return await self._send_grouped_alert(
+            users, "weather_alert", lambda language: self._render_weather_alert(weather_data, language)
+        )
+
+    async def send_market_price_alert_bulk(
+        self,
+        users: List[Union[User, NotificationRoute]],
+        crop_name: str,
+        price_data: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Send the same market price alert to many users
+        """
+        return await self._send_grouped_alert(
+            users, "market_alert", lambda language: self._render_market_price_alert(crop_name, price_data, language)
+        )
+
+    async def send_pest_disease_alert_bulk(
+        self,
+        users: List[Union[User, NotificationRoute]],
+        crop_name: str,
+        disease_name: str,
+        severity: str
+    ) -> Dict[str, Any]:
+        """
+        Send the same pest/disease alert to many users
+        """
+        return await self._send_grouped_alert(
+            users, "disease_alert", lambda language: self._render_pest_disease_alert(crop_name, disease_name, severity, language)
+        )
+
+    async def _send_grouped_alert(
+        self,
+        recipients: List[Union[User, NotificationRoute]],
+        notification_type: str,
+        render: Callable[[str], str],
+        dispatcher: Optional[NotificationDispatcher] = None
+    ) -> Dict[str, Any]:
+        """
+        Render the alert once per language and send one group per
+        (message, delivery method) instead of one request per user
+        """
+        rendered: Dict[str, str] = {}
+        groups: Dict[Tuple[str, str], List[OutboundMessage]] = defaultdict(list)
+        suppressed = 0
+        now = datetime.now()
+        
+        for route in self._to_routes(recipients):
+            if not route.allows(notification_type, now):
+                suppressed += 1
+                continue
+            
+            if route.language not in rendered:
+                rendered[route.language] = render(route.language)
+            
+            message = rendered[route.language]
+            groups[(message, route.delivery_method)].append(
+                OutboundMessage(
+                    phone_number=route.phone_number,
+                    message=message,
+                    delivery_method=route.delivery_method,
+                    user_id=route.user_id
+                )
+            )
+        
+        results = await (dispatcher or NotificationDispatcher()).dispatch_grouped(groups)
+        results["suppressed"] = suppressed
+        return results
+
+    def _render_weather_alert(self, weather_data: Dict[str, Any], language: str = "hi") -> str:
+        """
+        Render weather alert text
+        """
+        temperature = weather_data.get("temperature", 0)
+        humidity = weather_data.get("humidity", 0)
+        rainfall = weather_data.get("rainfall", 0)
+        
+        if rainfall > 10:
+            key = "heavy_rain"
+        elif temperature > 35:
+            key = "high_temperature"
+        elif humidity > 80:
+            key = "high_humidity"
+        else:
+            key = "normal"
+        
+        template = self._alert_template("weather", key, language)
+        return template.format(temperature=temperature, humidity=humidity, rainfall=rainfall)
+
+    def _render_market_price_alert(self, crop_name: str, price_data: Dict[str, Any], language: str = "hi") -> str:
+        """
+        Render market price alert text
+        """
+        template = self._alert_template("market", "price_update", language)
+        return template.format(
+            crop_name=crop_name,
+            market_name=price_data.get("market_name", "Local Market"),
+            min_price=price_data.get("min_price", 0),
+            max_price=price_data.get("max_price", 0)
+        )
+
+    def _render_price_alert(self, match: Dict[str, Any], language: str = "hi") -> str:
+        """
+        Render triggered price alert text
+        """
+        template = self._alert_template("market", f"price_alert_{match['alert_type']}", language)
+        return template.format(
+            crop_name=match["crop_name"],
+            market_name=match["market_name"],
+            price=f"{match['price']:g}",
+            target_price=f"{match['target_price']:g}"
+        )
+
+    def _render_pest_disease_alert(self, crop_name: str, disease_name: str, severity: str, language: str = "hi") -> str:
+        """
+        Render pest/disease alert text
+        """
+        severity_emoji = "🔴" if severity == "high" else "🟡" if severity == "medium" else "🟢"
+        template = self._alert_template("disease", "detected", language)
+        return template.format(severity_emoji=severity_emoji, crop_name=crop_name, disease_name=disease_name)
+
+    @staticmethod
+    def _alert_template(category: str, key: str, language: str) -> str:
+        templates = ALERT_TEMPLATES[category][key]
+        return templates.get(language) or templates["hi"]
+
     def _get_user_preferred_delivery_method(self, user: User) -> str:
         """
         Get user's preferred notification delivery method
         """
-        try:
-            if user.notification_preferences:
-                import json
-                preferences = json.loads(user.notification_preferences)
-                return preferences.get("delivery_method", "sms")
-        except:
-            pass
-        
-        return "sms"  # Default to SMS
+        return preference_cache.route_for_user(user).delivery_method
+
+    @staticmethod
+    def _to_routes(recipients: List[Union[User, NotificationRoute]]) -> List[NotificationRoute]:
+        return [
+            recipient if isinstance(recipient, NotificationRoute) else preference_cache.route_for_user(recipient)
+            for recipient in recipients
+        ]
 
     def _mock_sms_send(self, phone_number: str, message: str) -> bool:
         """
@@ -254,27 +418,67 @@ class NotificationService:
             print(f"Notification scheduling error: {e}")
             raise e
 
+    def queue_market_price_alerts(self, db: Session, matches: List[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Queue triggered price alerts as pending notifications for the outbox
+        worker with one executemany insert, in the caller's transaction
+        (does not commit). Users who opted out of market alerts are skipped.
+        """
+        routes = preference_cache.get_routes(db, {match["user_id"] for match in matches})
+        now = datetime.utcnow()
+        rows: List[Dict[str, Any]] = []
+        suppressed = 0
+        
+        for match in matches:
+            route = routes.get(match["user_id"])
+            if route is None or route.is_opted_out or "market_alert" in route.opted_out_types:
+                suppressed += 1
+                continue
+            
+            rows.append({
+                "user_id": match["user_id"],
+                "title": f"{match['crop_name']} price alert",
+                "message": self._render_price_alert(match, route.language),
+                "notification_type": "market_alert",
+                "crop_name": match["crop_name"],
+                "priority": "high",
+                "delivery_method": route.delivery_method,
+                "delivery_status": "pending",
+                "scheduled_at": now,
+                "language": route.language
+            })
+        
+        if rows:
+            db.execute(insert(Notification), rows)
+        return {"queued": len(rows), "suppressed": suppressed}
+
     async def send_bulk_notifications(
         self,
-        users: List[User],
+        users: List[Union[User, NotificationRoute]],
         title: str,
         message: str,
-        notification_type: str = "general"
-    ) -> Dict[str, int]:
+        notification_type: str = "general",
+        dispatcher: Optional[NotificationDispatcher] = None
+    ) -> Dict[str, Any]:
         """
-        Send bulk notifications to multiple users
+        Send bulk notifications to multiple users concurrently.
+        
+        Accepts User objects or routes from preference_cache.resolve_routes(),
+        which resolves a whole district in one query without loading Users.
         """
-        results = {"success": 0, "failed": 0}
+        now = datetime.now()
+        routes = [route for route in self._to_routes(users) if route.allows(notification_type, now)]
         
-        for user in users:
-            try:
-                success = await self.send_farming_reminder(user, notification_type, message)
-                if success:
-                    results["success"] += 1
-                else:
-                    results["failed"] += 1
-            except Exception as e:
-                print(f"Bulk notification error for user {user.id}: {e}")
-                results["failed"] += 1
+        messages = [
+            OutboundMessage(
+                phone_number=route.phone_number,
+                message=message,
+                delivery_method=route.delivery_method,
+                user_id=route.user_id
+            )
+            for route in routes
+        ]
         
+        results = await (dispatcher or NotificationDispatcher()).dispatch(messages)
+        results["suppressed"] = len(users) - len(routes)
         return results
@@ -0,0 +1,323 @@
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from datetime import date, datetime
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select, update, func, and_
+from sqlalchemy.orm import Session
+
+from app.models.market import MarketPriceDaily, PriceAlert
+from app.services.notification_service import NotificationService
+
+
+ALERT_TYPES = ("above", "below")
+
+# Keep IN lists under SQLite's bound-parameter limit
+ALERT_QUERY_CHUNK_SIZE = 900
+
+# Rows per fetch when (re)loading alerts into memory
+ALERT_LOAD_BATCH_SIZE = 10000
+
+
+def _name_key(value: Optional[str]) -> Optional[str]:
+    return value.strip().lower() if value else None
+
+
+def _observed_price(row: Dict[str, Any]) -> float:
+    if row.get("modal_price") is not None:
+        return row["modal_price"]
+    return (row["min_price"] + row["max_price"]) / 2
+
+
+class AlertBook:
+    """
+    Active alerts for one (crop, market) key as two threshold-sorted arrays.
+
+    A price move from old to new crosses exactly the "above" thresholds in
+    (old, new] or the "below" thresholds in [new, old), so matching is two
+    bisects plus the alerts that actually fire, however many are set.
+    Parallel typed arrays keep millions of alerts to ~16 bytes each.
+    """
+
+    def __init__(self):
+        self.above_prices = array("d")
+        self.above_ids = array("q")
+        self.below_prices = array("d")
+        self.below_ids = array("q")
+
+    def __len__(self) -> int:
+        return len(self.above_ids) + len(self.below_ids)
+
+    def _side(self, alert_type: str) -> Tuple[array, array]:
+        if alert_type == "above":
+            return self.above_prices, self.above_ids
+        return self.below_prices, self.below_ids
+
+    def add(self, alert_id: int, alert_type: str, target_price: float) -> None:
+        prices, ids = self._side(alert_type)
+        position = bisect_right(prices, target_price)
+        prices.insert(position, target_price)
+        ids.insert(position, alert_id)
+
+    def extend_sorted(self, alerts: List[Tuple[float, int]], alert_type: str) -> None:
+        """Bulk-load (target_price, id) pairs, re-sorting once instead of per insert"""
+        prices, ids = self._side(alert_type)
+        if len(alerts) * 8 < len(prices):
+            # A few new alerts into a large book: insert in place
+            for target_price, alert_id in alerts:
+                self.add(alert_id, alert_type, target_price)
+            return
+
+        merged = sorted(list(zip(prices, ids)) + alerts)
+        prices[:] = array("d", [price for price, _ in merged])
+        ids[:] = array("q", [alert_id for _, alert_id in merged])
+
+    def remove(self, alert_id: int, alert_type: str, target_price: float) -> bool:
+        prices, ids = self._side(alert_type)
+        for position in range(bisect_left(prices, target_price), bisect_right(prices, target_price)):
+            if ids[position] == alert_id:
+                del prices[position]
+                del ids[position]
+                return True
+        return False
+
+    def crossed(self, old_price: float, new_price: float) -> List[Tuple[int, str, float]]:
+        """(alert id, alert type, target price) of every alert the move crosses"""
+        if new_price > old_price:
+            low = bisect_right(self.above_prices, old_price)
+            high = bisect_right(self.above_prices, new_price)
+            return [
+                (alert_id, "above", target_price)
+                for alert_id, target_price in zip(self.above_ids[low:high], self.above_prices[low:high])
+            ]
+        if new_price < old_price:
+            low = bisect_left(self.below_prices, new_price)
+            high = bisect_left(self.below_prices, old_price)
+            return [
+                (alert_id, "below", target_price)
+                for alert_id, target_price in zip(self.below_ids[low:high], self.below_prices[low:high])
+            ]
+        return []
+
+
+class PriceAlertIndex:
+    """
+    Process-local matcher over every active alert, keyed by (crop, market);
+    alerts without a market live under (crop, None) and see every market.
+
+    The database stays the source of truth: new alerts are pulled in by id
+    before each match, and an alert only fires if its row is still active
+    when it is claimed, so alerts deleted elsewhere or already fired by
+    another process are dropped from the index instead of notified twice.
+    Previous prices are not kept here either; the caller reads them from
+    the rollup for each batch (see PriceAlertService.last_prices).
+    """
+
+    def __init__(self):
+        self.books: Dict[Tuple[str, Optional[str]], AlertBook] = {}
+        self.max_alert_id = 0
+        self.lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return sum(len(book) for book in self.books.values())
+
+    def reset(self) -> None:
+        """Forget everything; the next match reloads from the database"""
+        with self.lock:
+            self.books = {}
+            self.max_alert_id = 0
+
+    def refresh(self, db: Session) -> None:
+        """Load alerts added since the last refresh (all of them on first use)"""
+        with self.lock:
+            pending: Dict[Tuple[Tuple[str, Optional[str]], str], List[Tuple[float, int]]] = defaultdict(list)
+            result = db.execute(
+                select(PriceAlert.id, PriceAlert.crop_name, PriceAlert.market_name, PriceAlert.alert_type, PriceAlert.target_price)
+                .where(PriceAlert.is_active == True, PriceAlert.id > self.max_alert_id)
+                .order_by(PriceAlert.id)
+                .execution_options(yield_per=ALERT_LOAD_BATCH_SIZE)
+            )
+            for alert_id, crop_name, market_name, alert_type, target_price in result:
+                key = (_name_key(crop_name), _name_key(market_name))
+                pending[(key, alert_type)].append((target_price, alert_id))
+                self.max_alert_id = alert_id
+
+            for (key, alert_type), alerts in pending.items():
+                self.books.setdefault(key, AlertBook()).extend_sorted(alerts, alert_type)
+
+    def discard(self, alerts: Iterable[Tuple[int, Tuple[str, Optional[str]], str, float]]) -> None:
+        """Remove (alert id, book key, alert type, target price) entries, as returned by match"""
+        with self.lock:
+            for alert_id, key, alert_type, target_price in alerts:
+                book = self.books.get(key)
+                if book is not None:
+                    book.remove(alert_id, alert_type, target_price)
+                    if not len(book):
+                        del self.books[key]
+
+    def match(
+        self,
+        prices: Iterable[Dict[str, Any]],
+        last_prices: Dict[Tuple[str, str], Tuple[date, float]]
+    ) -> Dict[int, Tuple]:
+        """
+        Return the alerts crossed by each move from the previous price per
+        (crop, market) key (last_prices, keyed by _name_key names, updated
+        in place), as alert id -> (book key, alert type, target price,
+        observation). Rows for the same market and day are averaged first
+        so varieties do not flap against one another; observations older
+        than the previous price are ignored.
+        """
+        observations: Dict[Tuple[str, str, date], Dict[str, Any]] = {}
+        for row in prices:
+            price_date = row["price_date"]
+            day = price_date.date() if isinstance(price_date, datetime) else price_date
+            key = (_name_key(row["crop_name"]), _name_key(row["market_name"]), day)
+            observation = observations.get(key)
+            if observation is None:
+                observations[key] = {
+                    "crop_name": row["crop_name"],
+                    "market_name": row["market_name"],
+                    "price_date": day,
+                    "price_sum": _observed_price(row),
+                    "count": 1
+                }
+            else:
+                observation["price_sum"] += _observed_price(row)
+                observation["count"] += 1
+
+        candidates: Dict[int, Tuple] = {}
+        with self.lock:
+            for (crop_key, market_key, day), observation in sorted(observations.items(), key=lambda item: item[0][2]):
+                price = observation.pop("price_sum") / observation.pop("count")
+                observation["price"] = round(price, 2)
+
+                last = last_prices.get((crop_key, market_key))
+                if last is not None and day < last[0]:
+                    continue
+                last_prices[(crop_key, market_key)] = (day, price)
+                if last is None:
+                    continue
+
+                for book_key in ((crop_key, market_key), (crop_key, None)):
+                    book = self.books.get(book_key)
+                    if book is not None:
+                        for alert_id, alert_type, target_price in book.crossed(last[1], price):
+                            candidates[alert_id] = (book_key, alert_type, target_price, observation)
+        return candidates
+
+
+price_alert_index = PriceAlertIndex()
+
+
+class PriceAlertService:
+    def __init__(self, index: Optional[PriceAlertIndex] = None):
+        # An empty index is falsy (__len__), so test for None explicitly
+        self.index = index if index is not None else price_alert_index
+
+    def process_prices(self, db: Session, prices: List[Dict[str, Any]]) -> int:
+        """
+        Match a batch of ingested prices against active alerts, mark the
+        crossed alerts triggered and queue their notifications, all in the
+        caller's transaction (does not commit). Returns alerts triggered.
+
+        Run it before the batch is folded into market_price_daily: previous
+        prices are read from there. On rollback the caller must reset() the
+        index, which has already discarded the alerts claimed here.
+        """
+        if not prices:
+            return 0
+
+        self.index.refresh(db)
+        candidates = self.index.match(prices, self.last_prices(db, prices))
+        if not candidates:
+            return 0
+
+        now = datetime.utcnow()
+        candidate_ids = list(candidates)
+        matches: List[Dict[str, Any]] = []
+
+        for i in range(0, len(candidate_ids), ALERT_QUERY_CHUNK_SIZE):
+            chunk = candidate_ids[i:i + ALERT_QUERY_CHUNK_SIZE]
+            # Conditional claim: only rows still active fire, exactly once
+            fired = db.execute(
+                update(PriceAlert)
+                .where(PriceAlert.id.in_(chunk), PriceAlert.is_active == True)
+                .values(is_active=False, triggered_at=now)
+                .returning(PriceAlert.id, PriceAlert.user_id, PriceAlert.alert_type, PriceAlert.target_price)
+                .execution_options(synchronize_session=False)
+            ).all()
+
+            for alert_id, user_id, alert_type, target_price in fired:
+                observation = candidates[alert_id][3]
+                matches.append({
+                    "alert_id": alert_id,
+                    "user_id": user_id,
+                    "alert_type": alert_type,
+                    "target_price": target_price,
+                    "crop_name": observation["crop_name"],
+                    "market_name": observation["market_name"],
+                    "price": observation["price"],
+                    "price_date": observation["price_date"]
+                })
+
+        # Fired alerts and ones found inactive (deleted or fired elsewhere) alike
+        self.index.discard((alert_id, *candidates[alert_id][:3]) for alert_id in candidate_ids)
+
+        if matches:
+            NotificationService().queue_market_price_alerts(db, matches)
+        return len(matches)
+
+    def last_prices(self, db: Session, prices: List[Dict[str, Any]]) -> Dict[Tuple[str, str], Tuple[date, float]]:
+        """
+        Latest daily price in the rollup per (crop, market) of the batch, as
+        match() expects. Read in the caller's transaction on every batch, so
+        every process compares against the newest stored price.
+        """
+        keys = {(_name_key(row["crop_name"]), _name_key(row["market_name"])) for row in prices}
+        crop_names = sorted({row["crop_name"] for row in prices})
+        market_names = sorted({row["market_name"] for row in prices})
+
+        last_prices: Dict[Tuple[str, str], Tuple[date, float]] = {}
+        for i in range(0, len(crop_names), ALERT_QUERY_CHUNK_SIZE):
+            for j in range(0, len(market_names), ALERT_QUERY_CHUNK_SIZE):
+                in_batch = (
+                    MarketPriceDaily.crop_name.in_(crop_names[i:i + ALERT_QUERY_CHUNK_SIZE]),
+                    MarketPriceDaily.market_name.in_(market_names[j:j + ALERT_QUERY_CHUNK_SIZE])
+                )
+                latest = select(
+                    MarketPriceDaily.crop_name,
+                    MarketPriceDaily.market_name,
+                    func.max(MarketPriceDaily.price_date).label("price_date")
+                ).where(*in_batch).group_by(MarketPriceDaily.crop_name, MarketPriceDaily.market_name).subquery()
+
+                rows = db.execute(
+                    select(
+                        MarketPriceDaily.crop_name,
+                        MarketPriceDaily.market_name,
+                        MarketPriceDaily.price_date,
+                        func.sum(MarketPriceDaily.modal_price_sum).label("modal_price_sum"),
+                        func.sum(MarketPriceDaily.modal_price_count).label("modal_price_count"),
+                        func.sum(MarketPriceDaily.min_price_sum + MarketPriceDaily.max_price_sum).label("range_sum"),
+                        func.sum(MarketPriceDaily.record_count).label("record_count")
+                    )
+                    .join(latest, and_(
+                        MarketPriceDaily.crop_name == latest.c.crop_name,
+                        MarketPriceDaily.market_name == latest.c.market_name,
+                        MarketPriceDaily.price_date == latest.c.price_date
+                    ))
+                    .group_by(MarketPriceDaily.crop_name, MarketPriceDaily.market_name, MarketPriceDaily.price_date)
+                )
+
+                for row in rows:
+                    key = (_name_key(row.crop_name), _name_key(row.market_name))
+                    if key not in keys:
+                        continue
+                    if row.modal_price_count:
+                        price = row.modal_price_sum / row.modal_price_count
+                    else:
+                        price = row.range_sum / (2 * row.record_count)
+                    last_prices[key] = (row.price_date, price)
+        return last_prices
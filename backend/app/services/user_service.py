@@ -1,10 +1,12 @@
 from typing import Dict, Any, List
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
+from sqlalchemy import func, desc, select, case
+from app.core.auth import principal_cache
 from app.models.user import User
 from app.models.advisory import Advisory
 from app.models.notification import Notification
 from app.schemas.user import UserUpdate
+from app.services.notification_preference_service import preference_cache
 
 
 class UserService:
@@ -27,10 +29,18 @@ class UserService:
             
             # Update fields that are provided
             update_data = user_update.dict(exclude_unset=True)
+            notification_preferences = update_data.pop("notification_preferences", None)
             for field, value in update_data.items():
                 setattr(user, field, value)
             
             db.commit()
+            principal_cache.invalidate(user_id)
+            
+            if notification_preferences is not None:
+                preference_cache.save_preferences(user_id, notification_preferences, db)
+            else:
+                preference_cache.invalidate(user_id)
+            
             db.refresh(user)
             return user
             
@@ -91,13 +101,7 @@ class UserService:
         Update user notification preferences
         """
         try:
-            user = db.query(User).filter(User.id == user_id).first()
-            if not user:
-                raise ValueError("User not found")
-            
-            import json
-            user.notification_preferences = json.dumps(preferences)
-            db.commit()
+            preference_cache.save_preferences(user_id, preferences, db)
             
         except Exception as e:
             db.rollback()
@@ -108,60 +112,117 @@ class UserService:
         Get user statistics
         """
         try:
-            # Get advisory statistics
-            total_advisories = db.query(Advisory).filter(
-                Advisory.user_id == user_id
-            ).count()
-            
-            unread_advisories = db.query(Advisory).filter(
-                Advisory.user_id == user_id,
-                Advisory.is_read == False
-            ).count()
-            
-            # Get notification statistics
-            total_notifications = db.query(Notification).filter(
+            # Per-type advisory counts, with the notification counters as scalar
+            # subqueries and the account timestamps, in a single round trip
+            total_notifications = select(func.count(Notification.id)).where(
                 Notification.user_id == user_id
-            ).count()
+            ).scalar_subquery()
+            unread_notifications = select(func.count(Notification.id)).where(
+                Notification.user_id == user_id, Notification.is_read == False
+            ).scalar_subquery()
             
-            unread_notifications = db.query(Notification).filter(
-                Notification.user_id == user_id,
-                Notification.is_read == False
-            ).count()
+            rows = db.execute(
+                select(
+                    Advisory.advisory_type,
+                    func.count(Advisory.id),
+                    func.sum(case((Advisory.is_read == False, 1), else_=0)),
+                    total_notifications,
+                    unread_notifications,
+                    User.created_at,
+                    User.last_login
+                ).select_from(User).outerjoin(
+                    Advisory, Advisory.user_id == User.id
+                ).where(
+                    User.id == user_id
+                ).group_by(Advisory.advisory_type, User.created_at, User.last_login)
+            ).all()
             
-            # Get advisory types distribution
-            advisory_types = db.query(
-                Advisory.advisory_type,
-                func.count(Advisory.id).label('count')
-            ).filter(
-                Advisory.user_id == user_id
-            ).group_by(Advisory.advisory_type).all()
+            # A user without advisories still yields one row, with a zero count
+            advisory_stats = self._summarize_advisories([row[:3] for row in rows if row[1]])
+            total_notifications, unread_notifications, created_at, last_login = (
+                rows[0][3:] if rows else (0, 0, None, None)
+            )
             
             return {
                 "advisories": {
-                    "total": total_advisories,
-                    "unread": unread_advisories,
-                    "by_type": [
-                        {"type": adv_type, "count": count}
-                        for adv_type, count in advisory_types
-                    ]
+                    "total": advisory_stats["total"],
+                    "unread": advisory_stats["unread"],
+                    "by_type": advisory_stats["by_type"]
                 },
                 "notifications": {
                     "total": total_notifications,
                     "unread": unread_notifications
                 },
                 "account": {
-                    "created_at": db.query(User.created_at).filter(
-                        User.id == user_id
-                    ).scalar(),
-                    "last_login": db.query(User.last_login).filter(
-                        User.id == user_id
-                    ).scalar()
+                    "created_at": created_at,
+                    "last_login": last_login
                 }
             }
             
         except Exception as e:
             raise e
 
+    async def get_advisory_stats(self, user_id: int, db: Session) -> Dict[str, Any]:
+        """
+        Get advisory counters for a user
+        """
+        return self._advisory_counts(user_id, db)
+
+    async def get_notification_stats(self, user_id: int, db: Session) -> Dict[str, Any]:
+        """
+        Get notification counters for a user (one grouped query)
+        """
+        rows = db.execute(
+            select(
+                Notification.notification_type,
+                func.count(Notification.id),
+                func.sum(case((Notification.is_read == False, 1), else_=0)),
+                func.sum(case((Notification.is_acknowledged == False, 1), else_=0))
+            ).where(
+                Notification.user_id == user_id
+            ).group_by(Notification.notification_type)
+        ).all()
+        
+        return {
+            "total": sum(row[1] for row in rows),
+            "unread": sum(row[2] or 0 for row in rows),
+            "unacknowledged": sum(row[3] or 0 for row in rows),
+            "by_type": [
+                {"type": notif_type, "count": count}
+                for notif_type, count, _, _ in rows
+            ]
+        }
+
+    def _advisory_counts(self, user_id: int, db: Session) -> Dict[str, Any]:
+        """
+        Total, unread and per-type advisory counts from one grouped query
+        """
+        rows = db.execute(
+            select(
+                Advisory.advisory_type,
+                func.count(Advisory.id),
+                func.sum(case((Advisory.is_read == False, 1), else_=0))
+            ).where(
+                Advisory.user_id == user_id
+            ).group_by(Advisory.advisory_type)
+        ).all()
+        
+        return self._summarize_advisories(rows)
+
+    @staticmethod
+    def _summarize_advisories(rows) -> Dict[str, Any]:
+        """
+        Fold (advisory_type, count, unread) rows into advisory counters
+        """
+        return {
+            "total": sum(row[1] for row in rows),
+            "unread": sum(row[2] or 0 for row in rows),
+            "by_type": [
+                {"type": adv_type, "count": count}
+                for adv_type, count, _ in rows
+            ]
+        }
+
     async def get_user_by_phone(self, phone_number: str, db: Session) -> User:
         """
         Get user by phone number
@@ -197,6 +258,7 @@ class UserService:
             
             user.is_verified = True
             db.commit()
+            principal_cache.invalidate(user_id)
             db.refresh(user)
             return user
         except Exception as e:
@@ -0,0 +1,317 @@
+"""
+Notification outbox worker.
+
+Polls `notifications` for rows with delivery_status="pending" whose
+scheduled_at is due, leases a batch so several workers can run side by side,
+dispatches them and writes the delivery outcome back in bulk.
+
+Run standalone with:
+
+    python -m app.workers.notification_outbox
+"""
+
+import asyncio
+import os
+import socket
+import time
+import uuid
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional
+
+from sqlalchemy import bindparam, select, update, func, or_
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal, engine
+from app.models.notification import Notification
+from app.models.user import User
+from app.services.notification_dispatcher import DISPATCH_METHODS, DispatchResult, NotificationDispatcher, OutboundMessage
+
+
+class OutboxMetrics:
+    """
+    In-process throughput and lag counters for the outbox worker
+    """
+
+    def __init__(self, window: int = 20):
+        self.started_at = time.time()
+        self.batches = 0
+        self.claimed = 0
+        self.sent = 0
+        self.failed = 0
+        self.lost_leases = 0
+        self.last_batch_at: Optional[float] = None
+        self.last_lag_seconds = 0.0
+        self.max_lag_seconds = 0.0
+        self._recent = deque(maxlen=window)  # (finished_at, messages, duration)
+
+    def record_batch(
+        self,
+        claimed: int,
+        sent: int,
+        failed: int,
+        lost_leases: int,
+        duration: float,
+        lag_seconds: float
+    ) -> None:
+        now = time.time()
+        self.batches += 1
+        self.claimed += claimed
+        self.sent += sent
+        self.failed += failed
+        self.lost_leases += lost_leases
+        self.last_batch_at = now
+        self.last_lag_seconds = lag_seconds
+        self.max_lag_seconds = max(self.max_lag_seconds, lag_seconds)
+        self._recent.append((now, claimed, duration))
+
+    def snapshot(self) -> Dict[str, Any]:
+        busy_time = sum(duration for _, _, duration in self._recent)
+        recent_messages = sum(messages for _, messages, _ in self._recent)
+
+        return {
+            "uptime_seconds": round(time.time() - self.started_at, 1),
+            "batches": self.batches,
+            "claimed": self.claimed,
+            "sent": self.sent,
+            "failed": self.failed,
+            "lost_leases": self.lost_leases,
+            "throughput_per_second": round(recent_messages / busy_time, 2) if busy_time else 0.0,
+            "last_batch_at": datetime.utcfromtimestamp(self.last_batch_at) if self.last_batch_at else None,
+            "last_lag_seconds": round(self.last_lag_seconds, 2),
+            "max_lag_seconds": round(self.max_lag_seconds, 2)
+        }
+
+
+def get_outbox_backlog(db: Session) -> Dict[str, Any]:
+    """
+    Backlog size and lag of due, unsent notifications (works from any process)
+    """
+    now = datetime.utcnow()
+    due_count, oldest_due = db.execute(
+        select(func.count(Notification.id), func.min(Notification.scheduled_at)).where(
+            Notification.delivery_status == "pending",
+            Notification.delivery_method.in_(DISPATCH_METHODS),
+            Notification.scheduled_at <= now
+        )
+    ).one()
+
+    lag_seconds = 0.0
+    if oldest_due is not None:
+        lag_seconds = max(0.0, (now - oldest_due.replace(tzinfo=None)).total_seconds())
+
+    return {
+        "due_pending": due_count,
+        "oldest_due_at": oldest_due,
+        "lag_seconds": round(lag_seconds, 2)
+    }
+
+
+class NotificationOutboxWorker:
+    def __init__(
+        self,
+        batch_size: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+        lease_seconds: Optional[int] = None,
+        worker_id: Optional[str] = None
+    ):
+        self.batch_size = batch_size or settings.NOTIFICATION_OUTBOX_BATCH_SIZE
+        self.poll_interval = poll_interval or settings.NOTIFICATION_OUTBOX_POLL_INTERVAL
+        self.lease_seconds = lease_seconds or settings.NOTIFICATION_OUTBOX_LEASE_SECONDS
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.metrics = OutboxMetrics()
+        self._stopped = asyncio.Event()
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    async def run(self) -> None:
+        """
+        Poll and dispatch until stopped; full batches are followed immediately
+        by the next poll so a large backlog drains without waiting
+        """
+        print(f"Notification outbox worker {self.worker_id} started")
+
+        async with NotificationDispatcher() as dispatcher:
+            while not self._stopped.is_set():
+                try:
+                    processed = await self.run_once(dispatcher)
+                except Exception as e:
+                    print(f"Notification outbox error: {e}")
+                    processed = 0
+
+                if processed < self.batch_size:
+                    try:
+                        await asyncio.wait_for(self._stopped.wait(), timeout=self.poll_interval)
+                    except asyncio.TimeoutError:
+                        pass
+
+        print(f"Notification outbox worker {self.worker_id} stopped")
+
+    async def run_once(self, dispatcher: NotificationDispatcher) -> int:
+        """
+        Claim, dispatch and finalize a single batch; returns the batch size
+        """
+        started = time.monotonic()
+        messages, oldest_scheduled_at = await asyncio.to_thread(self._claim_batch)
+        if not messages:
+            return 0
+
+        lag_seconds = 0.0
+        if oldest_scheduled_at is not None:
+            lag_seconds = max(0.0, (datetime.utcnow() - oldest_scheduled_at.replace(tzinfo=None)).total_seconds())
+
+        # Recipients deleted or without a phone number since the row was queued
+        # are failed rather than sent, which also releases their lease
+        deliverable = [message for message in messages if message.phone_number]
+        results = await dispatcher.dispatch_results(deliverable) if deliverable else []
+        results += [
+            DispatchResult(message=message, success=False, attempts=0, error="recipient has no phone number")
+            for message in messages if not message.phone_number
+        ]
+        summary = dispatcher.aggregate(results)
+
+        lost_leases = await asyncio.to_thread(self._finalize_batch, results)
+
+        self.metrics.record_batch(
+            claimed=len(messages),
+            sent=summary["success"],
+            failed=summary["failed"],
+            lost_leases=lost_leases,
+            duration=time.monotonic() - started,
+            lag_seconds=lag_seconds
+        )
+        return len(messages)
+
+    def _claim_batch(self):
+        """
+        Lease up to batch_size due notifications for this worker.
+
+        The UPDATE re-checks the lease condition, so when two workers select
+        the same candidates only one of them wins each row. Every leased row
+        is returned (phone_number is None when the user is gone) so that each
+        one is finalized.
+        """
+        db = SessionLocal()
+        try:
+            now = datetime.utcnow()
+            lease_free = or_(
+                Notification.lease_expires_at.is_(None),
+                Notification.lease_expires_at < now
+            )
+
+            # Only methods the dispatcher can send; push, email and in-app
+            # notifications stay pending for their own channel
+            candidates = select(Notification.id).where(
+                Notification.delivery_status == "pending",
+                Notification.delivery_method.in_(DISPATCH_METHODS),
+                Notification.scheduled_at <= now,
+                lease_free
+            ).order_by(Notification.scheduled_at).limit(self.batch_size)
+
+            if engine.dialect.name == "postgresql":
+                candidates = candidates.with_for_update(skip_locked=True)
+
+            candidate_ids = db.execute(candidates).scalars().all()
+            if not candidate_ids:
+                db.rollback()
+                return [], None
+
+            db.execute(
+                update(Notification)
+                .where(Notification.id.in_(candidate_ids), lease_free)
+                .values(
+                    lease_owner=self.worker_id,
+                    lease_expires_at=now + timedelta(seconds=self.lease_seconds)
+                )
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+
+            rows = db.execute(
+                select(
+                    Notification.id,
+                    Notification.user_id,
+                    Notification.message,
+                    Notification.delivery_method,
+                    Notification.scheduled_at,
+                    User.phone_number
+                )
+                .outerjoin(User, User.id == Notification.user_id)
+                .where(
+                    Notification.id.in_(candidate_ids),
+                    Notification.lease_owner == self.worker_id
+                )
+            ).all()
+
+            messages = [
+                OutboundMessage(
+                    phone_number=row.phone_number,
+                    message=row.message,
+                    delivery_method=row.delivery_method,
+                    user_id=row.user_id,
+                    notification_id=row.id
+                )
+                for row in rows
+            ]
+            oldest = min((row.scheduled_at for row in rows), default=None)
+            return messages, oldest
+        finally:
+            db.close()
+
+    def _finalize_batch(self, results) -> int:
+        """
+        Write delivery outcomes back with a single executemany UPDATE.
+
+        Only rows this worker still leases are updated: if the lease expired
+        mid-dispatch and another worker re-claimed a row, that worker's state
+        wins. Returns the number of such lost leases.
+        """
+        now = datetime.utcnow()
+        updates: List[Dict[str, Any]] = []
+
+        for result in results:
+            if result.success:
+                updates.append({
+                    "notification_id": result.message.notification_id,
+                    "delivery_status": "delivered" if result.delivered else "sent",
+                    "sent_at": now,
+                    "delivered_at": now if result.delivered else None,
+                    "lease_owner": None,
+                    "lease_expires_at": None
+                })
+            else:
+                updates.append({
+                    "notification_id": result.message.notification_id,
+                    "delivery_status": "failed",
+                    "sent_at": None,
+                    "delivered_at": None,
+                    "lease_owner": None,
+                    "lease_expires_at": None
+                })
+
+        table = Notification.__table__
+        statement = update(table).where(
+            table.c.id == bindparam("notification_id"),
+            table.c.lease_owner == self.worker_id
+        )
+
+        db = SessionLocal()
+        try:
+            result = db.execute(statement, updates)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+        return len(updates) - result.rowcount
+
+
+if __name__ == "__main__":
+    worker = NotificationOutboxWorker()
+    try:
+        asyncio.run(worker.run())
+    except KeyboardInterrupt:
+        pass
@@ -1,28 +1,47 @@
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
+import asyncio
 import uvicorn
 
+from app.core.auth import require_admin_api_key
 from app.core.config import settings
-from app.core.database import engine, Base
+from app.core.database import async_engine, get_pool_stats
+from app.core.migrations import run_migrations
+from app.core.query_counter import QueryCounter
+from app.core.responses import FastJSONResponse
 from app.api.api_v1.api import api_router
+from app.workers.notification_outbox import NotificationOutboxWorker
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
-    Base.metadata.create_all(bind=engine)
+    run_migrations()
+    
+    app.state.outbox_worker = None
+    outbox_task = None
+    if settings.NOTIFICATION_OUTBOX_ENABLED:
+        app.state.outbox_worker = NotificationOutboxWorker()
+        outbox_task = asyncio.create_task(app.state.outbox_worker.run())
+    
     yield
+    
     # Shutdown
-    pass
+    if outbox_task is not None:
+        app.state.outbox_worker.stop()
+        await outbox_task
+    
+    await async_engine.dispose()
 
 
 app = FastAPI(
     title="Smart Crop Advisory System",
     description="AI-powered advisory system for small and marginal farmers",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse
 )
 
 # CORS middleware
@@ -34,6 +53,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if settings.QUERY_COUNT_HEADER:
+    @app.middleware("http")
+    async def query_count_header(request: Request, call_next):
+        with QueryCounter() as counter:
+            response = await call_next(request)
+        response.headers["X-Query-Count"] = str(counter.count)
+        return response
+
 # Include API router
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
@@ -55,6 +82,11 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/health/db-pool", dependencies=[Depends(require_admin_api_key)])
+async def db_pool_stats():
+    return get_pool_stats()
+
+
 if __name__ == "__main__":
     uvicorn.run(
         "main:app",
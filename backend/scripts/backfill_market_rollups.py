@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Rebuild the daily and weekly market price rollups from market_prices.
+
+Run once after deploying the rollup tables, or with --since to repair a
+recent window (weekly buckets restart at the Monday on or before it).
+
+Usage (from the backend directory):
+    python scripts/backfill_market_rollups.py [--since 2024-01-01]
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.core.database import SessionLocal
+from app.services.market_rollup_service import MarketRollupService
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill market price rollups")
+    parser.add_argument("--since", type=date.fromisoformat, default=None, help="Only rebuild from this date (YYYY-MM-DD)")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        daily_rows, weekly_rows = MarketRollupService().backfill(db, since=args.since)
+        elapsed = time.perf_counter() - started
+    finally:
+        db.close()
+
+    scope = f"since {args.since}" if args.since else "all history"
+    print(f"Rebuilt rollups for {scope} in {elapsed:.2f}s")
+    print(f"  daily rows:  {daily_rows}")
+    print(f"  weekly rows: {weekly_rows}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Serialization microbenchmark: FastAPI's default path (jsonable_encoder +
+stdlib json via JSONResponse) vs FastJSONResponse (orjson) over payloads
+shaped like the market price, shop inventory and community feed pages.
+
+Usage (from the backend directory):
+    python scripts/benchmark_json.py [--rows 500] [--repeat 50]
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.core.responses import FastJSONResponse
+
+
+def market_prices(rows: int) -> dict:
+    now = datetime.utcnow()
+    return {
+        "prices": [
+            {
+                "id": i,
+                "crop_name": "Wheat",
+                "variety": "HD-2967",
+                "market_name": f"Mandi {i % 40}",
+                "state": "Punjab",
+                "district": "Ludhiana",
+                "min_price": 2015.0 + i,
+                "max_price": 2275.5 + i,
+                "modal_price": 2125.25 + i,
+                "arrival_quantity": 120.5,
+                "quality_grade": "A",
+                "source": "mandi",
+                "price_date": now - timedelta(days=i)
+            }
+            for i in range(rows)
+        ],
+        "count": rows,
+        "next_cursor": "eyJ0IjoiZHQiLCJ2IjoiMjAyNi0wMS0wMVQwMDowMDowMCIsImkiOjh9"
+    }
+
+
+def shop_inventory(rows: int) -> dict:
+    return {
+        "shop_id": 1,
+        "shop_name": "Kisan Seva Kendra",
+        "inventory": [
+            {
+                "id": i,
+                "product_name": f"Urea {i}",
+                "product_type": "fertilizer",
+                "brand": "IFFCO",
+                "variety": None,
+                "description": "Nitrogen fertilizer for top dressing. " * 4,
+                "specifications": '{"nitrogen": "46%"}',
+                "price_per_unit": Decimal("266.50"),
+                "unit": "bag",
+                "discount_percentage": 5.0,
+                "current_stock": 40,
+                "minimum_stock": 10,
+                "is_available": True,
+                "is_organic": False,
+                "is_government_subsidized": True,
+                "quality_grade": "A",
+                "expiry_date": datetime(2027, 3, 31)
+            }
+            for i in range(rows)
+        ],
+        "count": rows,
+        "next_cursor": None
+    }
+
+
+def community_posts(rows: int) -> dict:
+    now = datetime.utcnow()
+    return {
+        "posts": [
+            {
+                "id": i,
+                "title": "गेहूं में पीला रतुआ",
+                "content": "पत्तियों पर पीली धारियां दिख रही हैं, क्या करें? " * 3,
+                "post_type": "question",
+                "crop_category": "cereals",
+                "topic_tags": "wheat,rust",
+                "likes_count": i % 17,
+                "comments_count": i % 5,
+                "views_count": i * 3,
+                "is_featured": False,
+                "is_pinned": False,
+                "language": "hi",
+                "created_at": now - timedelta(minutes=i),
+                "user": {"id": i, "name": f"Farmer {i}", "district": "Ludhiana", "state": "Punjab"}
+            }
+            for i in range(rows)
+        ],
+        "count": rows,
+        "next_cursor": None
+    }
+
+
+def default_render(payload: dict) -> bytes:
+    return JSONResponse(jsonable_encoder(payload)).body
+
+
+def fast_render(payload: dict) -> bytes:
+    return FastJSONResponse(payload).body
+
+
+def time_ms(render, payload: dict, repeat: int) -> float:
+    render(payload)
+    started = time.perf_counter()
+    for _ in range(repeat):
+        render(payload)
+    return (time.perf_counter() - started) * 1000 / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark JSON response serialization")
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'payload':<16} {'default ms':>10} {'orjson ms':>10} {'speedup':>8}")
+    for name, build in (
+        ("market prices", market_prices),
+        ("shop inventory", shop_inventory),
+        ("community feed", community_posts),
+    ):
+        payload = build(args.rows)
+        default_ms = time_ms(default_render, payload, args.repeat)
+        fast_ms = time_ms(fast_render, payload, args.repeat)
+        print(f"{name:<16} {default_ms:>10.2f} {fast_ms:>10.2f} {default_ms / fast_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Price alert matching microbenchmark: the bisect-based PriceAlertIndex vs
+checking every alert for the crop and market of each price, over synthetic
+alerts and ingest batches (in memory, no database).
+
+Usage (from the backend directory):
+    python scripts/benchmark_price_alerts.py [--alerts 1000000] [--batch 5000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.services.price_alert_service import PriceAlertIndex, AlertBook
+
+
+CROPS = [f"crop {i}" for i in range(50)]
+MARKETS = [f"market {i}" for i in range(200)]
+
+
+def build_alerts(count: int):
+    alerts = []
+    for alert_id in range(1, count + 1):
+        market = random.choice(MARKETS) if random.random() < 0.9 else None
+        alerts.append((alert_id, random.choice(CROPS), market, random.choice(("above", "below")), random.uniform(1000, 3000)))
+    return alerts
+
+
+def build_index(alerts) -> PriceAlertIndex:
+    index = PriceAlertIndex()
+    pending = defaultdict(list)
+    for alert_id, crop, market, alert_type, target_price in alerts:
+        pending[((crop, market), alert_type)].append((target_price, alert_id))
+    for (key, alert_type), entries in pending.items():
+        index.books.setdefault(key, AlertBook()).extend_sorted(entries, alert_type)
+    index.loaded = True
+    return index
+
+
+def build_batch(size: int, day: date, walk: dict):
+    """
+    One price per (crop, market), each a random walk of up to 2% a day
+    (the index averages repeats within a day, the naive matcher does not)
+    """
+    keys = random.sample(list(walk), size)
+    batch = []
+    for crop, market in keys:
+        price = walk[(crop, market)] * random.uniform(0.98, 1.02)
+        walk[(crop, market)] = price
+        batch.append({
+            "crop_name": crop,
+            "market_name": market,
+            "price_date": day,
+            "min_price": price - 50,
+            "max_price": price + 50,
+            "modal_price": price
+        })
+    return batch
+
+
+def naive_match(alerts_by_key, last_prices, batch):
+    """Check every alert of the (crop, market) and (crop, any market) keys"""
+    fired = set()
+    for row in batch:
+        key = (row["crop_name"], row["market_name"])
+        old, new = last_prices.get(key), row["modal_price"]
+        last_prices[key] = new
+        if old is None:
+            continue
+        for book_key in (key, (row["crop_name"], None)):
+            for alert_id, alert_type, target_price in alerts_by_key.get(book_key, ()):
+                if alert_type == "above" and old < target_price <= new:
+                    fired.add(alert_id)
+                elif alert_type == "below" and new <= target_price < old:
+                    fired.add(alert_id)
+    return fired
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark price alert matching")
+    parser.add_argument("--alerts", type=int, default=1000000)
+    parser.add_argument("--batch", type=int, default=5000)
+    parser.add_argument("--batches", type=int, default=5)
+    args = parser.parse_args()
+
+    random.seed(7)
+    alerts = build_alerts(args.alerts)
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    index = build_index(alerts)
+    load_seconds = time.perf_counter() - started
+    index_mb = tracemalloc.get_traced_memory()[0] / 1e6
+    tracemalloc.stop()
+
+    alerts_by_key = defaultdict(list)
+    for alert_id, crop, market, alert_type, target_price in alerts:
+        alerts_by_key[(crop, market)].append((alert_id, alert_type, target_price))
+
+    # Day 0 seeds the last prices (every key); the following days are matched
+    walk = {(crop, market): random.uniform(1000, 3000) for crop in CROPS for market in MARKETS}
+    batches = [build_batch(len(walk), date(2026, 1, 1), walk)] + [
+        build_batch(args.batch, date(2026, 1, 1) + timedelta(days=day), walk) for day in range(1, args.batches + 1)
+    ]
+    index_last = {}
+    index.match(batches[0], index_last)
+    naive_last = {}
+    naive_match(alerts_by_key, naive_last, batches[0])
+
+    index_seconds = naive_seconds = 0.0
+    index_fired = naive_fired = 0
+    for batch in batches[1:]:
+        started = time.perf_counter()
+        candidates = index.match(batch, index_last)
+        index_seconds += time.perf_counter() - started
+
+        started = time.perf_counter()
+        fired = naive_match(alerts_by_key, naive_last, batch)
+        naive_seconds += time.perf_counter() - started
+
+        # Same alerts either way; fired alerts leave both matchers
+        assert set(candidates) == fired, "matchers disagree"
+        index.discard((alert_id, *candidates[alert_id][:3]) for alert_id in candidates)
+        for key in alerts_by_key:
+            alerts_by_key[key] = [alert for alert in alerts_by_key[key] if alert[0] not in fired]
+        index_fired += len(candidates)
+        naive_fired += len(fired)
+
+    per_batch = args.batches
+    print(f"{args.alerts:,} alerts indexed in {load_seconds:.2f}s using {index_mb:.0f}MB")
+    print(f"{'matcher':<8} {'ms/batch':>10} {'fired':>10}")
+    print(f"{'naive':<8} {naive_seconds * 1000 / per_batch:>10.1f} {naive_fired:>10,}")
+    print(f"{'bisect':<8} {index_seconds * 1000 / per_batch:>10.1f} {index_fired:>10,}")
+    print(f"speedup: {naive_seconds / index_seconds:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
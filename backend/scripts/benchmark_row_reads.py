@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Compare per-row read cost of ORM entity loading vs column-projected Rows.
+
+Seeds an in-memory SQLite database with shops and inventory (including the
+Text blobs the list endpoints never return) and times the product search
+read path both ways.
+
+Usage (from the backend directory):
+    python scripts/benchmark_row_reads.py [--rows 20000] [--page 500] [--repeat 5]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from app.core.database import Base
+from app.core.projection import labeled, rows_to_dicts
+from app.api.api_v1.endpoints.shops import PRODUCT_SEARCH_COLUMNS, PRODUCT_SHOP_COLUMNS
+import app.models  # noqa: F401  (register all tables)
+from app.models.shop import Shop, ShopInventory
+
+
+def seed(session: Session, rows: int) -> None:
+    shops = [
+        Shop(name=f"Shop {i}", shop_type="private", address="Main road " * 10, state="Punjab", district="Ludhiana")
+        for i in range(max(1, rows // 50))
+    ]
+    session.add_all(shops)
+    session.flush()
+
+    session.execute(
+        ShopInventory.__table__.insert(),
+        [
+            {
+                "shop_id": shops[i % len(shops)].id,
+                "product_name": f"Urea {i}",
+                "product_type": "fertilizer",
+                "brand": "IFFCO",
+                "description": "Nitrogen fertilizer. " * 40,
+                "specifications": '{"n": 46}' * 20,
+                "price_per_unit": 266.5,
+                "unit": "bag",
+                "current_stock": 100,
+                "is_available": True
+            }
+            for i in range(rows)
+        ]
+    )
+    session.commit()
+
+
+def orm_read(session: Session, page: int):
+    products = session.query(ShopInventory).join(Shop).filter(
+        ShopInventory.product_name.ilike("%urea%"),
+        ShopInventory.is_available == True,
+        Shop.is_active == True
+    ).limit(page).all()
+
+    result = [
+        {
+            "id": product.id,
+            "product_name": product.product_name,
+            "product_type": product.product_type,
+            "brand": product.brand,
+            "variety": product.variety,
+            "price_per_unit": product.price_per_unit,
+            "unit": product.unit,
+            "discount_percentage": product.discount_percentage,
+            "is_organic": product.is_organic,
+            "is_government_subsidized": product.is_government_subsidized,
+            "shop": {
+                "id": product.shop.id,
+                "name": product.shop.name,
+                "shop_type": product.shop.shop_type,
+                "address": product.shop.address,
+                "state": product.shop.state,
+                "district": product.shop.district,
+                "phone_number": product.shop.phone_number,
+                "is_government_approved": product.shop.is_government_approved
+            }
+        }
+        for product in products
+    ]
+    session.expunge_all()
+    return result
+
+
+def projected_read(session: Session, page: int):
+    rows = session.execute(
+        select(*PRODUCT_SEARCH_COLUMNS, *labeled("shop", *PRODUCT_SHOP_COLUMNS))
+        .join(Shop, Shop.id == ShopInventory.shop_id)
+        .where(
+            ShopInventory.product_name.ilike("%urea%"),
+            ShopInventory.is_available == True,
+            Shop.is_active == True
+        )
+        .limit(page)
+    ).all()
+    return rows_to_dicts(rows)
+
+
+def time_per_row(fn, session: Session, page: int, repeat: int) -> float:
+    fn(session, page)  # warm up statement caches
+    started = time.perf_counter()
+    for _ in range(repeat):
+        count = len(fn(session, page))
+    return (time.perf_counter() - started) * 1_000_000 / (repeat * count)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ORM vs projected row reads")
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--page", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+
+    with Session(engine) as session:
+        seed(session, args.rows)
+
+        orm_us = time_per_row(orm_read, session, args.page, args.repeat)
+        projected_us = time_per_row(projected_read, session, args.page, args.repeat)
+
+    print(f"Page size:       {args.page}")
+    print(f"ORM entities:    {orm_us:8.1f} us/row")
+    print(f"Projected rows:  {projected_us:8.1f} us/row")
+    print(f"Speedup:         {orm_us / projected_us:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Name filter benchmark: ilike('%term%') vs the app.core.search layer (FTS5
+trigram on SQLite, pg_trgm on PostgreSQL) over a synthetic market_prices
+table, for the /market/prices page query and a full count.
+
+Builds a scratch database (never the configured one) on first run and
+reuses it afterwards.
+
+Usage (from the backend directory):
+    python scripts/benchmark_search.py [--rows 1000000] [--database sqlite:///search_bench.db]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+CROPS = [
+    "Wheat", "Rice", "Maize", "Bajra", "Jowar", "Ragi", "Gram", "Arhar (Tur)", "Moong", "Urad", "Masoor",
+    "Mustard", "Groundnut", "Soybean", "Sesamum", "Cotton", "Sugarcane", "Potato", "Onion", "Tomato",
+    "Chilli", "Bhindi", "Brinjal", "Cauliflower", "Cabbage", "Ginger", "Garlic", "Turmeric", "Banana", "Mango"
+] + [f"Vegetable {i}" for i in range(270)]
+MARKETS = [f"Mandi {i}" for i in range(2000)] + ["Khanna", "Ludhiana", "Raichur", "Turbhe", "Azadpur"]
+
+# term -> what it exercises
+TERMS = [
+    ("wheat", "common crop, exact name"),
+    ("gehun", "transliteration (ilike finds nothing)"),
+    ("tur", "substring of a few names"),
+    ("vegetable 26", "rare names"),
+    ("zzz", "no match"),
+]
+
+
+def build(db, rows: int) -> None:
+    from sqlalchemy import insert
+    from app.models.market import MarketPrice
+
+    random.seed(11)
+    start = date(2025, 1, 1)
+    batch = []
+    started = time.perf_counter()
+    for i in range(rows):
+        # Skewed towards the first crops, like real arrivals
+        crop = CROPS[min(int(random.paretovariate(1.2)) - 1, len(CROPS) - 1)] if random.random() < 0.7 else random.choice(CROPS)
+        price = random.uniform(1000, 5000)
+        batch.append({
+            "crop_name": crop,
+            "market_name": random.choice(MARKETS),
+            "state": "Punjab",
+            "district": "Ludhiana",
+            "min_price": price - 100,
+            "max_price": price + 100,
+            "modal_price": price,
+            "source": "benchmark",
+            "price_date": start + timedelta(days=random.randrange(365))
+        })
+        if len(batch) == 20000:
+            db.execute(insert(MarketPrice), batch)
+            db.commit()
+            batch = []
+            print(f"\r  {i + 1:,} rows  {(i + 1) / (time.perf_counter() - started):,.0f} rows/s", end="", flush=True)
+    if batch:
+        db.execute(insert(MarketPrice), batch)
+        db.commit()
+    print()
+
+
+def timed(db, build_statement, repeat: int):
+    """Median ms of building (name lookup included) and running the statement"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = db.execute(build_statement()).all()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark name search against ilike")
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--database", default="sqlite:///search_bench.db", help="Scratch database URL")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    # The search layer picks its backend from the application engine
+    os.environ["DATABASE_URL"] = args.database
+
+    from sqlalchemy import select, func
+    from app.core.database import SessionLocal, engine
+    from app.core.migrations import run_migrations
+    from app.core.search import name_filter
+    from app.models.market import MarketPrice
+
+    run_migrations(bind=engine)
+    db = SessionLocal()
+    try:
+        existing = db.execute(select(func.count()).select_from(MarketPrice)).scalar()
+        if existing < args.rows:
+            print(f"Building {args.rows - existing:,} rows in {args.database}")
+            build(db, args.rows - existing)
+
+        page = select(MarketPrice.id, MarketPrice.crop_name, MarketPrice.market_name, MarketPrice.price_date) \
+            .order_by(MarketPrice.price_date.desc(), MarketPrice.id.desc()).limit(21)
+        count = select(func.count()).select_from(MarketPrice)
+
+        print(f"{engine.dialect.name}, {args.rows:,} rows, median of {args.repeat}")
+        print(f"{'term':<14} {'query':<6} {'ilike ms':>10} {'search ms':>10} {'speedup':>8} {'ilike rows':>11} {'search rows':>12}  note")
+        for term, note in TERMS:
+            for label, base in (("page", page), ("count", count)):
+                ilike_ms, ilike_rows = timed(
+                    db, lambda: base.where(MarketPrice.crop_name.ilike(f"%{term}%")), args.repeat
+                )
+                search_ms, search_rows = timed(
+                    db, lambda: base.where(name_filter(db, MarketPrice.crop_name, "crop", term)), args.repeat
+                )
+                if label == "count":
+                    ilike_rows, search_rows = ilike_rows[0][0], search_rows[0][0]
+                else:
+                    ilike_rows, search_rows = len(ilike_rows), len(search_rows)
+                print(
+                    f"{term:<14} {label:<6} {ilike_ms:>10.1f} {search_ms:>10.1f} {ilike_ms / search_ms:>7.1f}x "
+                    f"{ilike_rows:>11,} {search_rows:>12,}  {note}"
+                )
+
+        ilike_ms, _ = timed(db, lambda: page.where(MarketPrice.market_name.ilike("%khanna%")), args.repeat)
+        search_ms, _ = timed(
+            db, lambda: page.where(name_filter(db, MarketPrice.market_name, "market", "khanna")), args.repeat
+        )
+        print(f"{'khanna':<14} {'page':<6} {ilike_ms:>10.1f} {search_ms:>10.1f} {ilike_ms / search_ms:>7.1f}x  market name")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Notification dispatcher check against a fake SMS/WhatsApp provider.
+
+Drives NotificationDispatcher.dispatch and dispatch_grouped through an
+httpx.MockTransport that answers each recipient from a script, failing if
+retries, Retry-After, error handling or Twilio Notify batching differ
+from what is expected. No network access is needed.
+
+Usage (from the backend directory):
+    python scripts/check_notification_dispatcher.py
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+from urllib.parse import parse_qs
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+os.environ.update({
+    "TWILIO_ACCOUNT_SID": "AC-check",
+    "TWILIO_AUTH_TOKEN": "token",
+    "TWILIO_PHONE_NUMBER": "+15550000000",
+    "WHATSAPP_ACCESS_TOKEN": "token",
+    "WHATSAPP_PHONE_NUMBER_ID": "check",
+    "TWILIO_NOTIFY_SERVICE_SID": "IS-check",
+    "TWILIO_NOTIFY_BATCH_SIZE": "3",
+    "NOTIFICATION_MAX_RETRIES": "3",
+    "NOTIFICATION_RETRY_BASE_DELAY": "0.001",
+})
+
+import httpx
+
+from app.services.notification_dispatcher import NotificationDispatcher, OutboundMessage
+
+RETRY_AFTER_SECONDS = 1
+
+
+class FakeProvider:
+    """
+    Answers Twilio Messages, Twilio Notify and WhatsApp requests. Each
+    recipient (or Notify body) has a script of responses; the last one
+    repeats. A response is a status code, (status, headers) or an exception.
+    """
+
+    def __init__(self, scripts):
+        self.scripts = {key: list(responses) for key, responses in scripts.items()}
+        self.requests = defaultdict(list)  # recipient / notify body -> request times
+        self.notify_batches = []  # ToBinding addresses of each Notify request
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        if request.url.host == "notify.twilio.com":
+            form = parse_qs(request.content.decode())
+            self.notify_batches.append([json.loads(binding)["address"] for binding in form["ToBinding"]])
+            key = form["Body"][0]
+        elif request.url.host == "graph.facebook.com":
+            key = json.loads(request.content)["to"]
+        else:
+            key = parse_qs(request.content.decode())["To"][0]
+
+        self.requests[key].append(time.monotonic())
+        script = self.scripts.get(key, [201])
+        response = script.pop(0) if len(script) > 1 else script[0]
+
+        if isinstance(response, Exception):
+            raise response
+        status_code, headers = response if isinstance(response, tuple) else (response, {})
+        return httpx.Response(status_code, headers=headers, json={"sid": "SM-check"}, request=request)
+
+    def attempts(self, key: str) -> int:
+        return len(self.requests[key])
+
+
+def message(number: str, delivery_method: str = "sms", text: str = "Rain expected tomorrow") -> OutboundMessage:
+    return OutboundMessage(phone_number=number, message=text, delivery_method=delivery_method)
+
+
+def outcome(result):
+    return (result.success, result.attempts, result.status_code)
+
+
+async def check_dispatch(checks: list) -> None:
+    provider = FakeProvider({
+        "+919000000001": [201],
+        "+919000000002": [(429, {"Retry-After": str(RETRY_AFTER_SECONDS)}), 201],
+        "+919000000003": [503, 502, 201],
+        "+919000000004": [httpx.ConnectError("connection refused"), 201],
+        "+919000000005": [500],
+        "+919000000006": [400],
+        "+919000000007": [httpx.DecodingError("malformed body")],
+        "+919000000008": [httpx.InvalidURL("invalid URL")],
+        "919000000009": [200],
+    })
+    messages = [message(f"+91900000000{i}") for i in range(1, 9)]
+    messages.append(message("9000000009", "whatsapp"))
+    messages.append(message("+919000000010", "push"))
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(provider.handler)) as client:
+        dispatcher = NotificationDispatcher(client=client)
+        results = {result.message.phone_number: result for result in await dispatcher.dispatch_results(messages)}
+        summary = dispatcher.aggregate(list(results.values()))
+
+    retry_after = provider.requests["+919000000002"]
+    checks.extend([
+        ("SMS delivered first time", outcome(results["+919000000001"]), (True, 1, 201)),
+        ("429 retried", outcome(results["+919000000002"]), (True, 2, 201)),
+        (
+            "429 waits for Retry-After",
+            retry_after[1] - retry_after[0] >= RETRY_AFTER_SECONDS * 0.95,
+            True
+        ),
+        ("5xx retried until success", outcome(results["+919000000003"]), (True, 3, 201)),
+        ("transport error retried", outcome(results["+919000000004"]), (True, 2, 201)),
+        ("persistent 5xx gives up after max retries", outcome(results["+919000000005"]), (False, 4, 500)),
+        ("4xx is not retried", outcome(results["+919000000006"]), (False, 1, 400)),
+        ("undecodable response fails its recipient only", outcome(results["+919000000007"]), (False, 1, None)),
+        ("invalid URL fails its recipient only", outcome(results["+919000000008"]), (False, 1, None)),
+        ("WhatsApp delivered", outcome(results["9000000009"]), (True, 1, 200)),
+        ("push is never sent as SMS", (outcome(results["+919000000010"]), provider.attempts("+919000000010")), ((False, 0, None), 0)),
+        ("summary", (summary["success"], summary["failed"], summary["retried"]), (5, 5, 4)),
+    ])
+
+
+async def check_dispatch_grouped(checks: list) -> None:
+    alert = "Heavy rain alert"
+    provider = FakeProvider({alert: [503, 201]})
+    sms = [message(f"+9190000001{i:02d}", text=alert) for i in range(7)]
+    whatsapp = [message(f"90000002{i:02d}", "whatsapp", text=alert) for i in range(2)]
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(provider.handler)) as client:
+        summary = await NotificationDispatcher(client=client).dispatch_grouped({
+            (alert, "sms"): sms,
+            (alert, "whatsapp"): whatsapp,
+        })
+
+    checks.extend([
+        (
+            "Notify batches of TWILIO_NOTIFY_BATCH_SIZE (first retried after 503)",
+            [len(batch) for batch in provider.notify_batches],
+            [3, 3, 3, 1]
+        ),
+        (
+            "every SMS recipient sent through Notify once",
+            sorted({address for batch in provider.notify_batches[1:] for address in batch}),
+            sorted(m.phone_number for m in sms)
+        ),
+        ("WhatsApp sent per recipient", sorted(provider.attempts(f"91{m.phone_number}") for m in whatsapp), [1, 1]),
+        ("grouped summary", (summary["success"], summary["failed"], summary["groups"]), (9, 0, 2)),
+    ])
+
+
+def main():
+    checks = []
+    asyncio.run(check_dispatch(checks))
+    asyncio.run(check_dispatch_grouped(checks))
+
+    failures = 0
+    for description, actual, expected in checks:
+        ok = actual == expected
+        failures += not ok
+        print(f"{'OK  ' if ok else 'FAIL'} {description}: got {actual}, expected {expected}")
+
+    if failures:
+        print(f"\n{failures} dispatcher check(s) failed")
+        sys.exit(1)
+    print("\nDispatcher retries, fails and batches as expected")
+
+
+if __name__ == "__main__":
+    main()
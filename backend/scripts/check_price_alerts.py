@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Price alert regression check for the ingest path.
+
+Builds a scratch SQLite database from the Alembic migrations and ingests
+prices through MarketIngestService, each "process" with its own fresh
+alert index, failing if a crossing price does not fire its alert (or a
+non-crossing one does). Covers the first batch of a cold process and a
+process whose previous price was moved by another process's ingest.
+
+Usage (from the backend directory):
+    python scripts/check_price_alerts.py
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+_tmp = tempfile.TemporaryDirectory()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp.name, 'price_alerts.db')}"
+
+from sqlalchemy import select
+
+from app.core.database import SessionLocal, engine
+from app.core.migrations import run_migrations
+from app.models import PriceAlert, User
+from app.services.market_ingest_service import MarketIngestService
+from app.services.price_alert_service import PriceAlertIndex, PriceAlertService
+
+
+def process() -> MarketIngestService:
+    """An ingest service with its own alert index, as in a freshly started worker or CLI run"""
+    service = MarketIngestService()
+    service.alerts = PriceAlertService(PriceAlertIndex())
+    return service
+
+
+def price(crop_name: str, day: str, modal_price: float) -> dict:
+    return {
+        "crop_name": crop_name,
+        "market_name": "Khanna",
+        "state": "Punjab",
+        "district": "Ludhiana",
+        "price_date": day,
+        "min_price": modal_price - 50,
+        "max_price": modal_price + 50,
+        "modal_price": modal_price
+    }
+
+
+def alert(db, user_id: int, crop_name: str, alert_type: str, target_price: float) -> None:
+    db.add(PriceAlert(
+        user_id=user_id, crop_name=crop_name, market_name="Khanna",
+        alert_type=alert_type, target_price=target_price
+    ))
+    db.commit()
+
+
+def fired(db, crop_name: str) -> list:
+    """(alert type, target price) of the crop's triggered alerts"""
+    return sorted(
+        (alert_type, target_price) for alert_type, target_price in db.execute(
+            select(PriceAlert.alert_type, PriceAlert.target_price)
+            .where(PriceAlert.crop_name == crop_name, PriceAlert.triggered_at.isnot(None))
+        )
+    )
+
+
+def main():
+    run_migrations(bind=engine)
+    db = SessionLocal()
+    user = User(phone_number="+919000000001", name="Farmer", state="Punjab", district="Ludhiana")
+    db.add(user)
+    db.commit()
+
+    checks = []
+
+    # A cold index must compare against the price already stored, not the batch itself
+    process().ingest_records(db, [price("Wheat", "2026-01-01", 2000)])
+    alert(db, user.id, "Wheat", "above", 2100)
+    process().ingest_records(db, [price("Wheat", "2026-01-02", 2200)])
+    checks.append(("first batch of a cold process fires a crossed alert", fired(db, "Wheat"), [("above", 2100)]))
+
+    # Process A saw 2000; process B then moved the price to 2200. A's next
+    # price of 2100 is a fall from 2200 (crossing 2150), not a rise from 2000
+    process_a, process_b = process(), process()
+    process_a.ingest_records(db, [price("Rice", "2026-01-01", 2000)])
+    process_b.ingest_records(db, [price("Rice", "2026-01-02", 2200)])
+    alert(db, user.id, "Rice", "below", 2150)
+    alert(db, user.id, "Rice", "above", 2050)
+    process_a.ingest_records(db, [price("Rice", "2026-01-03", 2100)])
+    checks.append(("previous price written by another process", fired(db, "Rice"), [("below", 2150)]))
+
+    # A first price has nothing to cross from, and an unchanged one crosses nothing
+    alert(db, user.id, "Maize", "above", 1000)
+    process().ingest_records(db, [price("Maize", "2026-01-01", 1500)])
+    process().ingest_records(db, [price("Maize", "2026-01-02", 1500)])
+    checks.append(("first price and unchanged price fire nothing", fired(db, "Maize"), []))
+
+    db.close()
+    engine.dispose()
+    _tmp.cleanup()
+
+    failures = 0
+    for description, triggered, expected in checks:
+        ok = triggered == expected
+        failures += not ok
+        print(f"{'OK  ' if ok else 'FAIL'} {description}: fired {triggered}, expected {expected}")
+
+    if failures:
+        print(f"\n{failures} price alert check(s) failed")
+        sys.exit(1)
+    print("\nPrice alerts fire on every crossing ingest")
+
+
+if __name__ == "__main__":
+    main()
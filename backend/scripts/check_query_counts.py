@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+N+1 regression check for the list endpoints.
+
+Builds a scratch SQLite database from the Alembic migrations, seeds rows
+with distinct related users/shops, then calls each list endpoint with a
+small and a large page and fails if the number of SQL statements grows
+with the page size.
+
+Usage (from the backend directory):
+    python scripts/check_query_counts.py
+"""
+
+import os
+import sys
+import tempfile
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+_tmp = tempfile.TemporaryDirectory()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp.name, 'query_counts.db')}"
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.auth import UserPrincipal, get_current_user
+from app.core.database import SessionLocal, engine, async_engine
+from app.core.migrations import run_migrations
+from app.core.query_counter import QueryCounter
+from app.api.api_v1.endpoints import advisories, community, market, notifications, shops
+from app.models import (
+    Advisory,
+    CommunityComment,
+    CommunityPost,
+    MarketPrice,
+    Notification,
+    Shop,
+    ShopInventory,
+    User
+)
+
+ROWS = 25
+SMALL_PAGE = 1
+LARGE_PAGE = ROWS
+
+# (description, small-page URL, large-page URL)
+ENDPOINTS = [
+    ("community feed", f"/community/posts?limit={SMALL_PAGE}", f"/community/posts?limit={LARGE_PAGE}"),
+    ("trending posts", f"/community/trending?limit={SMALL_PAGE}", f"/community/trending?limit={LARGE_PAGE}"),
+    ("post comments", "/community/posts/{few_comments}", "/community/posts/{many_comments}"),
+    ("product search", f"/shops/search-products?q=urea&limit={SMALL_PAGE}", f"/shops/search-products?q=urea&limit={LARGE_PAGE}"),
+    ("shop list", f"/shops/?limit={SMALL_PAGE}", f"/shops/?limit={LARGE_PAGE}"),
+    ("market prices", f"/market/prices?limit={SMALL_PAGE}", f"/market/prices?limit={LARGE_PAGE}"),
+    ("notifications", f"/notifications/?limit={SMALL_PAGE}", f"/notifications/?limit={LARGE_PAGE}"),
+    ("advisories", f"/advisories/?limit={SMALL_PAGE}", f"/advisories/?limit={LARGE_PAGE}"),
+]
+
+
+def seed():
+    db = SessionLocal()
+    try:
+        users = [
+            User(phone_number=f"+9190000{i:05d}", name=f"Farmer {i}", state="Punjab", district="Ludhiana")
+            for i in range(ROWS)
+        ]
+        db.add_all(users)
+        db.flush()
+
+        posts = [
+            CommunityPost(user_id=user.id, title="Wheat rust", content="Leaves turning yellow", post_type="question")
+            for user in users
+        ]
+        shops_ = [
+            Shop(name=f"Agro {i}", shop_type="private", address="Main road", state="Punjab", district="Ludhiana")
+            for i in range(ROWS)
+        ]
+        db.add_all(posts + shops_)
+        db.flush()
+
+        few_comments, many_comments = posts[0], posts[1]
+        db.add(CommunityComment(post_id=few_comments.id, user_id=users[0].id, content="Spray fungicide"))
+        db.add_all(
+            CommunityComment(post_id=many_comments.id, user_id=user.id, content="Same here")
+            for user in users
+        )
+
+        now = datetime.utcnow()
+        for i, shop in enumerate(shops_):
+            db.add(ShopInventory(
+                shop_id=shop.id, product_name=f"Urea {i}", product_type="fertilizer",
+                price_per_unit=266.5, unit="bag", current_stock=10
+            ))
+            db.add(MarketPrice(
+                crop_name="Wheat", market_name=f"Mandi {i}", state="Punjab", district="Ludhiana",
+                min_price=2000, max_price=2200, price_date=now - timedelta(days=i)
+            ))
+            db.add(Notification(
+                user_id=users[0].id, title="Alert", message="Rain expected",
+                notification_type="weather", delivery_method="sms"
+            ))
+            db.add(Advisory(user_id=users[0].id, title="Tip", content="Irrigate", advisory_type="irrigation"))
+
+        db.commit()
+        return UserPrincipal.from_user(users[0]), few_comments.id, many_comments.id
+    finally:
+        db.close()
+
+
+def query_count(client: TestClient, url: str) -> int:
+    with QueryCounter() as counter:
+        response = client.get(url)
+    if response.status_code != 200:
+        raise RuntimeError(f"GET {url} returned {response.status_code}: {response.text}")
+    return counter.count
+
+
+def main():
+    run_migrations(bind=engine)
+    principal, few_comments, many_comments = seed()
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        yield
+        # Close aiosqlite connections on the loop that opened them
+        await async_engine.dispose()
+
+    app = FastAPI(lifespan=lifespan)
+    for module, prefix in (
+        (advisories, "/advisories"),
+        (community, "/community"),
+        (market, "/market"),
+        (notifications, "/notifications"),
+        (shops, "/shops"),
+    ):
+        app.include_router(module.router, prefix=prefix)
+    app.dependency_overrides[get_current_user] = lambda: principal
+
+    failures = 0
+    with TestClient(app) as client:
+        for description, small_url, large_url in ENDPOINTS:
+            small = query_count(client, small_url.format(few_comments=few_comments, many_comments=many_comments))
+            large = query_count(client, large_url.format(few_comments=few_comments, many_comments=many_comments))
+
+            ok = large <= small
+            failures += not ok
+            print(f"{'OK  ' if ok else 'FAIL'} {description}: {small} queries (small page), {large} queries (large page)")
+
+    engine.dispose()
+    _tmp.cleanup()
+
+    if failures:
+        print(f"\n{failures} endpoint(s) issue more queries as the page grows (N+1)")
+        sys.exit(1)
+    print("\nQuery counts do not depend on page size")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Query-plan regression check for the hot list/filter queries.
+
+Builds a scratch SQLite database from the Alembic migrations, runs
+EXPLAIN QUERY PLAN on each endpoint's query shape and fails if the planner
+does not use the expected index.
+
+Usage (from the backend directory):
+    python scripts/check_query_plans.py
+"""
+
+import os
+import sys
+import tempfile
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.dialects import sqlite
+
+from app.core.geo import nearby_filter
+from app.core.migrations import run_migrations
+from app.core.pagination import encode_cursor, keyset_paginate
+from app.models import (
+    Advisory,
+    CommunityPost,
+    CommunityComment,
+    MarketInsight,
+    MarketPrice,
+    Notification,
+    PriceAlert,
+    Shop,
+    ShopInventory,
+    SoilTest
+)
+from app.services.notification_dispatcher import DISPATCH_METHODS
+
+
+# Cursors past the first page, so the keyset range condition is planned too
+TIME_CURSOR = encode_cursor(datetime(2026, 1, 1), 1000)
+ID_CURSOR = encode_cursor(None, 1000)
+
+
+def page(query, id_column, sort_column=None, descending=True):
+    """The statement a keyset-paged endpoint runs for a page after the first"""
+    cursor = TIME_CURSOR if sort_column is not None else ID_CURSOR
+    return keyset_paginate(query, id_column, cursor, 20, sort_column=sort_column, descending=descending)
+
+
+# (description, statement, expected index)
+HOT_QUERIES = [
+    (
+        "advisories by user, newest first",
+        page(select(Advisory).where(Advisory.user_id == 1), Advisory.id, Advisory.created_at),
+        "ix_advisories_user_id_created_at"
+    ),
+    (
+        "chat history (AI advisories) by user",
+        page(
+            select(Advisory).where(Advisory.user_id == 1, Advisory.is_ai_generated == True),
+            Advisory.id, Advisory.created_at
+        ),
+        "ix_advisories_user_id_created_at"
+    ),
+    (
+        "notifications by user, newest first",
+        page(select(Notification).where(Notification.user_id == 1), Notification.id, Notification.created_at),
+        "ix_notifications_user_id_created_at"
+    ),
+    (
+        "unread notifications by user",
+        page(
+            select(Notification).where(Notification.user_id == 1, Notification.is_read == False),
+            Notification.id, Notification.created_at
+        ),
+        "ix_notifications_user_id_is_read_created_at"
+    ),
+    (
+        "due pending notifications (outbox)",
+        select(Notification.id).where(
+            Notification.delivery_status == "pending",
+            Notification.delivery_method.in_(DISPATCH_METHODS),
+            Notification.scheduled_at <= text("'2030-01-01'")
+        ).order_by(Notification.scheduled_at).limit(500),
+        "ix_notifications_delivery_status_scheduled_at"
+    ),
+    (
+        "approved community feed",
+        page(select(CommunityPost).where(CommunityPost.is_approved == True), CommunityPost.id, CommunityPost.created_at),
+        "ix_community_posts_is_approved_created_at"
+    ),
+    (
+        "comments of a post",
+        select(CommunityComment).where(CommunityComment.post_id == 1).order_by(CommunityComment.created_at),
+        "ix_community_comments_post_id_created_at"
+    ),
+    (
+        "prices of a crop, newest first",
+        page(select(MarketPrice).where(MarketPrice.crop_name == "Wheat"), MarketPrice.id, MarketPrice.price_date),
+        "ix_market_prices_crop_name_price_date"
+    ),
+    (
+        "prices by state and district",
+        page(
+            select(MarketPrice).where(MarketPrice.state == "Punjab", MarketPrice.district == "Ludhiana"),
+            MarketPrice.id, MarketPrice.price_date
+        ),
+        "ix_market_prices_state_district_price_date"
+    ),
+    (
+        "price history of a crop",
+        select(MarketPrice).where(
+            MarketPrice.crop_name == "Wheat", MarketPrice.price_date >= text("'2024-01-01'")
+        ).order_by(MarketPrice.price_date),
+        "ix_market_prices_crop_name_price_date"
+    ),
+    (
+        "market insights feed",
+        page(select(MarketInsight), MarketInsight.id, MarketInsight.created_at),
+        "ix_market_insights_created_at"
+    ),
+    (
+        "market insights of a crop",
+        page(select(MarketInsight).where(MarketInsight.crop_name == "Wheat"), MarketInsight.id, MarketInsight.created_at),
+        "ix_market_insights_crop_name_created_at"
+    ),
+    (
+        "active shops by district",
+        page(
+            select(Shop).where(Shop.is_active == True, Shop.state == "Punjab", Shop.district == "Ludhiana"),
+            Shop.id, descending=False
+        ),
+        "ix_shops_is_active_state_district"
+    ),
+    (
+        "active shops near a point",
+        select(Shop).where(
+            nearby_filter(Shop.geohash, Shop.latitude, Shop.longitude, 19.07, 72.88, 2, Shop.is_active == True)
+        ),
+        "ix_shops_is_active_geohash"
+    ),
+    (
+        "inventory of a shop",
+        page(select(ShopInventory).where(ShopInventory.shop_id == 1), ShopInventory.id, descending=False),
+        "ix_shop_inventory_shop_id_product_type"
+    ),
+    (
+        "price alerts of a user",
+        page(select(PriceAlert).where(PriceAlert.user_id == 1), PriceAlert.id),
+        "ix_price_alerts_user_id_created_at"
+    ),
+    (
+        "soil tests by user",
+        select(SoilTest).where(SoilTest.user_id == 1).order_by(SoilTest.test_date.desc()).limit(20),
+        "ix_soil_tests_user_id_test_date"
+    ),
+]
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'plans.db')}")
+        run_migrations(bind=engine)
+
+        failures = 0
+        with engine.connect() as connection:
+            for description, statement, expected_index in HOT_QUERIES:
+                sql = str(statement.compile(dialect=sqlite.dialect(), compile_kwargs={"literal_binds": True}))
+                plan = " | ".join(row[-1] for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}"))
+
+                ok = expected_index in plan
+                failures += not ok
+                print(f"{'OK  ' if ok else 'FAIL'} {description}: {plan}")
+
+        engine.dispose()
+
+    if failures:
+        print(f"\n{failures} query plan(s) no longer use their index")
+        sys.exit(1)
+    print("\nAll hot queries use their indexes")
+
+
+if __name__ == "__main__":
+    main()
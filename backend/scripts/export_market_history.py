@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Export market_prices to the Parquet dataset (partitioned by crop and
+month) that /market/analytics reads.
+
+Run once with no arguments for all history, then regularly (e.g. nightly)
+with --since to refresh recent months, which picks up late reports and
+corrections.
+
+Usage (from the backend directory):
+    python scripts/export_market_history.py [--since 2024-06-01] [--root exports/market_history]
+"""
+
+import argparse
+import os
+import sys
+from datetime import date
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.core.database import SessionLocal
+from app.services.market_export_service import MarketExportService
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export market price history to Parquet")
+    parser.add_argument("--since", type=date.fromisoformat, default=None, help="Re-export from this date's month (YYYY-MM-DD)")
+    parser.add_argument("--root", default=None, help="Dataset directory (default: MARKET_EXPORT_DIR)")
+    args = parser.parse_args()
+
+    service = MarketExportService(root=args.root)
+    db = SessionLocal()
+    try:
+        stats = service.export(db, since=args.since)
+    finally:
+        db.close()
+
+    scope = f"since {args.since}" if args.since else "all history"
+    print(f"Exported {scope} to {service.root} in {stats.elapsed:.2f}s")
+    print(f"  months:     {stats.months}")
+    print(f"  partitions: {stats.partitions} written, {stats.removed_partitions} removed")
+    print(f"  rows:       {stats.rows:,} ({stats.bytes_written / 1e6:.1f}MB)")
+
+
+if __name__ == "__main__":
+    main()
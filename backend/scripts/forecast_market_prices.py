@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Fit per-(crop, market) price forecasts from the daily rollup and replace
+the price_forecast market insights served by /market/insights.
+
+Run after the day's ingests (e.g. nightly from cron).
+
+Usage (from the backend directory):
+    python scripts/forecast_market_prices.py [--history-days 120] [--horizon-days 14] [--workers 4]
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.core.database import SessionLocal
+from app.services.market_forecast_service import MarketForecastService
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Forecast market prices")
+    parser.add_argument("--history-days", type=int, default=None, help="Days of daily prices to fit on")
+    parser.add_argument("--horizon-days", type=int, default=None, help="Days ahead to forecast")
+    parser.add_argument("--workers", type=int, default=None, help="Processes (default: CPU count)")
+    args = parser.parse_args()
+
+    service = MarketForecastService(
+        history_days=args.history_days,
+        horizon_days=args.horizon_days,
+        workers=args.workers
+    )
+    db = SessionLocal()
+    try:
+        stats = service.run(db)
+    finally:
+        db.close()
+
+    if stats.as_of is None:
+        print("No market prices to forecast")
+        return
+    print(
+        f"Forecast {stats.forecasted:,} of {stats.series:,} (crop, market) series as of {stats.as_of} "
+        f"in {stats.elapsed:.2f}s on {stats.workers} worker(s); {stats.skipped:,} skipped (sparse or stale)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Stream market price dumps (Agmarknet-style CSV, JSON array or NDJSON,
+optionally .gz) into market_prices, upserting on the natural key and
+updating the rollups batch by batch.
+
+Usage (from the backend directory):
+    python scripts/ingest_market_prices.py prices-2024-06-01.csv [more files...]
+        [--format csv|json] [--batch-size 5000] [--source mandi]
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.core.database import SessionLocal
+from app.services.market_ingest_service import (
+    MarketIngestService,
+    IngestStats,
+    INGEST_FORMATS,
+    detect_format,
+    open_text_stream
+)
+
+
+def print_progress(stats: IngestStats) -> None:
+    print(
+        f"\r  {stats.rows_read:>12,} rows  {stats.rows_per_second:>10,.0f} rows/s  "
+        f"{stats.inserted:,} new  {stats.updated:,} updated  {stats.rejected:,} rejected",
+        end="",
+        flush=True
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingest market price dumps")
+    parser.add_argument("paths", nargs="+")
+    parser.add_argument("--format", choices=INGEST_FORMATS, default=None, help="Default: from the file extension")
+    parser.add_argument("--batch-size", type=int, default=None, help="Rows per upsert batch / transaction")
+    parser.add_argument("--source", default="mandi")
+    parser.add_argument("--show-errors", type=int, default=10, help="Rejected records to print per file")
+    args = parser.parse_args()
+
+    service = MarketIngestService(batch_size=args.batch_size)
+    db = SessionLocal()
+    try:
+        for path in args.paths:
+            file_format = args.format or detect_format(path)
+            print(f"{path} ({file_format})")
+
+            with open(path, "rb") as binary:
+                stats = service.ingest_file(
+                    db, open_text_stream(binary, path), file_format, source=args.source, on_progress=print_progress
+                )
+
+            print()
+            print(
+                f"  done in {stats.elapsed:.1f}s: {stats.inserted:,} inserted, {stats.updated:,} updated, "
+                f"{stats.unchanged:,} unchanged, {stats.duplicates:,} duplicates, {stats.rejected:,} rejected, "
+                f"{stats.alerts_triggered:,} price alerts triggered"
+            )
+            for error in stats.errors[:args.show_errors]:
+                print(f"    {error}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
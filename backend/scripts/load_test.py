@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Simple concurrent load generator for comparing endpoint throughput.
+
+Run it against the same endpoint with the same uvicorn worker count before
+and after a change (e.g. sync vs async DB session) and compare req/s and
+latency percentiles.
+
+Usage (from the backend directory):
+    python scripts/load_test.py http://localhost:8000/api/v1/market/prices \
+        --concurrency 50 --requests 2000 [--token <jwt>]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+async def run(url: str, concurrency: int, total_requests: int, token: str = None):
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    latencies = []
+    errors = 0
+    remaining = iter(range(total_requests))
+
+    async with httpx.AsyncClient(
+        headers=headers,
+        limits=httpx.Limits(max_connections=concurrency),
+        timeout=30.0
+    ) as client:
+
+        async def worker():
+            nonlocal errors
+            for _ in remaining:
+                started = time.perf_counter()
+                try:
+                    response = await client.get(url)
+                    if response.status_code >= 400:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append((time.perf_counter() - started) * 1000)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    print(f"URL:          {url}")
+    print(f"Concurrency:  {concurrency}")
+    print(f"Requests:     {total_requests} ({errors} errors)")
+    print(f"Throughput:   {total_requests / elapsed:.1f} req/s")
+    print(f"Latency mean: {statistics.mean(latencies):.1f} ms")
+    print(f"Latency p50:  {latencies[len(latencies) // 2]:.1f} ms")
+    print(f"Latency p95:  {latencies[int(len(latencies) * 0.95) - 1]:.1f} ms")
+    print(f"Latency p99:  {latencies[int(len(latencies) * 0.99) - 1]:.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent GET load test")
+    parser.add_argument("url")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--token", default=None, help="Bearer token for authenticated endpoints")
+    args = parser.parse_args()
+
+    asyncio.run(run(args.url, args.concurrency, args.requests, args.token))
+
+
+if __name__ == "__main__":
+    main()
@@ -135,7 +135,7 @@ def setup_database():
         python_cmd = "backend/venv/bin/python"
     
     print("Initializing database...")
-    run_command(f"{python_cmd} -c \"from app.core.database import engine, Base; Base.metadata.create_all(bind=engine)\"", cwd="backend")
+    run_command(f"{python_cmd} -m alembic upgrade head", cwd="backend")
     
     print("✅ Database setup complete")
 